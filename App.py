@@ -12,15 +12,3046 @@ Requirements:
 - NumPy
 - Matplotlib
 - SymPy
+- contourpy (installed with Matplotlib 3.6+; used directly to trace degenerate conics)
 """
 
+import time
+
+# Seconds spent importing each heavy module, filled in as each is first used
+IMPORT_TIMES = {}
+_START_TIME = time.perf_counter()
+
 import math
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import animation
-from sympy import symbols, solve, simplify, expand, factor, sin, cos, tan, pi, sympify
 import sys
 import os
+import functools
+import importlib
+import ast
+import operator
+import re
+from fractions import Fraction
+
+
+class _LazyModule:
+    """Stand-in for a heavy module that is only imported on first use.
+
+    NumPy, Matplotlib and SymPy account for most of the start-up time, and
+    many menu paths never touch them. Attributes are cached on the proxy
+    after the first lookup, so later accesses cost the same as a module's.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            start = time.perf_counter()
+            self._module = importlib.import_module(self._name)
+            IMPORT_TIMES[self._name] = time.perf_counter() - start
+        value = getattr(self._module, attr)
+        setattr(self, attr, value)
+        return value
+
+
+np = _LazyModule("numpy")
+mpl = _LazyModule("matplotlib")
+plt = _LazyModule("matplotlib.pyplot")
+animation = _LazyModule("matplotlib.animation")
+mfigure = _LazyModule("matplotlib.figure")
+mpatches = _LazyModule("matplotlib.patches")
+mcollections = _LazyModule("matplotlib.collections")
+sp = _LazyModule("sympy")
+asyncio = _LazyModule("asyncio")
+
+# Values of |sin θ| or |cos θ| below this are treated as exactly zero
+TRIG_EPSILON = 1e-10
+TRIG_FUNCTION_NAMES = ("sin", "cos", "tan", "csc", "sec", "cot")
+
+
+def evaluate_trig(angles, degrees=False, fast=False):
+    """Evaluate all six trigonometric functions over an array of angles.
+
+    Returns a dict mapping each name in TRIG_FUNCTION_NAMES to an array of
+    values. Undefined entries (tan/sec where cos θ = 0, csc/cot where
+    sin θ = 0) are NaN, so ``np.isnan(values["tan"])`` is the undefined mask.
+    With ``fast=True`` sin and cos come from the fast kernels (see fast_sin),
+    and angles within FAST_TRIG_MAX_ERROR of a pole count as undefined.
+    """
+    angles = np.asarray(angles, dtype=float)
+    if fast:
+        theta = _reduce_angles(angles, degrees)
+        sin_vals = np.sin(theta).astype(float)
+        cos_vals = np.cos(theta).astype(float)
+        epsilon = FAST_TRIG_MAX_ERROR
+    else:
+        if degrees:
+            # Reduce first so large degree values keep full precision
+            theta = np.radians(np.remainder(angles, 360.0))
+        else:
+            theta = angles
+        sin_vals = np.sin(theta)
+        cos_vals = np.cos(theta)
+        epsilon = TRIG_EPSILON
+    cos_zero = np.abs(cos_vals) < epsilon
+    sin_zero = np.abs(sin_vals) < epsilon
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sec_vals = np.where(cos_zero, np.nan, 1.0 / cos_vals)
+        csc_vals = np.where(sin_zero, np.nan, 1.0 / sin_vals)
+        tan_vals = sin_vals * sec_vals
+        cot_vals = np.where(cos_zero, 0.0, cos_vals * csc_vals)
+
+    return {
+        "sin": sin_vals,
+        "cos": cos_vals,
+        "tan": tan_vals,
+        "csc": csc_vals,
+        "sec": sec_vals,
+        "cot": cot_vals,
+    }
+
+
+# Fast kernels
+# ------------
+# For bulk jobs that only display 4-6 decimals. Angles are reduced to
+# [-π, π] in float64, then evaluated with NumPy's single-precision SIMD
+# kernels. The absolute error of sin and cos is below FAST_TRIG_MAX_ERROR
+# (half a float32 ulp of π from rounding the reduced angle, plus under
+# 1.5 ulp from the kernel), the same bound as linear interpolation in a
+# 4096-entry table, for |x| < 1e8 radians; measured ~1.6e-7. fast_sin
+# ran 3.8x faster than float64 np.sin on 10⁶ angles in [-1000, 1000]
+# (the sin_fast and sin_numpy benchmarks).
+#
+# A lookup table was tried first and was no faster than np.sin once the
+# gathers were counted, and float64 np.arcsin/arccos/arctan are already
+# ~10x cheaper than np.sin, so the inverse functions stay exact.
+
+FAST_TRIG_MAX_ERROR = 3e-7
+
+
+def _reduce_angles(angles, degrees=False):
+    """Reduce angles to [-π, π] radians in float64 and round them to float32."""
+    angles = np.asarray(angles, dtype=float)
+    if degrees:
+        theta = np.radians(angles - 360.0 * np.round(angles / 360.0))
+    else:
+        theta = angles - 2 * np.pi * np.round(angles / (2 * np.pi))
+    return theta.astype(np.float32)
+
+
+def fast_sin(angles, degrees=False):
+    """sin with absolute error below FAST_TRIG_MAX_ERROR."""
+    return np.sin(_reduce_angles(angles, degrees)).astype(float)
+
+
+def fast_cos(angles, degrees=False):
+    """cos with absolute error below FAST_TRIG_MAX_ERROR."""
+    return np.cos(_reduce_angles(angles, degrees)).astype(float)
+
+
+def fast_tan(angles, degrees=False):
+    """tan from the fast sin and cos; NaN within FAST_TRIG_MAX_ERROR of a pole.
+
+    The error relative to |tan x| is at most about
+    FAST_TRIG_MAX_ERROR * (1/|sin x| + 1/|cos x|).
+    """
+    theta = _reduce_angles(angles, degrees)
+    sin_vals = np.sin(theta).astype(float)
+    cos_vals = np.cos(theta).astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(np.abs(cos_vals) < FAST_TRIG_MAX_ERROR, np.nan, sin_vals / cos_vals)
+
+
+INVERSE_TRIG_NAMES = ("arcsin", "arccos", "arctan", "arccsc", "arcsec", "arccot")
+
+
+def evaluate_inverse_trig(values):
+    """Evaluate all six inverse trigonometric functions over an array of values.
+
+    Returns a dict mapping each name in INVERSE_TRIG_NAMES to an array of
+    principal values in radians, NaN outside the function's domain. Ranges
+    follow the guide: arccot is in (0, π) and arcsec in [0, π].
+    """
+    x = np.asarray(values, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inverse = np.where(np.abs(x) >= 1, 1.0 / x, np.nan)
+        return {
+            "arcsin": np.arcsin(np.where(np.abs(x) <= 1, x, np.nan)),
+            "arccos": np.arccos(np.where(np.abs(x) <= 1, x, np.nan)),
+            "arctan": np.arctan(x),
+            "arccsc": np.arcsin(inverse),
+            "arcsec": np.arccos(inverse),
+            "arccot": np.pi / 2 - np.arctan(x),
+        }
+
+
+def iter_angle_chunks(source, chunk_size=65536):
+    """Yield float arrays of angles read from a path, file object or '-' (stdin).
+
+    Angles may be separated by whitespace, commas or newlines.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if source == "-":
+            yield from iter_angle_chunks(sys.stdin, chunk_size)
+            return
+        with open(source, encoding="utf-8") as stream:
+            yield from iter_angle_chunks(stream, chunk_size)
+        return
+
+    pending = []
+    for line in source:
+        pending.extend(line.replace(",", " ").split())
+        if len(pending) >= chunk_size:
+            yield np.array(pending, dtype=float)
+            pending = []
+    if pending:
+        yield np.array(pending, dtype=float)
+
+
+def batch_trig_functions(source, degrees=True, chunk_size=65536, fast=False):
+    """Yield (angles, values) pairs for an array or a stream of angles.
+
+    ``source`` may be an array-like of angles, a path, an open file or '-'
+    for stdin. Streams are processed in chunks so memory stays bounded.
+    """
+    if isinstance(source, (str, os.PathLike)) or hasattr(source, "read"):
+        for chunk in iter_angle_chunks(source, chunk_size):
+            yield chunk, evaluate_trig(chunk, degrees, fast)
+    else:
+        angles = np.asarray(source, dtype=float)
+        yield angles, evaluate_trig(angles, degrees, fast)
+
+
+def write_trig_table(source, out, degrees=True, chunk_size=65536, fast=False):
+    """Write a CSV table of all six trig functions for a stream of angles."""
+    out.write("angle," + ",".join(TRIG_FUNCTION_NAMES) + "\n")
+    for angles, values in batch_trig_functions(source, degrees, chunk_size, fast):
+        table = np.column_stack([angles] + [values[name] for name in TRIG_FUNCTION_NAMES])
+        np.savetxt(out, table, fmt="%.10g", delimiter=",")
+
+
+def tan_poles(A=1.0, B=1.0, C=0.0, domain=(-2 * math.pi, 2 * math.pi)):
+    """Return the vertical asymptotes of A tan(Bx - C) + D inside domain.
+
+    The poles are where Bx - C = π/2 + kπ, i.e. x = (π/2 + kπ + C) / B.
+    """
+    if B == 0:
+        return np.empty(0)
+    lo, hi = domain
+    u_lo, u_hi = sorted((B * lo - C, B * hi - C))
+    k = np.arange(math.ceil((u_lo - math.pi / 2) / math.pi),
+                  math.floor((u_hi - math.pi / 2) / math.pi) + 1)
+    return np.sort((math.pi / 2 + k * math.pi + C) / B)
+
+
+def adaptive_sample(func, domain=(-2 * math.pi, 2 * math.pi), num=400, poles=None, clip=10.0):
+    """Sample a vectorized function with extra points where the curve bends.
+
+    Half of the ``num`` points form a uniform probe that measures the arc
+    length and curvature of the (clipped) graph; the other half are placed
+    so each one covers an equal share of that measure. The probe samples
+    are kept in the result, so the function is evaluated once per point.
+    Known poles are inserted as NaN so Matplotlib breaks the line there
+    instead of joining the branches. Returns (x, y) arrays sorted by x.
+    """
+    lo, hi = domain
+    poles = np.empty(0) if poles is None else np.asarray(poles, dtype=float)
+
+    probe = np.linspace(lo, hi, max(num // 2, 2))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y_probe = np.asarray(func(probe), dtype=float)
+    clipped = np.nan_to_num(np.clip(y_probe, -clip, clip), nan=0.0)
+
+    # Monitor function: arc length plus a curvature term per probe interval
+    dx = np.diff(probe)
+    dy = np.diff(clipped)
+    slope = dy / dx
+    bend = np.abs(np.diff(slope, prepend=slope[0]))
+    weight = np.hypot(dx, dy) + dx * bend
+
+    # Intervals that straddle a pole carry the jump between branches, not curve
+    if poles.size:
+        branch = np.searchsorted(poles, probe)
+        weight[branch[1:] != branch[:-1]] = 0.0
+
+    cumulative = np.concatenate(([0.0], np.cumsum(weight)))
+    if cumulative[-1] <= 0:
+        cumulative = probe - lo
+    # Midpoints of equal shares, so the new points fall between probe samples
+    extra = max(num - probe.size, 0)
+    targets = (np.arange(extra) + 0.5) * (cumulative[-1] / max(extra, 1))
+    x_extra = np.interp(targets, cumulative, probe)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y_extra = np.asarray(func(x_extra), dtype=float)
+
+    x = np.concatenate((probe, x_extra, poles))
+    y = np.concatenate((y_probe, y_extra, np.full(poles.shape, np.nan)))
+    order = np.argsort(x, kind="stable")
+    return x[order], y[order]
+
+
+# Largest denominator tried when recovering an exact multiple of π
+PI_MAX_DENOMINATOR = 360
+
+
+def _pi_label(num, den):
+    """Format num/den · π the way the guide's tables write it (e.g. -3π/4)."""
+    if num == 0:
+        return "0"
+    sign = "-" if num < 0 else ""
+    coef = "" if abs(num) == 1 else str(abs(num))
+    if den == 1:
+        return f"{sign}{coef}π"
+    return f"{sign}{coef}π/{den}"
+
+
+@functools.lru_cache(maxsize=8192)
+def format_pi_multiple(radians, max_denominator=PI_MAX_DENOMINATOR):
+    """Format an angle in radians as an exact fraction of π when possible."""
+    frac = radians / math.pi
+    if not math.isfinite(frac):
+        return f"{frac}π"
+    approx = Fraction(frac).limit_denominator(max_denominator)
+    if abs(frac - approx) <= 1e-10 * max(1.0, abs(frac)):
+        return _pi_label(approx.numerator, approx.denominator)
+    return f"{frac:.4f}π"
+
+
+def pi_fractions(radians, max_denominator=PI_MAX_DENOMINATOR):
+    """Recover exact multiples of π for a whole array of angles.
+
+    Runs the continued-fraction expansion of radians/π on every element at
+    once. Returns (numerator, denominator, exact) arrays; where ``exact`` is
+    False no fraction with denominator <= max_denominator matched.
+    """
+    frac = np.asarray(radians, dtype=float) / np.pi
+    finite = np.isfinite(frac)
+    x = np.where(finite, np.abs(frac), 0.0)
+    tol = 1e-10 * np.maximum(1.0, x)
+
+    h_prev, h = np.ones_like(x), np.floor(x)
+    k_prev, k = np.zeros_like(x), np.ones_like(x)
+    rem = x - h
+    done = ~finite | (np.abs(x - h) <= tol)
+
+    # Convergent denominators grow at least like Fibonacci numbers
+    for _ in range(64):
+        active = ~done
+        if not active.any():
+            break
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inv = np.where(active, 1.0 / rem, 0.0)
+        a = np.floor(inv)
+        h_new = a * h + h_prev
+        k_new = a * k + k_prev
+        step = active & (k_new <= max_denominator)
+        h_prev, h = np.where(step, h, h_prev), np.where(step, h_new, h)
+        k_prev, k = np.where(step, k, k_prev), np.where(step, k_new, k)
+        rem = np.where(step, inv - a, rem)
+        done |= ~step | (np.abs(x - h / k) <= tol) | (rem == 0)
+
+    exact = finite & (np.abs(x - h / k) <= tol)
+    return np.sign(frac) * h, k, exact
+
+
+def format_radians_array(radians, max_denominator=PI_MAX_DENOMINATOR):
+    """Format an array of angles in radians as π fractions (object array of str).
+
+    Each distinct value is formatted once, so repeated angles are cheap.
+    """
+    values = np.asarray(radians, dtype=float)
+    unique, inverse = np.unique(values.ravel(), return_inverse=True)
+    num, den, exact = pi_fractions(unique, max_denominator)
+    labels = np.array(
+        [_pi_label(int(n), int(d)) if ok else f"{v / math.pi:.4f}π"
+         for v, n, d, ok in zip(unique, num, den, exact)],
+        dtype=object,
+    )
+    return labels[inverse].reshape(values.shape)
+
+
+# Angle expressions
+# -----------------
+# Inputs such as "3π/2", "2*pi/3", "-5pi/6" or "45°" are parsed once with
+# the ast module into a tree of closures (no eval) and cached by their text.
+
+_ANGLE_CONSTANTS = {"pi": math.pi, "tau": 2 * math.pi}
+# Radians per unit; "pi" means multiples of π, so 0.25 is π/4
+ANGLE_UNITS = {"degrees": math.pi / 180, "radians": 1.0, "pi": math.pi}
+_ANGLE_UNIT_SUFFIX = re.compile(r"\s*(°|degrees?|deg|radians?|rad)$")
+_ANGLE_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.Pow: operator.pow,
+}
+_ANGLE_UNARY_OPS = {ast.USub: operator.neg, ast.UAdd: operator.pos}
+
+
+def _compile_angle_node(node):
+    """Turn an angle-expression AST node into a function of the variables dict."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) \
+            and not isinstance(node.value, bool):
+        # Floats only, so "10**10**10" overflows instead of building a huge int
+        value = float(node.value)
+        return lambda env: value
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in _ANGLE_CONSTANTS:
+            value = _ANGLE_CONSTANTS[name]
+            return lambda env: value
+        return lambda env: env[name]
+    if isinstance(node, ast.BinOp) and type(node.op) in _ANGLE_BINARY_OPS:
+        op = _ANGLE_BINARY_OPS[type(node.op)]
+        left = _compile_angle_node(node.left)
+        right = _compile_angle_node(node.right)
+        return lambda env: op(left(env), right(env))
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _ANGLE_UNARY_OPS:
+        op = _ANGLE_UNARY_OPS[type(node.op)]
+        operand = _compile_angle_node(node.operand)
+        return lambda env: op(operand(env))
+    raise ValueError(f"Unsupported syntax in angle expression: {ast.unparse(node)}")
+
+
+class AngleExpression:
+    """A compiled angle expression.
+
+    Calling it returns the angle in radians; variables (e.g. n in
+    "pi/4 + n*pi") are passed as keywords and may be NumPy arrays.
+    reduced() does the same but reduces degree angles mod 360 first.
+    """
+
+    def __init__(self, text, unit, func, variables):
+        self.text = text
+        self.unit = unit
+        self.variables = variables
+        self._func = func
+        self._scale = ANGLE_UNITS[unit]
+        self.value = None if variables else func({}) * self._scale
+
+    def __call__(self, **variables):
+        if self.value is not None and not variables:
+            return self.value
+        return self._evaluate(variables) * self._scale
+
+    def reduced(self, **variables):
+        """The angle in radians, reduced mod 360 first if it is in degrees.
+
+        Reducing before the conversion keeps large degree angles exact, as
+        evaluate_trig(degrees=True) does (e.g. sin 1e20° is computed from 280°).
+        """
+        value = self._evaluate(variables)
+        if self.unit == "degrees":
+            value = value % 360.0
+        return value * self._scale
+
+    def _evaluate(self, variables):
+        missing = self.variables - variables.keys()
+        if missing:
+            raise ValueError(f"Missing value for {', '.join(sorted(missing))} in '{self.text}'")
+        return self._func(variables)
+
+    def __repr__(self):
+        return f"AngleExpression({self.text!r}, unit={self.unit!r})"
+
+
+@functools.lru_cache(maxsize=4096)
+def compile_angle(text, default_unit=None):
+    """Parse an angle expression once and return a cached AngleExpression.
+
+    A trailing °/deg/rad suffix sets the unit. Otherwise expressions that
+    mention π are radians and anything else uses default_unit (degrees if
+    None, as in the calculator).
+    """
+    _check_angle_unit(default_unit)
+    expr = text.strip().lower()
+    for old, new in (("π", "pi"), ("τ", "tau"), ("−", "-"), ("×", "*"), ("÷", "/"), ("^", "**")):
+        expr = expr.replace(old, new)
+
+    unit = None
+    match = _ANGLE_UNIT_SUFFIX.search(expr)
+    if match:
+        unit = "degrees" if match.group(1).startswith(("°", "deg")) else "radians"
+        expr = expr[:match.start()]
+    if not expr:
+        raise ValueError("Empty angle expression")
+
+    # Implicit multiplication: "3pi/2" -> "3*pi/2", "2(pi)" -> "2*(pi)", but
+    # not inside scientific notation such as "1e3" or "2.5e-4"
+    expr = re.sub(r"(?<=[\d.)])(?!e[+-]?\d)\s*(?=[a-z_(])", "*", expr)
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError:
+        raise ValueError(f"Could not parse angle expression: '{text}'") from None
+
+    names = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+    if unit is None:
+        unit = "radians" if names & _ANGLE_CONSTANTS.keys() else (default_unit or "degrees")
+    return AngleExpression(text, unit, _compile_angle_node(tree.body),
+                           frozenset(names - _ANGLE_CONSTANTS.keys()))
+
+
+def _check_angle_unit(unit):
+    if unit is not None and unit not in ANGLE_UNITS:
+        raise ValueError(f"Unknown angle unit: {unit} (use one of {', '.join(ANGLE_UNITS)})")
+
+
+def parse_angle(value, default_unit=None, reduce=False):
+    """Return an angle expression or number as radians.
+
+    With ``reduce=True`` degree angles are reduced mod 360 before the
+    conversion (see AngleExpression.reduced).
+    """
+    if isinstance(value, str):
+        angle = compile_angle(value, default_unit)
+        return angle.reduced() if reduce else angle()
+    _check_angle_unit(default_unit)
+    unit = default_unit or "degrees"
+    value = float(value)
+    if reduce and unit == "degrees":
+        value %= 360.0
+    return value * ANGLE_UNITS[unit]
+
+
+def parse_angles(values, default_unit=None, reduce=False):
+    """Parse a sequence of angle expressions or numbers into an array of radians.
+
+    ``default_unit`` may be a single unit or one per value. Each distinct
+    expression is only parsed once.
+    """
+    if default_unit is None or isinstance(default_unit, str):
+        units = [default_unit] * len(values)
+    else:
+        units = default_unit
+    return np.fromiter((parse_angle(v, u, reduce) for v, u in zip(values, units)),
+                       dtype=float, count=len(values))
+
+
+# Trig expressions and identities
+# -------------------------------
+# Student-style input ("2sin x cos x", "sin²θ", "sec(x)^2") is parsed with
+# SymPy once, lambdified to NumPy and cached, so repeated checks only pay
+# for a vectorized evaluation.
+
+_TRIG_NAMES = r"(sin|cos|tan|csc|sec|cot)"
+_GREEK_LETTERS = {"θ": "theta", "α": "alpha", "β": "beta", "γ": "gamma", "φ": "phi", "π": "pi"}
+
+
+def _normalize_trig_text(text):
+    """Rewrite textbook notation into something SymPy's parser accepts."""
+    # Spell out Greek letters, keeping them apart from neighbouring letters
+    # ("sinθcosθ" -> "sin theta cos theta") but attached to digits ("2θ")
+    letters = "".join(_GREEK_LETTERS)
+    text = re.sub(f"[{letters}]",
+                  lambda m: f" {_GREEK_LETTERS[m.group()]} ", text)
+    text = re.sub(r"(?<=[\d.]) (?=[a-z])", "", text)
+    text = text.replace("−", "-").replace("·", "*").replace("×", "*")
+    # sin²θ -> sin(θ)**2, and sin θ / sin 2x -> sin(θ) / sin(2x)
+    text = re.sub(_TRIG_NAMES + r"([²³])\s*(\([^()]*\)|[\w.]+)",
+                  lambda m: f"{m.group(1)}({m.group(3)})**{'2' if m.group(2) == '²' else '3'}", text)
+    text = re.sub(r"(?<![A-Za-z])" + _TRIG_NAMES + r"\s+([0-9.]*[A-Za-z_]\w*|[0-9.]+)\b",
+                  r"\1(\2)", text)
+    return text.replace("²", "**2").replace("³", "**3")
+
+
+# parse_expr ends in eval(), and expressions also arrive over HTTP (/batch),
+# so the text is checked token by token first and then evaluated against a
+# namespace holding only SymPy's math functions and constants (no builtins)
+_SYMPY_OPERATORS = frozenset(("+", "-", "*", "/", "**", "^", "(", ")", ","))
+_SYMPY_NAMES = (
+    "sin", "cos", "tan", "csc", "sec", "cot", "asin", "acos", "atan", "acsc", "asec", "acot",
+    "sinh", "cosh", "tanh", "exp", "log", "ln", "sqrt", "root", "Abs", "sign", "floor", "ceiling",
+    "Min", "Max", "pi", "E", "I", "oo",
+)
+# Constructors the parser's transformations emit for numbers, names and
+# unevaluated operators; they may not appear in the text itself
+_SYMPY_CONSTRUCTORS = ("Symbol", "Integer", "Float", "Rational", "Function", "Add", "Mul", "Pow")
+# SymPy computes powers of numbers exactly, so "9^9^9" would never finish.
+# Every power is checked before it is evaluated: its exponent (combined with
+# any powers inside its base) and the size of the exact numbers it produces
+# are both bounded
+EXPRESSION_MAX_EXPONENT = 100
+EXPRESSION_MAX_BITS = 1 << 14
+
+
+@functools.lru_cache(maxsize=None)
+def _sympy_namespace():
+    names = {name: getattr(sp, name) for name in _SYMPY_NAMES + _SYMPY_CONSTRUCTORS}
+    names.update(abs=sp.Abs, min=sp.Min, max=sp.Max, __builtins__={})
+    return names
+
+
+def _check_power(base, exponent):
+    if not exponent.is_Number:
+        return
+    exponent = abs(float(exponent))
+    # (a^m)^n becomes a^(mn), and (ab)^n becomes a^n b^n
+    powers = [exponent] + [exponent * abs(float(node.exp)) for node in sp.preorder_traversal(base)
+                           if node.is_Pow and node.exp.is_Number]
+    if max(powers) > EXPRESSION_MAX_EXPONENT:
+        raise ValueError(f"Exponents must be at most {EXPRESSION_MAX_EXPONENT}")
+    bits = [node.p.bit_length() + node.q.bit_length() for node in sp.preorder_traversal(base) if node.is_Rational]
+    if exponent * max(bits, default=0) > EXPRESSION_MAX_BITS:
+        raise ValueError("Numbers in the expression would be too large")
+
+
+def _evaluate_bounded(expr):
+    """Evaluate an unevaluated parse from the leaves up, checking each power first."""
+    if not expr.args:
+        return expr
+    args = [_evaluate_bounded(arg) for arg in expr.args]
+    if expr.is_Pow:
+        _check_power(*args)
+    return expr.func(*args)
+
+
+def _parse_sympy(text, names=None):
+    """parse_expr for arithmetic text, with implicit multiplication and ^ for powers.
+
+    Only numbers, names without underscores and the operators in
+    _SYMPY_OPERATORS are accepted, so strings, attribute access, subscripts
+    and keywords never reach eval(). Names outside _SYMPY_NAMES (and
+    ``names``) become Symbols, or undefined functions when called. The text
+    is parsed unevaluated and then evaluated with bounded powers (see
+    EXPRESSION_MAX_EXPONENT).
+    """
+    import io
+    import keyword
+    import tokenize
+
+    parser = sp.parsing.sympy_parser
+    text = text.strip()
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(text).readline))
+    except (tokenize.TokenError, SyntaxError):
+        raise ValueError(f"Could not parse expression: '{text}'") from None
+    for token in tokens:
+        if token.type in (tokenize.NEWLINE, tokenize.NL, tokenize.ENDMARKER):
+            continue
+        if not (token.type == tokenize.NUMBER
+                or token.type == tokenize.NAME and "_" not in token.string
+                and not keyword.iskeyword(token.string) and token.string not in _SYMPY_CONSTRUCTORS
+                or token.type == tokenize.OP and token.string in _SYMPY_OPERATORS):
+            raise ValueError(f"Unsupported input in expression: {token.string!r}")
+    transformations = parser.standard_transformations + (
+        parser.implicit_multiplication_application, parser.convert_xor)
+    expr = parser.parse_expr(text, local_dict=dict(names or {}), global_dict=dict(_sympy_namespace()),
+                             transformations=transformations, evaluate=False)
+    return _evaluate_bounded(expr)
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_trig_expression(text):
+    """Parse a trig expression such as "2sin x cos x" into a SymPy expression."""
+    # Greek names such as beta and gamma are SymPy functions unless overridden
+    names = {name: sp.Symbol(name) for name in _GREEK_LETTERS.values() if name != "pi"}
+    expr = _parse_sympy(_normalize_trig_text(text), names)
+    # Treat every variable as real so simplification can use real identities
+    return expr.subs({s: sp.Symbol(s.name, real=True) for s in expr.free_symbols})
+
+
+@functools.lru_cache(maxsize=1024)
+def _identity_functions(lhs, rhs):
+    """Compile both sides of an identity to NumPy over their shared variables."""
+    left = parse_trig_expression(lhs)
+    right = parse_trig_expression(rhs)
+    symbols = sorted(left.free_symbols | right.free_symbols, key=lambda s: s.name)
+    return (symbols, left, right,
+            sp.lambdify(symbols, left, "numpy"), sp.lambdify(symbols, right, "numpy"))
+
+
+def verify_identity(lhs, rhs, samples=256, seed=0):
+    """Check whether lhs = rhs holds for all values of its variables.
+
+    Both sides are first evaluated at ``samples`` random points in
+    [-2π, 2π]. A clear mismatch proves it is not an identity; agreement to
+    ~1e-9 everywhere accepts it. Only if the numeric test is inconclusive
+    (too many points near poles, or borderline errors) is SymPy's simplify
+    used. Returns a dict with "identity", "method" and, when it fails, a
+    "counterexample" mapping variable names to a value.
+    """
+    symbols, left, right, f_left, f_right = _identity_functions(lhs, rhs)
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(-2 * np.pi, 2 * np.pi, (len(symbols), samples))
+
+    with np.errstate(all="ignore"):
+        a = np.broadcast_to(np.asarray(f_left(*points), dtype=complex), (samples,))
+        b = np.broadcast_to(np.asarray(f_right(*points), dtype=complex), (samples,))
+        # Ignore points near poles, where rounding is amplified
+        usable = np.isfinite(a) & np.isfinite(b) & (np.abs(a) < 1e8) & (np.abs(b) < 1e8)
+        error = np.abs(a - b) / (1 + np.abs(a) + np.abs(b))
+
+    if usable.sum() >= samples // 4:
+        wrong = usable & (error > 1e-6)
+        if wrong.any():
+            i = int(np.argmax(wrong))
+            counterexample = {s.name: float(points[k, i]) for k, s in enumerate(symbols)}
+            return {"identity": False, "method": "numeric", "counterexample": counterexample}
+        if (error[usable] < 1e-9).all():
+            return {"identity": True, "method": "numeric", "counterexample": None}
+
+    return {"identity": bool(sp.simplify(left - right) == 0), "method": "symbolic",
+            "counterexample": None}
+
+
+def verify_identities(pairs, samples=256, seed=0):
+    """Check a batch of (lhs, rhs) pairs; see verify_identity."""
+    return [verify_identity(lhs, rhs, samples, seed) for lhs, rhs in pairs]
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_equation(equation):
+    """Parse "lhs = rhs" into f = lhs - rhs plus f' and f'', all lambdified."""
+    lhs, _, rhs = equation.partition("=")
+    expr = parse_trig_expression(lhs) - parse_trig_expression(rhs or "0")
+    symbols = sorted(expr.free_symbols, key=lambda s: s.name)
+    if len(symbols) > 1:
+        raise ValueError(f"Equation must have a single variable, got {', '.join(s.name for s in symbols)}")
+    var = symbols[0] if symbols else sp.Symbol("x", real=True)
+    d1 = sp.diff(expr, var)
+    d2 = sp.diff(d1, var)
+    return var, expr, tuple(sp.lambdify(var, e, "numpy") for e in (expr, d1, d2))
+
+
+def _evaluate_real(func, x):
+    """Evaluate a lambdified function on x, returning NaN where it is not real."""
+    with np.errstate(all="ignore"):
+        y = np.broadcast_to(np.asarray(func(x), dtype=complex), np.shape(x))
+    return np.where(np.abs(y.imag) < 1e-12, y.real, np.nan)
+
+
+def _newton_bracketed(f, df, a, b, iterations=60):
+    """Refine roots bracketed by [a, b] (arrays) with safeguarded Newton steps."""
+    fa = _evaluate_real(f, a)
+    r = (a + b) / 2
+    for _ in range(iterations):
+        fr = _evaluate_real(f, r)
+        same_side = np.sign(fr) == np.sign(fa)
+        a = np.where(same_side, r, a)
+        fa = np.where(same_side, fr, fa)
+        b = np.where(same_side, b, r)
+        with np.errstate(all="ignore"):
+            step = r - fr / _evaluate_real(df, r)
+        # Fall back to bisection whenever Newton would leave the bracket
+        inside = np.isfinite(step) & (step >= a) & (step <= b)
+        r_next = np.where(inside, step, (a + b) / 2)
+        tiny = 4e-16 * np.maximum(1.0, np.abs(r))
+        converged = (np.abs(r_next - r) <= tiny) | (b - a <= tiny) | (fr == 0)
+        r = np.where(fr == 0, r, r_next)
+        if converged.all():
+            break
+    return r
+
+
+def solve_trig_equation(equation, interval=(0.0, 2 * math.pi), grid=4096, closed=False):
+    """Return every solution of a trig equation on an interval, sorted.
+
+    The equation (e.g. "2sin²θ - sin θ - 1 = 0" or "sin 2θ = cos θ") is
+    evaluated on a vectorized grid. Sign changes are refined with bracketed
+    Newton steps, and touching roots (where f only reaches 0, like
+    sin θ = 1) are found with Newton steps on f'. Poles, where f changes sign
+    without reaching 0, are rejected. The interval is [lo, hi), or [lo, hi]
+    when closed is True.
+    """
+    _, _, (f, df, d2f) = _compile_equation(equation)
+    lo, hi = interval
+    x = np.linspace(lo, hi, grid)
+    y = _evaluate_real(f, x)
+    finite = np.isfinite(y)
+    # Typical size of f; the median ignores the huge values next to poles
+    scale = max(1.0, float(np.median(np.abs(y[finite])))) if finite.any() else 1.0
+
+    # Sign changes between neighbouring grid points
+    change = finite[:-1] & finite[1:] & (np.sign(y[:-1]) * np.sign(y[1:]) < 0)
+    bracketed = _newton_bracketed(f, df, x[:-1][change], x[1:][change])
+
+    # Local minima of |f| that may touch zero without a sign change
+    magnitude = np.where(finite, np.abs(y), np.inf)
+    dip = np.zeros_like(finite)
+    dip[1:-1] = (magnitude[1:-1] <= magnitude[:-2]) & (magnitude[1:-1] <= magnitude[2:])
+    dip[[0, -1]] = magnitude[[0, -1]] < 1e-3 * scale
+    touching = x[dip & (magnitude < 0.1 * scale)]
+    for _ in range(40):
+        with np.errstate(all="ignore"):
+            step = touching - _evaluate_real(df, touching) / _evaluate_real(d2f, touching)
+        step = np.where(np.isfinite(step), step, touching)
+        converged = np.all(np.abs(step - touching) < 1e-14 * np.maximum(1.0, np.abs(step)))
+        touching = step
+        if converged:
+            break
+
+    # Grid points that are roots, and the ends of the interval: Newton steps on
+    # f' would carry a simple root at an end away towards a turning point
+    roots = np.concatenate((bracketed, touching, x[y == 0], x[[0, -1]]))
+    residual = np.abs(_evaluate_real(f, roots))
+    upper = roots <= hi + 1e-12 if closed else roots < hi - 1e-12
+    keep = (residual < 1e-9 * scale) & (roots >= lo - 1e-12) & upper
+    roots = np.sort(np.clip(roots[keep], lo, hi))
+    if roots.size:
+        roots = roots[np.concatenate(([True], np.diff(roots) > 1e-8))]
+    return roots
+
+
+def solve_trig_equations(equations, interval=(0.0, 2 * math.pi), grid=4096, closed=False):
+    """Solve a batch of trig equations; see solve_trig_equation."""
+    return [solve_trig_equation(eq, interval, grid, closed) for eq in equations]
+
+
+@functools.lru_cache(maxsize=1024)
+def general_solution(equation):
+    """Return SymPy's general solution over the reals (e.g. an ImageSet union)."""
+    var, expr, _ = _compile_equation(equation)
+    return sp.solveset(expr, var, domain=sp.S.Reals)
+
+
+# Triangle solving
+# ----------------
+# Triangles are stored structure-of-arrays: one array per side/angle, with
+# NaN for unknowns. Each configuration (AAS/ASA, SSS, SAS, SSA) is solved
+# for all matching rows at once using boolean masks.
+
+TRIANGLE_PARTS = ("a", "b", "c", "A", "B", "C")
+
+
+def _angles_from_sides(S):
+    """Law of Cosines for every row of an (n, 3) side array; angle i is opposite side i."""
+    Sj = np.roll(S, -1, axis=1)
+    Sk = np.roll(S, -2, axis=1)
+    with np.errstate(all="ignore"):
+        cosines = (Sj**2 + Sk**2 - S**2) / (2 * Sj * Sk)
+    valid = np.all(np.abs(cosines) < 1, axis=1)
+    return np.arccos(np.clip(cosines, -1, 1)), valid
+
+
+def solve_triangles(a=None, b=None, c=None, A=None, B=None, C=None, degrees=True, rtol=1e-9):
+    """Solve many triangles at once from arrays of known sides and angles.
+
+    Each argument is a scalar or array (broadcast together), with None/NaN
+    for unknown parts; side a is opposite angle A and so on. Returns a dict
+    with "solutions" (0, 1 or 2 per row) and, for each of a, b, c, A, B, C
+    and "area", an (n, 2) array whose second column is only filled for the
+    second triangle of an ambiguous SSA case. Rows with too little,
+    inconsistent or impossible data have 0 solutions and NaN values.
+    """
+    parts = [np.nan if v is None else v for v in (a, b, c, A, B, C)]
+    parts = [np.atleast_1d(np.asarray(p, dtype=float)) for p in np.broadcast_arrays(*parts)]
+    S = np.stack(parts[:3], axis=-1).reshape(-1, 3)
+    T = np.stack(parts[3:], axis=-1).reshape(-1, 3)
+    if degrees:
+        T = np.radians(T)
+    n = len(S)
+
+    ks = np.isfinite(S)
+    kt = np.isfinite(T)
+    ns = ks.sum(axis=1)
+    nt = kt.sum(axis=1)
+    # Non-positive sides or angles outside (0, π) make the row unsolvable
+    bad = np.any(ks & ~(S > 0), axis=1) | np.any(kt & ~((T > 0) & (T < np.pi)), axis=1)
+
+    out_S = np.full((n, 2, 3), np.nan)
+    out_T = np.full((n, 2, 3), np.nan)
+
+    def close(x, y):
+        return np.abs(x - y) <= rtol * np.maximum(np.abs(x), np.abs(y))
+
+    # AAS / ASA: two angles give the third, one side gives the scale
+    rows = np.flatnonzero(~bad & (nt >= 2) & (ns >= 1))
+    if rows.size:
+        t = T[rows]
+        total = np.nansum(t, axis=1)
+        t = np.where(kt[rows], t, (np.pi - total)[:, None])
+        ok = np.all(t > 0, axis=1) & close(t.sum(axis=1), np.pi)
+        side = np.argmax(ks[rows], axis=1)
+        pick = np.arange(rows.size)
+        scale = S[rows, side] / np.sin(t[pick, side])
+        s = scale[:, None] * np.sin(t)
+        ok &= np.all(close(s, S[rows]) | ~ks[rows], axis=1)
+        out_S[rows[ok], 0] = s[ok]
+        out_T[rows[ok], 0] = t[ok]
+
+    # SSS: three sides give every angle
+    rows = np.flatnonzero(~bad & (ns == 3) & (nt < 2))
+    if rows.size:
+        t, ok = _angles_from_sides(S[rows])
+        ok &= np.all(close(t, T[rows]) | ~kt[rows], axis=1)
+        out_S[rows[ok], 0] = S[rows[ok]]
+        out_T[rows[ok], 0] = t[ok]
+
+    # Two sides and one angle: SAS if the angle is opposite the unknown side
+    rows = np.flatnonzero(~bad & (ns == 2) & (nt == 1))
+    if rows.size:
+        u = np.argmin(ks[rows], axis=1)
+        k = np.argmax(kt[rows], axis=1)
+        s = S[rows]
+        angle = T[rows, k]
+
+        sas = u == k
+        if sas.any():
+            r, s1 = rows[sas], s[sas]
+            # nan_to_num zeroes the unknown side, leaving the two known ones
+            known = np.nan_to_num(s1)
+            s1[np.arange(r.size), u[sas]] = np.sqrt(
+                np.sum(known**2, axis=1)
+                - 2 * np.prod(np.where(known > 0, known, 1.0), axis=1) * np.cos(angle[sas]))
+            t, ok = _angles_from_sides(s1)
+            out_S[r[ok], 0] = s1[ok]
+            out_T[r[ok], 0] = t[ok]
+
+        ssa = ~sas
+        if ssa.any():
+            r, s1, t_known, kk, uu = rows[ssa], s[ssa], angle[ssa], k[ssa], u[ssa]
+            pick = np.arange(r.size)
+            o = 3 - kk - uu
+            ratio = s1[pick, o] * np.sin(t_known) / s1[pick, kk]
+            # Snap the right-triangle case so round-off does not split it in two
+            ratio = np.where(np.abs(ratio - 1) <= rtol, 1.0, ratio)
+            base = np.arcsin(np.clip(ratio, -1, 1))
+            for column, t_other in enumerate((base, np.pi - base)):
+                t_third = np.pi - t_known - t_other
+                ok = (ratio <= 1 + rtol) & (t_third > 0)
+                if column == 1:
+                    # The second triangle exists only when it differs from the first
+                    ok &= t_other - base > 1e-12
+                tri_t = np.empty((r.size, 3))
+                tri_t[pick, kk] = t_known
+                tri_t[pick, o] = t_other
+                tri_t[pick, uu] = t_third
+                tri_s = s1.copy()
+                tri_s[pick, uu] = s1[pick, kk] * np.sin(t_third) / np.sin(t_known)
+                out_S[r[ok], column] = tri_s[ok]
+                out_T[r[ok], column] = tri_t[ok]
+
+    solutions = np.isfinite(out_S[:, :, 0]).sum(axis=1)
+    area = 0.5 * out_S[:, :, 0] * out_S[:, :, 1] * np.sin(out_T[:, :, 2])
+    if degrees:
+        out_T = np.degrees(out_T)
+    result = {"solutions": solutions, "area": area}
+    for i, name in enumerate(TRIANGLE_PARTS[:3]):
+        result[name] = out_S[:, :, i]
+    for i, name in enumerate(TRIANGLE_PARTS[3:]):
+        result[name] = out_T[:, :, i]
+    return result
+
+
+# Sequences and series
+# --------------------
+# Closed forms are written with plain operators, so the same function gives
+# exact answers for ints/Fractions and vectorized ones for float arrays of n.
+# Long tables are produced in chunks, and series without a closed form are
+# streamed term by term, so memory stays constant however far they run.
+
+SEQUENCE_KINDS = ("arithmetic", "geometric")
+
+
+def nth_term(kind, first, step, n):
+    """aₙ of an arithmetic (step = d) or geometric (step = r) sequence, n from 1."""
+    if kind == "arithmetic":
+        return first + (n - 1) * step
+    if kind == "geometric":
+        return first * step ** (n - 1)
+    raise ValueError(f"Unknown sequence kind: {kind}")
+
+
+def _divide(numerator, denominator):
+    """numerator / denominator, as an int when both are ints (the closed forms divide exactly)."""
+    if isinstance(numerator, int) and isinstance(denominator, int):
+        return numerator // denominator
+    return numerator / denominator
+
+
+def partial_sum(kind, first, step, n):
+    """Sₙ = a₁ + ... + aₙ from the closed form."""
+    if kind == "arithmetic":
+        # n(2a₁ + (n - 1)d) is always even for integers
+        return _divide(n * (2 * first + (n - 1) * step), 2)
+    if kind == "geometric":
+        if step == 1:
+            return first * n
+        # 1 - rⁿ is a multiple of 1 - r for integers
+        return _divide(first * (1 - step ** n), 1 - step)
+    raise ValueError(f"Unknown sequence kind: {kind}")
+
+
+def infinite_sum(kind, first, step):
+    """Sum of the whole series, or None if it diverges."""
+    if first == 0:
+        return first
+    if kind == "geometric" and abs(step) < 1:
+        return first / (1 - step)
+    if kind not in SEQUENCE_KINDS:
+        raise ValueError(f"Unknown sequence kind: {kind}")
+    return None
+
+
+def sequence_chunks(kind, first, step, stop, start=1, chunk_size=65536):
+    """Yield (n, terms, partial_sums) float arrays for n = start..stop in chunks."""
+    first, step = float(first), float(step)
+    for lo in range(start, stop + 1, chunk_size):
+        n = np.arange(lo, min(lo + chunk_size, stop + 1), dtype=float)
+        with np.errstate(over="ignore", invalid="ignore"):
+            yield n, nth_term(kind, first, step, n), partial_sum(kind, first, step, n)
+
+
+def write_sequence_table(out, kind, first, step, count, chunk_size=65536):
+    """Write a CSV table of n, aₙ and Sₙ for the first count terms."""
+    out.write("n,term,partial_sum\n")
+    for n, terms, sums in sequence_chunks(kind, first, step, count, chunk_size=chunk_size):
+        np.savetxt(out, np.column_stack([n, terms, sums]), fmt="%.10g", delimiter=",")
+
+
+def iter_series(term, start=1, stop=None):
+    """Yield (n, aₙ, Sₙ) for any term(n), with a running sum; endless if stop is None.
+
+    Exact inputs stay exact, e.g. ``lambda n: Fraction(1, n**2)``.
+    """
+    total = 0
+    n = start
+    while stop is None or n <= stop:
+        value = term(n)
+        total += value
+        yield n, value, total
+        n += 1
+
+
+@functools.lru_cache(maxsize=256)
+def pascal_row(n):
+    """Row n of Pascal's triangle as exact ints, C(n, 0) ... C(n, n).
+
+    Uses C(n, k) = C(n, k-1) (n-k+1) / k and the row's symmetry, so no
+    factorials are formed; rows for high powers are cached.
+    """
+    if n < 0:
+        raise ValueError("The power must be a non-negative integer")
+    half = [1]
+    for k in range(1, n // 2 + 1):
+        half.append(half[-1] * (n - k + 1) // k)
+    mirror = half[::-1] if n % 2 else half[-2::-1]
+    return tuple(half + mirror)
+
+
+def binomial_coefficients(n, a=1, b=1):
+    """Coefficients of x^(n-k) y^k in (ax + by)^n for k = 0..n, exact for int/Fraction a, b."""
+    return [c * a ** (n - k) * b ** k for k, c in enumerate(pascal_row(n))]
+
+
+_SUPERSCRIPTS = str.maketrans("0123456789-", "⁰¹²³⁴⁵⁶⁷⁸⁹⁻")
+
+
+def _power(name, exponent):
+    if exponent == 0:
+        return ""
+    if exponent == 1:
+        return name
+    return name + str(exponent).translate(_SUPERSCRIPTS)
+
+
+def format_binomial_expansion(n, a=1, b=1, x="x", y="y"):
+    """Expand (ax + by)^n as text, e.g. "x³ + 3x²y + 3xy² + y³"."""
+    return _format_terms((c, _power(x, n - k) + _power(y, k))
+                         for k, c in enumerate(binomial_coefficients(n, a, b)))
+
+
+def _format_terms(terms):
+    """Join (coefficient, variables) pairs into "3x² - xy + 2" style text."""
+    parts = []
+    for coefficient, variables in terms:
+        if coefficient == 0:
+            continue
+        sign = "-" if coefficient < 0 else "+"
+        magnitude = abs(coefficient)
+        if isinstance(magnitude, Fraction) and magnitude.denominator == 1:
+            magnitude = magnitude.numerator
+        if isinstance(magnitude, float):
+            magnitude = f"{magnitude:g}"
+        if magnitude in (1, "1") and variables:
+            text = variables
+        elif isinstance(magnitude, Fraction) and variables:
+            text = f"({magnitude}){variables}"
+        else:
+            text = f"{magnitude}{variables}"
+        parts.append((sign, text))
+    if not parts:
+        return "0"
+    sign, text = parts[0]
+    return ("-" if sign == "-" else "") + text + "".join(f" {s} {t}" for s, t in parts[1:])
+
+
+# Vectors and matrices
+# --------------------
+# Everything works on stacks: arrays of shape (..., n) for vectors and
+# (..., n, n) for matrices, so thousands of small problems are one
+# batched np.linalg call. Singular matrices give NaN instead of failing
+# the whole stack as np.linalg does: they are swapped for the identity
+# before the call and their results masked afterwards.
+
+def dot(u, v):
+    """Dot product over the last axis of stacked vectors."""
+    return np.einsum("...i,...i->...", np.asarray(u, dtype=float), np.asarray(v, dtype=float))
+
+
+def cross(u, v):
+    """Cross product of stacked 3-vectors (the z component for 2-vectors)."""
+    return np.cross(np.asarray(u, dtype=float), np.asarray(v, dtype=float))
+
+
+def vector_angle(u, v, degrees=True):
+    """Angle between stacked vectors; NaN if either is the zero vector."""
+    u = np.asarray(u, dtype=float)
+    v = np.asarray(v, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cosine = dot(u, v) / (np.linalg.norm(u, axis=-1) * np.linalg.norm(v, axis=-1))
+    angle = np.arccos(np.clip(cosine, -1, 1))
+    return np.degrees(angle) if degrees else angle
+
+
+def _det(A):
+    """Determinants, in closed form for the 2x2 and 3x3 stacks the guide mostly sees.
+
+    np.linalg.det makes one LAPACK call per matrix, which costs several
+    times more than these products for small matrices.
+    """
+    n = A.shape[-1]
+    if n == 2:
+        return A[..., 0, 0] * A[..., 1, 1] - A[..., 0, 1] * A[..., 1, 0]
+    if n == 3:
+        return dot(A[..., 0, :], cross(A[..., 1, :], A[..., 2, :]))
+    return np.linalg.det(A)
+
+
+def _nonsingular(A):
+    """Return (A with its singular matrices replaced by I, det, singular mask).
+
+    The test runs on A with its rows scaled to unit length, whose |det| is
+    at most 1 (Hadamard's inequality, equality for orthogonal rows), so it
+    does not depend on the matrices' scale. Rows whose squared norm leaves
+    the float range (entries beyond about 1e±150) count as singular.
+    """
+    A = np.asarray(A, dtype=float)
+    if A.ndim < 2 or A.shape[-1] != A.shape[-2]:
+        raise ValueError(f"Expected square matrices, got shape {A.shape}")
+    n = A.shape[-1]
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore", under="ignore"):
+        norms = np.sqrt(np.einsum("...ij,...ij->...i", A, A))
+        unit_det = _det(A / norms[..., None])
+        det = unit_det * np.prod(norms, axis=-1)
+    # A zero row gives NaN here, which also counts as singular
+    singular = ~(np.abs(unit_det) > n * np.finfo(float).eps)
+    det = np.where(singular, 0.0, det)
+    safe = np.where(singular[..., None, None], np.eye(n), A) if singular.any() else A
+    return safe, det, singular
+
+
+def _solve(safe, singular, b):
+    """np.linalg.solve for stacked vectors b (..., n); NaN where A is singular.
+
+    A single matrix is factored once and solved against every b as the
+    columns of one right-hand side; broadcasting it against a stack of b
+    would factor it again for each vector.
+    """
+    b = np.asarray(b, dtype=float)
+    if safe.ndim == 2 and b.ndim > 1:
+        n = safe.shape[-1]
+        x = np.linalg.solve(safe, b.reshape(-1, n).T).T.reshape(b.shape)
+        if singular:
+            x[...] = np.nan
+        return x
+    x = np.linalg.solve(safe, b[..., None])[..., 0]
+    x[np.broadcast_to(singular, x.shape[:-1])] = np.nan
+    return x
+
+
+def _inverse(safe, singular):
+    """np.linalg.inv for the stack; NaN where A is singular."""
+    inverse = np.linalg.inv(safe)
+    inverse[singular] = np.nan
+    return inverse
+
+
+def singular_matrices(A):
+    """Mask of the stacked square matrices that are (numerically) singular."""
+    return _nonsingular(A)[2]
+
+
+def determinants(A):
+    """Determinants of stacked square matrices (0 for singular ones)."""
+    return _nonsingular(A)[1]
+
+
+def inverses(A):
+    """Inverses of stacked square matrices; NaN where a matrix is singular."""
+    safe, _, singular = _nonsingular(A)
+    return _inverse(safe, singular)
+
+
+def solve_systems(A, b):
+    """Solve stacked systems A x = b; NaN where A is singular.
+
+    ``b`` has shape (..., n) and broadcasts against the stack of A, so one
+    matrix can be solved against many right-hand sides and vice versa.
+    """
+    safe, _, singular = _nonsingular(A)
+    return _solve(safe, singular, b)
+
+
+# Polynomials and rational functions
+# ----------------------------------
+# Coefficients are listed highest degree first, as in np.polyval. Values
+# come from Horner's method over whole grids; roots are the eigenvalues of
+# companion matrices, one np.linalg.eigvals call for a stack of same-degree
+# polynomials. Asymptotes and holes are found from the roots, so graphs
+# can be split at the poles instead of joining the branches.
+
+# Roots closer than this (relative) are treated as one repeated root; a
+# root of multiplicity m is only found to about eps**(1/m)
+ROOT_TOLERANCE = 1e-5
+
+
+def horner(coeffs, x):
+    """Evaluate polynomials by Horner's method.
+
+    ``coeffs`` is (d+1,) for one polynomial, or a stack (..., d+1) whose
+    leading shape broadcasts against x (e.g. (P, 1, d+1) with x of shape
+    (N,) gives a (P, N) table).
+    """
+    coeffs = np.asarray(coeffs, dtype=float)
+    if isinstance(x, Dual):
+        # Forward mode: the derivative polynomial rides along with the value
+        slope = horner(coeffs[..., :-1] * np.arange(coeffs.shape[-1] - 1, 0, -1), x.value)
+        return Dual(horner(coeffs, x.value), slope * x.deriv)
+    x = np.asarray(x, dtype=float)
+    result = np.zeros(np.broadcast_shapes(coeffs.shape[:-1], x.shape))
+    for k in range(coeffs.shape[-1]):
+        result *= x
+        result += coeffs[..., k]
+    return result
+
+
+def poly_roots(coeffs):
+    """All complex roots of a stack of polynomials (..., d+1), via companion matrices.
+
+    Every polynomial in the stack must have a nonzero leading coefficient.
+    Roots are sorted by real, then imaginary part.
+    """
+    coeffs = np.asarray(coeffs, dtype=float)
+    degree = coeffs.shape[-1] - 1
+    if degree < 1:
+        return np.empty(coeffs.shape[:-1] + (0,), dtype=complex)
+    leading = coeffs[..., :1]
+    if np.any(leading == 0):
+        raise ValueError("Leading coefficients must be nonzero")
+    companion = np.zeros(coeffs.shape[:-1] + (degree, degree))
+    companion[..., 0, :] = -coeffs[..., 1:] / leading
+    companion[..., np.arange(1, degree), np.arange(degree - 1)] = 1.0
+    roots = np.linalg.eigvals(companion)
+    order = np.lexsort((roots.imag, roots.real), axis=-1)
+    return np.take_along_axis(roots, order, axis=-1)
+
+
+def _trim_coefficients(coeffs):
+    coeffs = np.trim_zeros(np.atleast_1d(np.asarray(coeffs, dtype=float)), "f")
+    return coeffs if coeffs.size else np.zeros(1)
+
+
+def real_roots(coeffs):
+    """Distinct real roots of one polynomial and their multiplicities."""
+    coeffs = _trim_coefficients(coeffs)
+    roots = poly_roots(coeffs) if coeffs.size > 1 else np.empty(0, dtype=complex)
+    scale = 1 + np.abs(roots.real)
+    real = np.sort(roots.real[np.abs(roots.imag) <= ROOT_TOLERANCE * scale])
+    if not real.size:
+        return real, np.empty(0, dtype=int)
+    # Split the sorted roots wherever neighbours are further apart than the tolerance
+    breaks = np.flatnonzero(np.diff(real) > ROOT_TOLERANCE * (1 + np.abs(real[1:]))) + 1
+    clusters = np.split(real, breaks)
+    return np.array([c.mean() for c in clusters]), np.array([len(c) for c in clusters])
+
+
+def format_polynomial(coeffs, x="x"):
+    """Format coefficients (highest degree first) as text, e.g. "2x² - 3x + 1"."""
+    coeffs = _trim_coefficients(coeffs)
+    degree = len(coeffs) - 1
+    return _format_terms((float(c), _power(x, degree - k)) for k, c in enumerate(coeffs))
+
+
+class RationalFunction:
+    """p(x)/q(x) from coefficient lists, with its features found analytically.
+
+    Attributes: zeros, vertical_asymptotes, holes (as (x, y) pairs),
+    horizontal_asymptote (a value or None), slant_asymptote ((m, b) or
+    None) and y_intercept (None if 0 is not in the domain).
+    """
+
+    def __init__(self, numerator, denominator=(1.0,)):
+        self.numerator = _trim_coefficients(numerator)
+        self.denominator = _trim_coefficients(denominator)
+        if not self.denominator.any():
+            raise ValueError("The denominator cannot be zero")
+
+        # A root of q is a hole if p has it at least as often, else a pole
+        p_roots, p_counts = real_roots(self.numerator) if self.numerator.any() else (np.empty(0), [])
+        q_roots, q_counts = real_roots(self.denominator)
+        poles, holes = [], []
+        for root, count in zip(q_roots, q_counts):
+            near = np.abs(p_roots - root) <= ROOT_TOLERANCE * (1 + abs(root))
+            if near.any() and p_counts[np.argmax(near)] >= count:
+                holes.append(root)
+            else:
+                poles.append(root)
+        self.vertical_asymptotes = np.array(poles)
+        self.holes = [(x, self._limit(x)) for x in holes]
+        hole_x = np.array(holes)
+        self.zeros = np.array([r for r in p_roots
+                               if not (hole_x.size and np.any(np.abs(hole_x - r) <= ROOT_TOLERANCE * (1 + abs(r))))])
+
+        dp, dq = len(self.numerator) - 1, len(self.denominator) - 1
+        self.horizontal_asymptote = None
+        self.slant_asymptote = None
+        if dq >= 1:
+            if dp < dq or not self.numerator.any():
+                self.horizontal_asymptote = 0.0
+            elif dp == dq:
+                self.horizontal_asymptote = self.numerator[0] / self.denominator[0]
+            elif dp == dq + 1:
+                m, b = np.polydiv(self.numerator, self.denominator)[0]
+                self.slant_asymptote = (m, b)
+        q0 = self.denominator[-1]
+        self.y_intercept = self.numerator[-1] / q0 if q0 != 0 else None
+
+    def __call__(self, x):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return horner(self.numerator, x) / horner(self.denominator, x)
+
+    def _limit(self, x):
+        """Value approached at a hole: divide (t - x) out of p and q until q(x) ≠ 0."""
+        p, q = self.numerator, self.denominator
+        while abs(horner(q, x)) <= ROOT_TOLERANCE * np.abs(q).max() and len(q) > 1 and len(p) > 1:
+            p = np.polydiv(p, [1.0, -x])[0]
+            q = np.polydiv(q, [1.0, -x])[0]
+        return float(horner(p, x) / horner(q, x))
+
+    def __str__(self):
+        numerator = format_polynomial(self.numerator)
+        if len(self.denominator) == 1 and self.denominator[0] == 1:
+            return numerator
+        return f"({numerator})/({format_polynomial(self.denominator)})"
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_rational(text):
+    """Parse "(x^2 - 1)/(x - 2)" style text into (expr, variable, numerator, denominator)."""
+    expr = sp.together(_parse_sympy(text.replace("²", "^2").replace("³", "^3")))
+    symbols = sorted(expr.free_symbols, key=lambda s: s.name)
+    if len(symbols) > 1:
+        raise ValueError(f"Expected one variable, found {', '.join(s.name for s in symbols)}")
+    x = symbols[0] if symbols else sp.Symbol("x")
+    numerator, denominator = sp.fraction(expr)
+    coefficients = [tuple(float(c) for c in sp.Poly(part, x).all_coeffs()) for part in (numerator, denominator)]
+    return expr, x, coefficients[0], coefficients[1]
+
+
+def parse_rational(text):
+    """Build a RationalFunction from text such as "(2x^2 + 1)/(x^2 - 4)"."""
+    _, _, numerator, denominator = _parse_rational(text)
+    return RationalFunction(numerator, denominator)
+
+
+@functools.lru_cache(maxsize=1024)
+def partial_fractions(text):
+    """Partial fraction decomposition of a rational expression, as text (cached per expression)."""
+    expr, x, _, _ = _parse_rational(text)
+    return str(sp.apart(sp.nsimplify(expr, rational=True), x))
+
+
+# Derivatives and limits
+# ----------------------
+# Derivatives are exact, by forward-mode automatic differentiation: a Dual
+# carries f(x) and f'(x) through NumPy ufuncs, so the vectorized functions
+# used for plotting differentiate over whole arrays of points as they are.
+# Limits are numeric: f is sampled at x0 ± h for halving h on both sides in
+# one call, and each side is extrapolated to h = 0 with Richardson's method.
+
+# Derivative rules for one-argument ufuncs, as f'(x) given x and f(x)
+_DUAL_UNARY_RULES = {
+    "negative": lambda x, fx: -1.0,
+    "positive": lambda x, fx: 1.0,
+    "absolute": lambda x, fx: np.sign(x),
+    "square": lambda x, fx: 2 * x,
+    "sqrt": lambda x, fx: 0.5 / fx,
+    "cbrt": lambda x, fx: 1 / (3 * fx ** 2),
+    "reciprocal": lambda x, fx: -fx ** 2,
+    "exp": lambda x, fx: fx,
+    "expm1": lambda x, fx: fx + 1,
+    "log": lambda x, fx: 1 / x,
+    "log1p": lambda x, fx: 1 / (1 + x),
+    "log2": lambda x, fx: 1 / (x * math.log(2)),
+    "log10": lambda x, fx: 1 / (x * math.log(10)),
+    "sin": lambda x, fx: np.cos(x),
+    "cos": lambda x, fx: -np.sin(x),
+    "tan": lambda x, fx: 1 + fx ** 2,
+    "arcsin": lambda x, fx: 1 / np.sqrt(1 - x ** 2),
+    "arccos": lambda x, fx: -1 / np.sqrt(1 - x ** 2),
+    "arctan": lambda x, fx: 1 / (1 + x ** 2),
+    "sinh": lambda x, fx: np.cosh(x),
+    "cosh": lambda x, fx: np.sinh(x),
+    "tanh": lambda x, fx: 1 - fx ** 2,
+    # Steps are flat between their jumps and have no derivative at them
+    "floor": lambda x, fx: np.where(x == fx, np.nan, 0.0),
+    "ceil": lambda x, fx: np.where(x == fx, np.nan, 0.0),
+    "sign": lambda x, fx: np.where(x == 0, np.nan, 0.0),
+}
+
+# Rules for two-argument ufuncs, as d(f(u, v)) given u, v, du, dv and f(u, v)
+_DUAL_BINARY_RULES = {
+    "add": lambda u, v, du, dv, f: du + dv,
+    "subtract": lambda u, v, du, dv, f: du - dv,
+    "multiply": lambda u, v, du, dv, f: du * v + u * dv,
+    "divide": lambda u, v, du, dv, f: (du * v - u * dv) / v ** 2,
+    "power": lambda u, v, du, dv, f: (v * u ** (v - 1) * du
+                                      + (f * np.log(u) * dv if np.any(dv) else 0.0)),
+}
+
+
+class Dual:
+    """Dual numbers a + bε with ε² = 0, over NumPy arrays.
+
+    ``value`` holds f(x) and ``deriv`` f'(x). NumPy ufuncs (np.sin, np.exp,
+    +, *, ** ...) dispatch through __array_ufunc__, so code written for
+    arrays, such as the functions from make_trig_function or
+    parse_trig_expression, works on Duals unchanged.
+    """
+
+    __slots__ = ("value", "deriv")
+
+    def __init__(self, value, deriv=0.0):
+        self.value = np.asarray(value, dtype=float)
+        self.deriv = np.asarray(deriv, dtype=float)
+
+    @property
+    def shape(self):
+        return np.broadcast_shapes(self.value.shape, self.deriv.shape)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or kwargs:
+            return NotImplemented
+        values = [x.value if isinstance(x, Dual) else np.asarray(x, dtype=float) for x in inputs]
+        derivs = [x.deriv if isinstance(x, Dual) else 0.0 for x in inputs]
+        result = ufunc(*values)
+        if len(inputs) == 1 and ufunc.__name__ in _DUAL_UNARY_RULES:
+            return Dual(result, _DUAL_UNARY_RULES[ufunc.__name__](values[0], result) * derivs[0])
+        if len(inputs) == 2 and ufunc.__name__ in _DUAL_BINARY_RULES:
+            return Dual(result, _DUAL_BINARY_RULES[ufunc.__name__](*values, *derivs, result))
+        return NotImplemented
+
+    def __add__(self, other):
+        return np.add(self, other)
+
+    def __radd__(self, other):
+        return np.add(other, self)
+
+    def __sub__(self, other):
+        return np.subtract(self, other)
+
+    def __rsub__(self, other):
+        return np.subtract(other, self)
+
+    def __mul__(self, other):
+        return np.multiply(self, other)
+
+    def __rmul__(self, other):
+        return np.multiply(other, self)
+
+    def __truediv__(self, other):
+        return np.divide(self, other)
+
+    def __rtruediv__(self, other):
+        return np.divide(other, self)
+
+    def __pow__(self, other):
+        return np.power(self, other)
+
+    def __rpow__(self, other):
+        return np.power(other, self)
+
+    def __neg__(self):
+        return np.negative(self)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return np.absolute(self)
+
+    def __getitem__(self, index):
+        shape = self.shape
+        return Dual(np.broadcast_to(self.value, shape)[index], np.broadcast_to(self.deriv, shape)[index])
+
+    def __repr__(self):
+        return f"Dual({self.value!r}, {self.deriv!r})"
+
+
+def derivative(func, x):
+    """Value and exact derivative of a vectorized function at the points x.
+
+    Returns (f(x), f'(x)) as arrays of x's shape.
+    """
+    x = np.asarray(x, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y = func(Dual(x, 1.0))
+    if isinstance(y, Dual):
+        value, slope = y.value, y.deriv
+    else:
+        value, slope = np.asarray(y, dtype=float), 0.0
+    return np.broadcast_to(value, x.shape).copy(), np.broadcast_to(slope, x.shape).copy()
+
+
+def tangent_lines(func, x0):
+    """Slopes m and intercepts b of the tangent lines y = mx + b at the points x0."""
+    y0, slope = derivative(func, x0)
+    return slope, y0 - slope * np.asarray(x0, dtype=float)
+
+
+def difference_quotients(func, x0, h):
+    """Secant slopes (f(x0 + h) - f(x0))/h for every step h and point x0.
+
+    Returns an array of shape h.shape + x0.shape.
+    """
+    x0 = np.asarray(x0, dtype=float)
+    h = np.asarray(h, dtype=float)
+    h = h.reshape(h.shape + (1,) * x0.ndim)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (func(x0 + h) - func(x0)) / h
+
+
+# Number of halvings of h, and the agreement required of the extrapolations
+LIMIT_STEPS = 8
+LIMIT_TOLERANCE = 1e-6
+CONTINUITY_KINDS = ("continuous", "removable", "jump", "infinite", "oscillating", "undefined")
+
+
+def _richardson(samples):
+    """Extrapolate samples taken at h, h/2, h/4, ... (axis -2) to h = 0.
+
+    Assumes an error expansion in powers of h, as for one-sided limits.
+    Returns (estimate, error), using the extrapolation order whose
+    successive estimates agree best.
+    """
+    column = samples
+    diagonal = [column[..., -1, :]]
+    for j in range(1, samples.shape[-2]):
+        column = column[..., 1:, :] + (column[..., 1:, :] - column[..., :-1, :]) / (2 ** j - 1)
+        diagonal.append(column[..., -1, :])
+    diagonal = np.stack(diagonal)
+    errors = np.abs(np.diff(diagonal, axis=0))
+    errors[np.isnan(errors)] = np.inf
+    best = np.argmin(errors, axis=0)[None]
+    return (np.take_along_axis(diagonal[1:], best, axis=0)[0],
+            np.take_along_axis(errors, best, axis=0)[0])
+
+
+def _aitken(samples):
+    """Aitken Δ² extrapolation of the last samples (axis -2); returns (estimate, error)."""
+    def extrapolate(s0, s1, s2):
+        d1, d2 = s1 - s0, s2 - s1
+        ratio = d2 / d1
+        return np.where((ratio > 0) & (ratio < 0.9), s2 + d2 * ratio / (1 - ratio), np.nan)
+
+    s = [samples[..., k, :] for k in range(-4, 0)]
+    estimate = extrapolate(*s[1:])
+    error = np.abs(estimate - extrapolate(*s[:3]))
+    error[np.isnan(error)] = np.inf
+    return estimate, error
+
+
+def _diverging(samples):
+    """Where samples at shrinking h grow without bound: +1 or -1 for ±∞, else 0.
+
+    Converging samples change by less each step (by half, or faster); a
+    pole's samples change by at least as much each step, in one direction.
+    """
+    steps = np.diff(samples[..., -3:, :], axis=-2)
+    last, previous = steps[..., -1, :], steps[..., -2, :]
+    sign = np.sign(last)
+    growing = ((np.abs(last) >= 0.9 * np.abs(previous)) & (sign == np.sign(previous))
+               & (sign == np.sign(samples[..., -1, :]))
+               & (np.abs(last) > LIMIT_TOLERANCE * (1 + np.abs(samples[..., -1, :]))))
+    return np.where(growing, sign, 0.0)
+
+
+def one_sided_limits(func, x0, h0=None, steps=LIMIT_STEPS):
+    """Left and right limits of a vectorized function at the points x0.
+
+    Both sides for every point come from one call of func. Each limit is
+    ±inf where the function grows without bound and NaN where no limit
+    could be found (e.g. oscillation). Returns a dict of arrays: "left",
+    "right", "left_error", "right_error", and "left_defined" and
+    "right_defined" (False where f is undefined on that side, as left of
+    0 for √x).
+    """
+    x0 = np.atleast_1d(np.asarray(x0, dtype=float))
+    shape = x0.shape
+    x0 = x0.ravel()
+    if h0 is None:
+        h0 = 2.0 ** -4 * np.maximum(1.0, np.abs(x0))
+    h = h0 * 0.5 ** np.arange(steps)[:, None]
+    sides = np.array([-1.0, 1.0])[:, None, None]
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        samples = np.broadcast_to(np.asarray(func(x0 + sides * h), dtype=float), (2, steps, x0.size))
+        estimate, error = _richardson(samples)
+        # Fractional powers of h (√h at a square root's endpoint) defeat
+        # Richardson; their samples still converge geometrically, which
+        # Aitken's Δ² extrapolation picks up
+        found = error <= LIMIT_TOLERANCE * (1 + np.abs(estimate))
+        aitken, aitken_error = _aitken(samples)
+        use_aitken = ~found & (aitken_error <= LIMIT_TOLERANCE * (1 + np.abs(aitken)))
+        estimate = np.where(use_aitken, aitken, estimate)
+        error = np.where(use_aitken, aitken_error, error)
+    diverging = _diverging(samples)
+    found |= use_aitken
+    limits = np.where(diverging != 0, np.copysign(np.inf, diverging), np.where(found, estimate, np.nan))
+    error = np.where(diverging != 0, np.nan, error)
+    defined = ~np.isnan(samples).all(axis=-2)
+    return {"left": limits[0].reshape(shape), "right": limits[1].reshape(shape),
+            "left_error": error[0].reshape(shape), "right_error": error[1].reshape(shape),
+            "left_defined": defined[0].reshape(shape), "right_defined": defined[1].reshape(shape)}
+
+
+def limits(func, x0, h0=None, steps=LIMIT_STEPS):
+    """Two-sided limits at the points x0: NaN where the one-sided limits differ."""
+    sides = one_sided_limits(func, x0, h0, steps)
+    left, right = sides["left"], sides["right"]
+    agree = np.isclose(left, right, rtol=LIMIT_TOLERANCE, atol=LIMIT_TOLERANCE)
+    with np.errstate(invalid="ignore"):
+        return np.where(agree, (left + right) / 2, np.nan)
+
+
+def continuity(func, x0, h0=None, steps=LIMIT_STEPS):
+    """Classify continuity of a vectorized function at the points x0.
+
+    Returns a dict of arrays: "value" (f(x0), NaN if undefined), "left",
+    "right", "limit", "left_continuous", "right_continuous", "continuous"
+    and "kind", one of CONTINUITY_KINDS ("removable" covers both holes and
+    misplaced points; "undefined" means f is undefined around x0). At an
+    endpoint of the domain only the defined side counts, so √x is
+    continuous at 0. Functions that oscillate while they converge, like
+    x sin(1/x) at 0, are reported as "oscillating".
+    """
+    x0 = np.atleast_1d(np.asarray(x0, dtype=float))
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        value = np.broadcast_to(np.asarray(func(x0), dtype=float), x0.shape).copy()
+    value[~np.isfinite(value)] = np.nan
+    sides = one_sided_limits(func, x0, h0, steps)
+    # At an endpoint, the limit is the one from inside the domain
+    left = np.where(sides["left_defined"], sides["left"], sides["right"])
+    right = np.where(sides["right_defined"], sides["right"], left)
+
+    def close(a, b):
+        return np.isclose(a, b, rtol=LIMIT_TOLERANCE, atol=LIMIT_TOLERANCE)
+
+    with np.errstate(invalid="ignore"):
+        limit = np.where(close(left, right), (left + right) / 2, np.nan)
+    finite = np.isfinite(limit)
+    left_continuous = np.isfinite(left) & close(value, left)
+    right_continuous = np.isfinite(right) & close(value, right)
+    continuous = left_continuous & right_continuous
+    outside = ~(sides["left_defined"] | sides["right_defined"])
+    kind = np.select(
+        [continuous, finite, np.isfinite(left) & np.isfinite(right), np.isinf(left) | np.isinf(right),
+         ~outside], CONTINUITY_KINDS[:5], default="undefined")
+    return {"value": value, "left": sides["left"], "right": sides["right"], "limit": limit,
+            "left_continuous": left_continuous, "right_continuous": right_continuous,
+            "continuous": continuous, "kind": kind}
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_function(text):
+    """Compile a one-variable expression such as "sin(x)/x" to a vectorized NumPy function.
+
+    The result accepts arrays and Duals alike.
+    """
+    expr = parse_trig_expression(text)
+    symbols = sorted(expr.free_symbols, key=lambda s: s.name)
+    if len(symbols) > 1:
+        raise ValueError(f"Expected one variable, found {', '.join(s.name for s in symbols)}")
+    return sp.lambdify(symbols or [sp.Symbol("x")], expr, "numpy")
+
+
+# Conic sections
+# --------------
+# A conic Ax² + Bxy + Cy² + Dx + Ey + F = 0 is a row [A, B, C, D, E, F];
+# batches are (N, 6) arrays. Classification uses the invariants of the
+# quadratic part Q = [[A, B/2], [B/2, C]] and of the full 3x3 matrix M, so
+# no curve is evaluated. Nondegenerate conics are drawn from parametric
+# forms in the eigenbasis of Q (one batched np.linalg.eigh call); degenerate
+# ones are traced by marching squares, all of them evaluated on one cached
+# grid with a single tensordot.
+
+CONIC_KINDS = ("circle", "ellipse", "parabola", "hyperbola", "point",
+               "intersecting lines", "parallel lines", "line", "empty")
+# Invariants are compared with zero after scaling each conic to max |coefficient| = 1
+CONIC_TOLERANCE = 1e-9
+
+
+def _conic_invariants(coeffs):
+    """Scaled coefficients and (Δ = det M, δ = det Q, I = A + C, K) per conic."""
+    coeffs = np.atleast_2d(np.asarray(coeffs, dtype=float))
+    scale = np.abs(coeffs).max(axis=-1, keepdims=True)
+    coeffs = coeffs / np.where(scale > 0, scale, 1.0)
+    A, B, C, D, E, F = np.moveaxis(coeffs, -1, 0)
+    delta = A * C - B * B / 4
+    Delta = (A * (C * F - E * E / 4) - B / 2 * (B / 2 * F - E * D / 4)
+             + D / 2 * (B * E / 4 - C * D / 2))
+    K = (A * F - D * D / 4) + (C * F - E * E / 4)
+    return coeffs, Delta, delta, A + C, K
+
+
+def classify_conics(coeffs, tol=CONIC_TOLERANCE):
+    """Classify a batch of conics (N, 6) from their discriminants and invariants.
+
+    Returns a dict of arrays: "kind" (from CONIC_KINDS), "discriminant"
+    (B² - 4AC), "determinant" (of the 3x3 matrix), "center" (N, 2; NaN
+    without one), "angle" (radians to rotate the axes by to remove the xy
+    term), "semi_axes" (N, 2; major and minor for ellipses, transverse and
+    conjugate for hyperbolas) and "eccentricity".
+    """
+    scaled, Delta, delta, trace, K = _conic_invariants(coeffs)
+    A, B, C, D, E, F = np.moveaxis(scaled, -1, 0)
+    degenerate = np.abs(Delta) <= tol
+    central = np.abs(delta) > tol
+    linear = (np.abs(scaled[..., :3]) <= tol).all(axis=-1)
+    kind = np.select(
+        [linear & ((np.abs(D) > tol) | (np.abs(E) > tol)), linear,
+         ~degenerate & (delta > tol) & (Delta * trace < 0) & (np.abs(A - C) <= tol) & (np.abs(B) <= tol),
+         ~degenerate & (delta > tol) & (Delta * trace < 0),
+         ~degenerate & (delta < -tol),
+         ~degenerate & ~central,
+         degenerate & (delta > tol),
+         degenerate & (delta < -tol),
+         degenerate & ~central & (K < -tol),
+         degenerate & ~central & (np.abs(K) <= tol)],
+        ["line", "empty", "circle", "ellipse", "hyperbola", "parabola", "point",
+         "intersecting lines", "parallel lines", "line"], default="empty")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        center = np.stack([(B * E - 2 * C * D), (B * D - 2 * A * E)], axis=-1) / (4 * delta)[..., None]
+        center[~central] = np.nan
+        center += 0.0  # no "-0" centers
+        # In the eigenbasis of Q, a central conic is λ₁u² + λ₂v² = -F'
+        shifted = F + (D * center[..., 0] + E * center[..., 1]) / 2
+        eigenvalues = np.linalg.eigvalsh(_conic_quadratic_part(scaled))
+        squares = -shifted[..., None] / eigenvalues
+        semi_axes = np.sqrt(np.abs(squares))
+        ellipse = np.isin(kind, ("circle", "ellipse"))
+        hyperbola = kind == "hyperbola"
+        # Ellipses: major axis first; hyperbolas: transverse (positive square) first
+        order = np.where(ellipse[..., None], np.argsort(-semi_axes, axis=-1),
+                         np.argsort(squares < 0, axis=-1, kind="stable"))
+        semi_axes = np.take_along_axis(semi_axes, order, axis=-1)
+        semi_axes[~(ellipse | hyperbola)] = np.nan
+        ratio = (semi_axes[..., 1] / semi_axes[..., 0]) ** 2
+        eccentricity = np.select([ellipse, hyperbola, kind == "parabola"],
+                                 [np.sqrt(1 - ratio), np.sqrt(1 + ratio), 1.0], default=np.nan)
+    scale = np.abs(np.atleast_2d(np.asarray(coeffs, dtype=float))).max(axis=-1)
+    return {
+        "kind": kind,
+        "discriminant": (B * B - 4 * A * C) * scale ** 2,
+        "determinant": Delta * scale ** 3,
+        "center": center,
+        "angle": np.where(np.abs(B) <= tol, 0.0, 0.5 * np.arctan2(B, A - C)),
+        "semi_axes": semi_axes,
+        "eccentricity": eccentricity,
+    }
+
+
+def _conic_quadratic_part(coeffs):
+    A, B, C = coeffs[..., 0], coeffs[..., 1], coeffs[..., 2]
+    return np.stack([np.stack([A, B / 2], axis=-1), np.stack([B / 2, C], axis=-1)], axis=-2)
+
+
+@functools.lru_cache(maxsize=16)
+def _conic_grid(domain, num):
+    """Grid axes and the monomials x², xy, y², x, y, 1 on it, shared by every conic."""
+    lo, hi = domain
+    x = np.linspace(lo, hi, num)
+    X, Y = np.meshgrid(x, x)
+    monomials = np.stack([X * X, X * Y, Y * Y, X, Y, np.ones_like(X)])
+    monomials.setflags(write=False)
+    return x, monomials
+
+
+def _parametric_conics(scaled, kinds, reach, num):
+    """Polylines for the nondegenerate conics from their eigenbasis parametrizations."""
+    curves = [[] for _ in range(len(scaled))]
+    eigenvalues, eigenvectors = np.linalg.eigh(_conic_quadratic_part(scaled))
+    A, B, C, D, E, F = np.moveaxis(scaled, -1, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        center = np.stack([(B * E - 2 * C * D), (B * D - 2 * A * E)], axis=-1) / (4 * A * C - B * B)[..., None]
+        shifted = F + (D * center[..., 0] + E * center[..., 1]) / 2
+
+    def place(origin, u, v, e1, e2):
+        # (rows, num) coordinates in the eigenbasis -> (rows, num, 2) points
+        return origin[:, None, :] + u[..., None] * e1[:, None, :] + v[..., None] * e2[:, None, :]
+
+    e_first, e_second = eigenvectors[..., :, 0], eigenvectors[..., :, 1]
+    rows = np.flatnonzero(np.isin(kinds, ("circle", "ellipse")))
+    if rows.size:
+        t = np.linspace(0, 2 * np.pi, num)
+        axes = np.sqrt(-shifted[rows, None] / eigenvalues[rows])
+        points = place(center[rows], axes[:, :1] * np.cos(t), axes[:, 1:] * np.sin(t),
+                       e_first[rows], e_second[rows])
+        for row, curve in zip(rows, points):
+            curves[row].append(curve)
+
+    rows = np.flatnonzero(kinds == "hyperbola")
+    if rows.size:
+        squares = -shifted[rows, None] / eigenvalues[rows]
+        transverse = (squares[:, 0] > 0)[:, None]
+        a = np.sqrt(np.abs(np.where(transverse, squares[:, :1], squares[:, 1:])))
+        b = np.sqrt(np.abs(np.where(transverse, squares[:, 1:], squares[:, :1])))
+        e1 = np.where(transverse, e_first[rows], e_second[rows])
+        e2 = np.where(transverse, e_second[rows], e_first[rows])
+        # Far enough along each branch to leave the window
+        s = np.linspace(-1, 1, num) * np.arcsinh(reach / np.minimum(a, b))
+        for sign in (1.0, -1.0):
+            points = place(center[rows], sign * a * np.cosh(s), b * np.sinh(s), e1, e2)
+            for row, curve in zip(rows, points):
+                curves[row].append(curve)
+
+    rows = np.flatnonzero(kinds == "parabola")
+    if rows.size:
+        # λ₁u² + d₁u + d₂v + F = 0 with u along the nonzero eigenvalue's vector
+        big = np.argmax(np.abs(eigenvalues[rows]), axis=-1)
+        e1 = np.where((big == 0)[:, None], e_first[rows], e_second[rows])
+        e2 = np.where((big == 0)[:, None], e_second[rows], e_first[rows])
+        lam = np.take_along_axis(eigenvalues[rows], big[:, None], axis=-1)[:, 0]
+        linear = np.stack([D[rows], E[rows]], axis=-1)
+        d1, d2 = (linear * e1).sum(-1), (linear * e2).sum(-1)
+        vertex = -d1 / (2 * lam)
+        half_width = np.sqrt(2 * reach * np.abs(d2 / lam)) + np.abs(vertex)
+        u = vertex[:, None] + np.linspace(-1, 1, num) * half_width[:, None]
+        v = -(lam[:, None] * u ** 2 + d1[:, None] * u + F[rows, None]) / d2[:, None]
+        for row, curve in zip(rows, place(np.zeros((rows.size, 2)), u, v, e1, e2)):
+            curves[row].append(curve)
+    return curves, center
+
+
+def conic_curves(coeffs, domain=(-10.0, 10.0), num=400, kinds=None):
+    """Polylines tracing a batch of conics over a square window.
+
+    Returns one list of (k, 2) point arrays per conic (a single point for
+    the "point" kind, nothing for "empty"). Pass ``kinds`` from
+    classify_conics to skip classifying again.
+    """
+    scaled = _conic_invariants(coeffs)[0]
+    kinds = classify_conics(coeffs)["kind"] if kinds is None else np.asarray(kinds)
+    domain = (float(domain[0]), float(domain[1]))
+    reach = 2 * max(abs(domain[0]), abs(domain[1])) + 1.0
+    curves, center = _parametric_conics(scaled, kinds, reach, num)
+    for row in np.flatnonzero(kinds == "point"):
+        curves[row].append(center[row][None, :])
+
+    # Degenerate conics: marching squares on the shared grid. A double line
+    # has no sign change, so its gradient across the line is traced instead
+    rows = np.flatnonzero(np.isin(kinds, ("intersecting lines", "parallel lines", "line")))
+    if rows.size:
+        # Matplotlib's own contouring library, imported directly so no figure is needed
+        import contourpy
+
+        x, monomials = _conic_grid(domain, num)
+        fields = scaled[rows].copy()
+        A, B, C, D, E, _ = fields.T
+        double = (kinds[rows] == "line") & (np.abs(fields[:, :3]) > CONIC_TOLERANCE).any(axis=-1)
+        if double.any():
+            _, vectors = np.linalg.eigh(_conic_quadratic_part(fields[double]))
+            nx, ny = vectors[:, 0, 1], vectors[:, 1, 1]
+            gradient = np.zeros((double.sum(), 6))
+            gradient[:, 3] = 2 * A[double] * nx + B[double] * ny
+            gradient[:, 4] = B[double] * nx + 2 * C[double] * ny
+            gradient[:, 5] = D[double] * nx + E[double] * ny
+            fields[double] = gradient
+        values = np.tensordot(fields, monomials, axes=1)
+        for row, z in zip(rows, values):
+            curves[row].extend(contourpy.contour_generator(x, x, z).lines(0.0))
+    return curves
+
+
+@functools.lru_cache(maxsize=1024)
+def _degree_bound(expr):
+    """Upper bound on the polynomial degree of expr, found without expanding it."""
+    if expr.is_Pow and expr.exp.is_Integer and expr.exp > 0:
+        return _degree_bound(expr.base) * int(expr.exp)
+    if expr.is_Mul:
+        return sum(_degree_bound(arg) for arg in expr.args)
+    if expr.is_Add:
+        return max(_degree_bound(arg) for arg in expr.args)
+    return 1 if expr.free_symbols else 0
+
+
+# Equations whose terms could reach a higher degree than this are rejected
+# before expanding them, which for (x + y + 1)^100 would take seconds; the
+# margin above 2 leaves room for terms that cancel, as in (x + 1)^3 - x^3
+CONIC_MAX_EXPANDED_DEGREE = 6
+
+
+def parse_conic(text):
+    """Coefficients (A, B, C, D, E, F) of an equation such as "x^2/9 + y^2/4 = 1"."""
+    x, y = sp.symbols("x y")
+    text = text.replace("²", "^2")
+    sides = [_parse_sympy(side, {"x": x, "y": y}) for side in text.split("=")]
+    if len(sides) > 2:
+        raise ValueError("Expected one equation")
+    expr = sides[0] - (sides[1] if len(sides) == 2 else 0)
+    if _degree_bound(expr) > CONIC_MAX_EXPANDED_DEGREE:
+        raise ValueError("A conic has degree at most 2")
+    expr = sp.expand(expr)
+    if expr.free_symbols - {x, y}:
+        raise ValueError("Use only the variables x and y")
+    poly = sp.Poly(expr, x, y)
+    if poly.total_degree() > 2:
+        raise ValueError("A conic has degree at most 2")
+    monomials = ((2, 0), (1, 1), (0, 2), (1, 0), (0, 1), (0, 0))
+    return tuple(float(poly.coeff_monomial(x ** i * y ** j)) for i, j in monomials)
+
+
+def format_conic(coeffs):
+    """Format [A, B, C, D, E, F] as "Ax² + Bxy + Cy² + Dx + Ey + F = 0"."""
+    names = ("x²", "xy", "y²", "x", "y", "")
+    return f"{_format_terms((float(c), name) for c, name in zip(coeffs, names)) or '0'} = 0"
+
+
+# The classic table: every 30° (twelfths of a turn) and every 45° (eighths)
+UNIT_CIRCLE_DIVISIONS = (12, 8)
+
+
+def _surd(expr):
+    """Write a SymPy value with radicals the way the guide does (e.g. -√3/2)."""
+    text = sp.sstr(expr).replace("*", "")
+    text = re.sub(r"sqrt\((\d+)\)", r"√\1", text)
+    return text.replace("sqrt(", "√(").replace("pi", "π")
+
+
+@functools.lru_cache(maxsize=4096)
+def _exact_cos_sin(turn):
+    """Exact (cos, sin) surd strings for an angle given as a Fraction of a turn."""
+    theta = 2 * sp.pi * sp.Rational(turn.numerator, turn.denominator)
+    return _surd(sp.cos(theta)), _surd(sp.sin(theta))
+
+
+def _degree_label(degrees):
+    if degrees.denominator == 1:
+        return f"{degrees.numerator}°"
+    return f"{float(degrees):g}°"
+
+
+@functools.lru_cache(maxsize=64)
+def _unit_circle_table(divisions, include_end, exact):
+    turns = sorted({Fraction(k, n) for n in divisions for k in range(n)})
+    if include_end:
+        turns.append(Fraction(1))
+
+    turn_values = np.array([float(t) for t in turns])
+    radians = 2 * np.pi * turn_values
+    cos_vals = np.cos(radians)
+    sin_vals = np.sin(radians)
+    # Snap the rounding noise at multiples of π/2 back to exact zeros
+    cos_vals[np.abs(cos_vals) < 1e-15] = 0.0
+    sin_vals[np.abs(sin_vals) < 1e-15] = 0.0
+    for array in (turn_values, radians, cos_vals, sin_vals):
+        array.flags.writeable = False
+
+    table = {
+        "turns": tuple(turns),
+        "degrees": tuple(_degree_label(360 * t) for t in turns),
+        "radians": tuple(_pi_label((2 * t).numerator, (2 * t).denominator) for t in turns),
+        "radian_values": radians,
+        "cos": cos_vals,
+        "sin": sin_vals,
+    }
+    if exact:
+        pairs = [_exact_cos_sin(t % 1) for t in turns]
+        table["coordinates"] = tuple(f"({c}, {s})" for c, s in pairs)
+    return table
+
+
+def unit_circle_table(divisions=UNIT_CIRCLE_DIVISIONS, include_end=True, exact=True):
+    """Generate unit-circle rows for any subdivision of a full turn.
+
+    ``divisions`` is an int n (every 1/n of a turn, e.g. 24 for every 15°,
+    72 for every 5°) or a tuple of them, whose angles are merged. Returns a
+    dict of parallel columns: "turns" (Fractions), "degrees" and "radians"
+    labels, float "radian_values", "cos" and "sin" arrays and, when exact is
+    True, "coordinates" surd strings from SymPy. Results are cached and the
+    arrays are read-only.
+    """
+    if isinstance(divisions, int):
+        divisions = (divisions,)
+    return _unit_circle_table(tuple(sorted(set(divisions))), include_end, exact)
+
+
+TRIG_BASE_FUNCTIONS = ("sin", "cos", "tan")
+TRIG_FUNCTION_TITLES = {"sin": "Sine", "cos": "Cosine", "tan": "Tangent"}
+
+
+def convert_angles(values, unit="degrees"):
+    """Convert angles given in degrees, radians or multiples of π.
+
+    Returns a dict of arrays with "degrees", "radians" and "pi" (the π
+    fraction label) for every input value. A single int or float gives
+    floats and a str instead, computed without importing NumPy.
+    """
+    if isinstance(values, (int, float)):
+        _check_angle_unit(unit)
+        if unit == "degrees":
+            degrees, radians = float(values), math.radians(values)
+        elif unit == "radians":
+            degrees, radians = math.degrees(values), float(values)
+        else:
+            degrees, radians = values * 180.0, values * math.pi
+        return {"degrees": degrees, "radians": radians, "pi": format_pi_multiple(radians)}
+    values = np.asarray(values, dtype=float)
+    if unit == "degrees":
+        radians = np.radians(values)
+        degrees = values
+    elif unit == "radians":
+        radians = values
+        degrees = np.degrees(values)
+    elif unit == "pi":
+        radians = values * np.pi
+        degrees = values * 180.0
+    else:
+        raise ValueError(f"Unknown angle unit: {unit}")
+    return {"degrees": degrees, "radians": radians, "pi": format_radians_array(radians)}
+
+
+def make_trig_function(func_type, A=1.0, B=1.0, C=0.0, D=0.0):
+    """Build A f(Bx - C) + D for f in sin/cos/tan.
+
+    Returns the (func, title, is_tan, params) arguments for plot_trig_function.
+    """
+    if func_type not in TRIG_BASE_FUNCTIONS:
+        raise ValueError(f"Unknown function type: {func_type}")
+    base_func = getattr(np, func_type)
+    params = (A, B, C, D)
+    if params == (1.0, 1.0, 0.0, 0.0):
+        title = f"{TRIG_FUNCTION_TITLES[func_type]} Function ({func_type} x)"
+    else:
+        title = f"{A} {func_type}({B}x - {C}) + {D}"
+
+    def transformed_func(x):
+        return A * base_func(B * x - C) + D
+
+    return transformed_func, title, func_type == "tan", params
+
+
+def draw_unit_circle(ax, divisions=UNIT_CIRCLE_DIVISIONS, max_labels=24):
+    """Draw the unit circle with key angles onto an Axes.
+
+    Points and spokes are each drawn with a single artist, so fine
+    subdivisions stay cheap; at most about max_labels angles are labelled.
+    """
+    # Draw the unit circle
+    circle = mpatches.Circle((0, 0), 1, fill=False)
+    ax.add_artist(circle)
+    
+    # Draw coordinate axes
+    ax.axhline(y=0, color='k', linestyle='-', alpha=0.3)
+    ax.axvline(x=0, color='k', linestyle='-', alpha=0.3)
+    
+    # Set equal aspect ratio
+    ax.set_aspect('equal')
+    
+    # Set limits
+    ax.set_xlim(-1.5, 1.5)
+    ax.set_ylim(-1.5, 1.5)
+    
+    # Add labels
+    ax.set_title('Unit Circle')
+    ax.set_xlabel('cos θ')
+    ax.set_ylabel('sin θ')
+    
+    # Add key points on the unit circle
+    table = unit_circle_table(divisions, include_end=False, exact=False)
+    x, y = table["cos"], table["sin"]
+    ax.scatter(x, y, s=25, c='r', zorder=3)
+    
+    spokes = np.zeros((len(x), 2, 2))
+    spokes[:, 1, 0] = x
+    spokes[:, 1, 1] = y
+    ax.add_collection(mcollections.LineCollection(spokes, colors='r', linestyles='--', alpha=0.3))
+    
+    step = max(1, math.ceil(len(x) / max_labels))
+    for i in range(0, len(x), step):
+        ax.text(x[i]*1.1, y[i]*1.1, table["degrees"][i], fontsize=9)
+    
+    ax.grid(True)
+
+
+def draw_trig_function(ax, func, title, is_tan=False, params=(1.0, 1.0, 0.0, 0.0),
+                       domain=(-2 * math.pi, 2 * math.pi), num=400):
+    """Draw a trigonometric function onto an Axes (see plot_trig_function)."""
+    if is_tan:
+        # Asymptotes come from A, B and C; the line is broken at each one
+        A, B, C, D = params
+        poles = tan_poles(A, B, C, domain)
+        x, y = adaptive_sample(func, domain, num, poles=poles, clip=10 * max(1.0, abs(A)) + abs(D))
+        ax.plot(x, y)
+        # Span the whole y-range in axes coordinates, however large A is
+        ax.vlines(poles, 0, 1, transform=ax.get_xaxis_transform(), colors='r', linestyles='--', alpha=0.5)
+        ax.set_ylim(-5 * max(1.0, abs(A)) + D, 5 * max(1.0, abs(A)) + D)
+    else:
+        # For sine and cosine, use a regular domain
+        x, y = adaptive_sample(func, domain, num)
+        ax.plot(x, y)
+        ax.set_ylim(-3, 3)
+    decorate_trig_axes(ax, title, domain)
+
+
+def decorate_trig_axes(ax, title, domain=(-2 * math.pi, 2 * math.pi)):
+    """Add the grid, axes lines, π ticks and labels shared by every trig graph."""
+    ax.set_xlim(*domain)
+    
+    # Add gridlines and labels
+    ax.grid(True)
+    ax.axhline(y=0, color='k', linestyle='-', alpha=0.3)
+    ax.axvline(x=0, color='k', linestyle='-', alpha=0.3)
+    
+    # Mark π values on x-axis
+    lo, hi = domain
+    pi_ticks = np.arange(math.ceil(lo / (np.pi/2)), math.floor(hi / (np.pi/2)) + 1) * (np.pi/2)
+    pi_labels = format_radians_array(pi_ticks)
+    ax.set_xticks(pi_ticks)
+    ax.set_xticklabels(pi_labels)
+    
+    ax.set_title(title)
+    ax.set_xlabel('x')
+    ax.set_ylabel('f(x)')
+
+
+def draw_rational_function(ax, f, title=None, domain=(-10.0, 10.0), num=800):
+    """Draw a RationalFunction with its asymptotes (dashed) and holes (open circles)."""
+    lo, hi = domain
+    poles = f.vertical_asymptotes[(f.vertical_asymptotes > lo) & (f.vertical_asymptotes < hi)]
+    # Scale the y-range to the curve away from the poles
+    probe = f(np.linspace(lo, hi, num))
+    probe = probe[np.isfinite(probe)]
+    if probe.size:
+        y_lo, y_hi = np.percentile(probe, [5, 95])
+        pad = max(1.0, 0.5 * (y_hi - y_lo))
+        y_lo, y_hi = y_lo - pad, y_hi + pad
+    else:
+        y_lo, y_hi = -10.0, 10.0
+    clip = 10 * max(abs(y_lo), abs(y_hi))
+    x, y = adaptive_sample(f, domain, num, poles=poles, clip=clip)
+    ax.plot(x, y)
+
+    ax.vlines(poles, y_lo, y_hi, colors='r', linestyles='--', alpha=0.5)
+    if f.horizontal_asymptote is not None:
+        ax.axhline(y=f.horizontal_asymptote, color='g', linestyle='--', alpha=0.5)
+    if f.slant_asymptote is not None:
+        m, b = f.slant_asymptote
+        ax.plot([lo, hi], [m * lo + b, m * hi + b], 'g--', alpha=0.5)
+    for hx, hy in f.holes:
+        ax.plot(hx, hy, 'o', markerfacecolor='white', markeredgecolor='C0', zorder=3)
+
+    ax.set_xlim(lo, hi)
+    ax.set_ylim(y_lo, y_hi)
+    ax.grid(True)
+    ax.axhline(y=0, color='k', linestyle='-', alpha=0.3)
+    ax.axvline(x=0, color='k', linestyle='-', alpha=0.3)
+    ax.set_title(title or f"f(x) = {f}")
+    ax.set_xlabel('x')
+    ax.set_ylabel('f(x)')
+
+
+def draw_conic(ax, coeffs, title=None, domain=(-10.0, 10.0), num=400, curves=None):
+    """Draw one conic [A, B, C, D, E, F] with its center marked.
+
+    ``curves`` may be passed in from a batched conic_curves call.
+    """
+    info = classify_conics(coeffs)
+    kind = info["kind"][0]
+    if curves is None:
+        curves = conic_curves(coeffs, domain, num, info["kind"])[0]
+    for curve in curves:
+        if len(curve) == 1:
+            ax.plot(curve[:, 0], curve[:, 1], 'o', color='C0')
+        else:
+            ax.plot(curve[:, 0], curve[:, 1], color='C0')
+    center = info["center"][0]
+    if kind in ("circle", "ellipse", "hyperbola"):
+        ax.plot(*center, 'k+', markersize=10)
+
+    ax.set_xlim(*domain)
+    ax.set_ylim(*domain)
+    ax.set_aspect('equal')
+    ax.grid(True)
+    ax.axhline(y=0, color='k', linestyle='-', alpha=0.3)
+    ax.axvline(x=0, color='k', linestyle='-', alpha=0.3)
+    ax.set_title(title or f"{format_conic(np.ravel(coeffs))} ({kind})")
+    ax.set_xlabel('x')
+    ax.set_ylabel('y')
+
+
+def save_figure(draw, output, figsize, dpi=100, fmt=None):
+    """Draw onto a standalone Agg figure and save it, without pyplot or a display.
+
+    ``output`` may be a path or a binary file object. The format defaults to
+    the path's extension (PNG for file objects).
+    """
+    fig = mfigure.Figure(figsize=figsize, dpi=dpi)
+    draw(fig.subplots())
+    if fmt is None and isinstance(output, (str, os.PathLike)):
+        fmt = os.path.splitext(output)[1].lstrip(".").lower() or "png"
+    fmt = fmt or "png"
+    # Fixed metadata and ids keep SVG output byte-identical between runs
+    metadata = {"Date": None} if fmt == "svg" else None
+    with mpl.rc_context({"svg.hashsalt": "precalculus-guide"}):
+        fig.savefig(output, format=fmt, metadata=metadata)
+
+
+# Bump when drawing code changes so stale cached images are not served
+PLOT_CACHE_VERSION = 2
+PLOT_FORMATS = ("png", "svg")
+
+
+class PlotCache:
+    """Content-addressed LRU cache of rendered plots, in memory and on disk.
+
+    Entries are keyed by a hash of everything that affects the image (plot
+    kind, parameters, domain, resolution, format). Both tiers are bounded
+    in bytes and evict the least recently used images first. The disk tier
+    may be shared by several processes (the server's render workers): its
+    size is measured from the directory and recency from file mtimes, so
+    the limit holds for all of them together.
+    """
+
+    def __init__(self, directory=None, memory_limit=64 * 2**20, disk_limit=512 * 2**20):
+        import collections
+        import threading
+
+        self.directory = directory
+        self.memory_limit = memory_limit
+        self.disk_limit = disk_limit
+        self.hits = 0
+        self.misses = 0
+        self._memory = collections.OrderedDict()
+        self._memory_size = 0
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(spec):
+        """Return the content address for a plot specification dict."""
+        import hashlib
+        import json
+
+        blob = json.dumps(spec, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return cached image bytes for key, or None."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return data
+            if self.directory:
+                path = os.path.join(self.directory, key)
+                try:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                    os.utime(path)
+                except OSError:
+                    pass
+                else:
+                    self._remember(key, data)
+                    self.hits += 1
+                    return data
+            self.misses += 1
+            return None
+
+    def put(self, key, data):
+        """Store image bytes under key in both tiers."""
+        with self._lock:
+            self._remember(key, data)
+            if not self.directory or len(data) > self.disk_limit:
+                return
+            path = os.path.join(self.directory, key)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            try:
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except OSError:
+                return
+            self._trim_disk()
+
+    def disk_usage(self):
+        """Bytes used by the images in the disk tier, written by any process."""
+        return sum(size for _, _, size in self._disk_entries())
+
+    def _disk_entries(self):
+        entries = []
+        try:
+            with os.scandir(self.directory) as scan:
+                for entry in scan:
+                    if entry.name.endswith(".tmp"):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue  # removed by another process meanwhile
+                    entries.append((stat.st_mtime, entry.name, stat.st_size))
+        except OSError:
+            pass
+        return entries
+
+    def _trim_disk(self):
+        entries = self._disk_entries()
+        size = sum(entry[2] for entry in entries)
+        for _, name, entry_size in sorted(entries):
+            if size <= self.disk_limit:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            size -= entry_size
+
+    def _remember(self, key, data):
+        if len(data) > self.memory_limit:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_size -= len(old)
+        self._memory[key] = data
+        self._memory_size += len(data)
+        while self._memory_size > self.memory_limit:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+
+
+_plot_cache = None
+
+
+def get_plot_cache():
+    """Return the shared PlotCache.
+
+    The disk tier lives in $PRECAL_PLOT_CACHE if set (an empty value keeps
+    the cache in memory only), else under the user's cache directory.
+    """
+    global _plot_cache
+    if _plot_cache is None:
+        directory = os.environ.get("PRECAL_PLOT_CACHE")
+        if directory is None:
+            base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+            directory = os.path.join(base, "precalculus-guide", "plots")
+        _plot_cache = PlotCache(directory or None)
+    return _plot_cache
+
+
+def _render_cached(spec, draw, figsize, cache):
+    """Return the image bytes for spec, drawing it offscreen on a cache miss."""
+    import io
+
+    if spec["fmt"] not in PLOT_FORMATS:
+        raise ValueError(f"Unsupported image format: {spec['fmt']}")
+    cache = get_plot_cache() if cache is None else cache
+    key = PlotCache.key(dict(spec, version=PLOT_CACHE_VERSION))
+    data = cache.get(key) if cache else None
+    if data is None:
+        buffer = io.BytesIO()
+        save_figure(draw, buffer, figsize, spec["dpi"], spec["fmt"])
+        data = buffer.getvalue()
+        if cache:
+            cache.put(key, data)
+    return data
+
+
+def render_trig_graph(func_type="sin", A=1.0, B=1.0, C=0.0, D=0.0,
+                      domain=(-2 * math.pi, 2 * math.pi), num=400, fmt="png", dpi=100,
+                      cache=None):
+    """Render A f(Bx - C) + D offscreen and return the PNG/SVG bytes.
+
+    Pass ``cache=False`` to bypass the shared PlotCache.
+    """
+    params = tuple(float(p) for p in (A, B, C, D))
+    domain = tuple(float(d) for d in domain)
+    spec = {"plot": "trig", "func": func_type, "params": params, "domain": domain,
+            "num": int(num), "fmt": fmt, "dpi": dpi}
+
+    def draw(ax):
+        func, title, is_tan, _ = make_trig_function(func_type, *params)
+        draw_trig_function(ax, func, title, is_tan, params, domain, int(num))
+
+    return _render_cached(spec, draw, (10, 6), cache)
+
+
+def render_unit_circle(fmt="png", dpi=100, divisions=UNIT_CIRCLE_DIVISIONS, cache=None):
+    """Render the unit circle offscreen and return the PNG/SVG bytes."""
+    if isinstance(divisions, int):
+        divisions = (divisions,)
+    divisions = tuple(sorted(set(int(n) for n in divisions)))
+    spec = {"plot": "unit_circle", "fmt": fmt, "dpi": dpi, "divisions": divisions}
+    return _render_cached(spec, lambda ax: draw_unit_circle(ax, divisions), (10, 10), cache)
+
+
+def render_rational_graph(numerator, denominator=(1.0,), domain=(-10.0, 10.0), num=800,
+                          fmt="png", dpi=100, cache=None):
+    """Render p(x)/q(x) from coefficient lists offscreen and return the PNG/SVG bytes."""
+    f = RationalFunction(numerator, denominator)
+    domain = tuple(float(d) for d in domain)
+    spec = {"plot": "rational", "numerator": f.numerator.tolist(), "denominator": f.denominator.tolist(),
+            "domain": domain, "num": int(num), "fmt": fmt, "dpi": dpi}
+    return _render_cached(spec, lambda ax: draw_rational_function(ax, f, domain=domain, num=int(num)),
+                          (10, 6), cache)
+
+
+def render_conic_graph(coeffs, domain=(-10.0, 10.0), num=400, fmt="png", dpi=100, cache=None, curves=None):
+    """Render a conic [A, B, C, D, E, F] offscreen and return the PNG/SVG bytes."""
+    coeffs = tuple(float(c) for c in coeffs)
+    domain = tuple(float(d) for d in domain)
+    spec = {"plot": "conic", "coeffs": coeffs, "domain": domain, "num": int(num), "fmt": fmt, "dpi": dpi}
+    return _render_cached(spec, lambda ax: draw_conic(ax, coeffs, domain=domain, num=int(num), curves=curves),
+                          (8, 8), cache)
+
+
+# Animations
+# ----------
+# Every frame is computed up front as one array; the animation then only
+# swaps data into persistent artists, which blitting redraws on screen and
+# the writers grab offline (GIF via Pillow, MP4 via ffmpeg when present).
+
+SWEEP_RANGES = {"A": (0.25, 3.0), "B": (0.5, 3.0), "C": (0.0, 2 * math.pi), "D": (-2.0, 2.0)}
+
+
+def sweep_frames(func_type="sin", A=1.0, B=1.0, C=0.0, D=0.0, sweep="C", values=None, frames=120,
+                 domain=(-2 * math.pi, 2 * math.pi), num=600):
+    """Precompute A f(Bx - C) + D while one parameter sweeps through values.
+
+    Returns (x, values, Y) with Y of shape (frames, num). For tangent, the
+    point where each frame crosses a pole is set to NaN so the line breaks.
+    """
+    if func_type not in TRIG_BASE_FUNCTIONS:
+        raise ValueError(f"Unknown function type: {func_type}")
+    if sweep not in SWEEP_RANGES:
+        raise ValueError(f"Can only sweep one of {', '.join(SWEEP_RANGES)}, not {sweep!r}")
+    if values is None:
+        values = np.linspace(*SWEEP_RANGES[sweep], frames)
+    values = np.asarray(values, dtype=float)
+    x = np.linspace(*domain, num)
+    params = np.tile(np.array([A, B, C, D], dtype=float)[:, None], (1, len(values)))
+    params["ABCD".index(sweep)] = values
+    A, B, C, D = params[:, :, None]
+    phase = B * x - C
+    Y = A * getattr(np, func_type)(phase) + D
+    if func_type == "tan":
+        branch = np.floor(phase / np.pi + 0.5)
+        Y[:, 1:][np.diff(branch, axis=1) != 0] = np.nan
+    return x, values, Y
+
+
+def _animation_frames(fig, update, frames):
+    """Yield each frame as an RGB array, blitting the animated artists over a cached background.
+
+    The arrays share the canvas buffer, so consume each one before the next.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    canvas = FigureCanvasAgg(fig)
+    for artist in update(0):
+        artist.set_animated(True)
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+    for i in range(frames):
+        canvas.restore_region(background)
+        for artist in update(i):
+            fig.draw_artist(artist)
+        yield np.asarray(canvas.buffer_rgba())[:, :, :3]
+
+
+def _write_gif(frames, output, fps):
+    from PIL import Image
+    images = []
+    for frame in frames:
+        image = Image.fromarray(frame)
+        # One shared palette: the frames differ only by a few artists
+        palette = images[0] if images else image.quantize(256)
+        images.append(image.quantize(palette=palette, dither=Image.Dither.NONE))
+    images[0].save(output, save_all=True, append_images=images[1:], duration=1000 / fps, loop=0,
+                   optimize=False)
+
+
+def _write_mp4(frames, output, fps, size):
+    import shutil
+    import subprocess
+    ffmpeg = shutil.which(mpl.rcParams["animation.ffmpeg_path"])
+    if ffmpeg is None:
+        raise RuntimeError("Writing MP4 needs ffmpeg on the PATH; use a .gif output instead")
+    width, height = size
+    command = [ffmpeg, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24",
+               "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+               "-vcodec", "libx264", "-pix_fmt", "yuv420p", output]
+    with subprocess.Popen(command, stdin=subprocess.PIPE) as proc:
+        for frame in frames:
+            proc.stdin.write(frame.tobytes())
+        proc.stdin.close()
+    if proc.returncode:
+        raise RuntimeError(f"ffmpeg failed with exit code {proc.returncode}")
+
+
+ANIMATION_FORMATS = ("gif", "mp4")
+
+
+def _animate(init, frames, output=None, fps=30, dpi=100, figsize=(10, 6)):
+    """Animate on screen with a blitted FuncAnimation, or write a GIF/MP4 offline.
+
+    init(ax) draws the static parts and returns update(i), which changes the
+    persistent artists for frame i and returns them.
+    """
+    if output is None:
+        fig, ax = plt.subplots(figsize=figsize)
+        # Keep a reference, or the animation is garbage collected before show
+        anim = animation.FuncAnimation(fig, init(ax), frames=frames, interval=1000 / fps, blit=True)
+        plt.show()
+        return
+    fmt = os.path.splitext(output)[1].lstrip(".").lower()
+    if fmt not in ANIMATION_FORMATS:
+        raise ValueError(f"Unsupported animation format: {fmt or output}")
+    # A standalone figure needs neither pyplot nor a display
+    fig = mfigure.Figure(figsize=figsize, dpi=dpi)
+    rendered = _animation_frames(fig, init(fig.subplots()), frames)
+    if fmt == "gif":
+        _write_gif(rendered, output, fps)
+    else:
+        _write_mp4(rendered, output, fps, (int(fig.bbox.width), int(fig.bbox.height)))
+
+
+def animate_trig_sweep(func_type="sin", A=1.0, B=1.0, C=0.0, D=0.0, sweep="C", values=None, frames=120,
+                       domain=(-2 * math.pi, 2 * math.pi), num=600, output=None, fps=30, dpi=100):
+    """Animate A f(Bx - C) + D while one of A, B, C or D sweeps through values."""
+    x, values, Y = sweep_frames(func_type, A, B, C, D, sweep, values, frames, domain, num)
+    symbols = dict(zip("ABCD", (A, B, C, D)), **{sweep: sweep})
+    title = f"{symbols['A']} {func_type}({symbols['B']}x - {symbols['C']}) + {symbols['D']}"
+
+    def init(ax):
+        decorate_trig_axes(ax, title, domain)
+        if func_type == "tan":
+            # Same window as the static plot, widened to cover the sweep
+            amplitude = max(1.0, np.abs(values).max() if sweep == "A" else abs(A))
+            low, high = (values.min(), values.max()) if sweep == "D" else (D, D)
+            ax.set_ylim(-5 * amplitude + low, 5 * amplitude + high)
+        else:
+            lo, hi = np.nanmin(Y), np.nanmax(Y)
+            pad = 0.1 * max(hi - lo, 1.0)
+            ax.set_ylim(lo - pad, hi + pad)
+        line, = ax.plot(x, Y[0])
+        label = ax.text(0.02, 0.95, "", transform=ax.transAxes, va="top")
+
+        def update(i):
+            line.set_ydata(Y[i])
+            label.set_text(f"{sweep} = {values[i]:.3f}")
+            return line, label
+
+        return update
+
+    return _animate(init, len(values), output, fps, dpi)
+
+
+def animate_unit_circle(frames=120, output=None, fps=30, dpi=100):
+    """Animate an angle rotating once around the unit circle, with its cos and sin."""
+    theta = np.linspace(0, 2 * np.pi, frames, endpoint=False)
+    x, y = np.cos(theta), np.sin(theta)
+    labels = [f"θ = {rad} ({deg:g}°)"
+              for rad, deg in zip(format_radians_array(theta), np.round(np.degrees(theta), 2))]
+
+    def init(ax):
+        draw_unit_circle(ax)
+        radius, = ax.plot([0, x[0]], [0, y[0]], 'b-', lw=2)
+        point, = ax.plot([x[0]], [y[0]], 'bo')
+        cos_line, = ax.plot([0, x[0]], [0, 0], 'g-', lw=3, label='cos θ')
+        sin_line, = ax.plot([x[0], x[0]], [0, y[0]], 'm-', lw=3, label='sin θ')
+        label = ax.text(-1.4, 1.35, "")
+        ax.legend(loc='lower right')
+
+        def update(i):
+            radius.set_data([0, x[i]], [0, y[i]])
+            point.set_data([x[i]], [y[i]])
+            cos_line.set_data([0, x[i]], [0, 0])
+            sin_line.set_data([x[i], x[i]], [0, y[i]])
+            label.set_text(labels[i])
+            return radius, point, cos_line, sin_line, label
+
+        return update
+
+    return _animate(init, frames, output, fps, dpi, figsize=(8, 8))
+
+
+def animate_secant_lines(func_type="sin", A=1.0, B=1.0, C=0.0, D=0.0, x0=1.0, frames=120,
+                         domain=(-2 * math.pi, 2 * math.pi), output=None, fps=30, dpi=100):
+    """Animate secant lines through x0 and x0 + h closing in on the tangent as h → 0."""
+    func, title, is_tan, params = make_trig_function(func_type, A, B, C, D)
+    # h shrinks geometrically, so the approach looks steady on screen
+    h = 2.0 * np.geomspace(1.0, 1e-3, frames)
+    y0, slope = derivative(func, x0)
+    secants = difference_quotients(func, x0, h)
+    x_end = np.array(domain)
+
+    def init(ax):
+        draw_trig_function(ax, func, title, is_tan, params, domain)
+        ax.plot(x_end, y0 + slope * (x_end - x0), 'g--', alpha=0.6, label=f"tangent, slope {slope:.4f}")
+        ax.plot([x0], [y0], 'ko')
+        secant, = ax.plot(x_end, y0 + secants[0] * (x_end - x0), 'r-')
+        point, = ax.plot([x0 + h[0]], [func(x0 + h[0])], 'ro')
+        label = ax.text(0.02, 0.95, "", transform=ax.transAxes, va="top")
+        ax.legend(loc='lower right')
+
+        def update(i):
+            secant.set_ydata(y0 + secants[i] * (x_end - x0))
+            point.set_data([x0 + h[i]], [func(x0 + h[i])])
+            label.set_text(f"h = {h[i]:.4f}   secant slope = {secants[i]:.4f}")
+            return secant, point, label
+
+        return update
+
+    return _animate(init, frames, output, fps, dpi)
+
+
+# Instrumentation
+# ---------------
+# Opt-in: a Profiler wraps the topic entries of a guide's menus (and its plot
+# methods) to count calls and record wall time and tracemalloc peaks. Nested
+# calls, such as a topic that plots, each get their own peak.
+
+class Profiler:
+    """Collect call counts, wall time and memory peaks for instrumented functions.
+
+    Use it as a context manager (or call close()) so that tracemalloc, which
+    slows every allocation, is stopped again once profiling is over.
+    """
+
+    PLOT_METHODS = ("plot_trig_function", "plot_unit_circle", "plot_rational_function", "plot_conic")
+
+    def __init__(self, trace_memory=True):
+        import tracemalloc
+        self._tracemalloc = tracemalloc
+        self.trace_memory = trace_memory
+        self.stats = {}
+        # One [start_bytes, child_peak_bytes] frame per instrumented call in progress
+        self._stack = []
+        # Only stop tracemalloc on close if it was not already running
+        self._started_tracing = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Stop tracemalloc if this profiler started it."""
+        if self._started_tracing:
+            self._tracemalloc.stop()
+            self._started_tracing = False
+
+    def wrap(self, name, func):
+        """Return func wrapped so each call is recorded under name."""
+        stats = self.stats.setdefault(name, {"calls": 0, "errors": 0, "seconds": 0.0,
+                                             "max_seconds": 0.0, "peak_bytes": 0})
+
+        @functools.wraps(func)
+        def instrumented(*args, **kwargs):
+            tracing = self.trace_memory and self._enter()
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                stats["errors"] += 1
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                stats["calls"] += 1
+                stats["seconds"] += elapsed
+                stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+                if tracing:
+                    stats["peak_bytes"] = max(stats["peak_bytes"], self._exit())
+
+        return instrumented
+
+    def _enter(self):
+        if not self._tracemalloc.is_tracing():
+            self._tracemalloc.start()
+            self._started_tracing = True
+        current, peak = self._tracemalloc.get_traced_memory()
+        if self._stack:
+            # reset_peak below would lose the enclosing call's peak so far
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        self._tracemalloc.reset_peak()
+        self._stack.append([current, 0])
+        return True
+
+    def _exit(self):
+        start, child_peak = self._stack.pop()
+        peak = max(self._tracemalloc.get_traced_memory()[1], child_peak)
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        return peak - start
+
+    def instrument(self, guide):
+        """Wrap every topic in guide's menus and its plot methods; returns guide."""
+        for menu in guide.menus.values():
+            for topic in menu["topics"].values():
+                if "function" in topic:
+                    func = topic["function"]
+                    topic["function"] = self.wrap(func.__name__, func)
+        for name in self.PLOT_METHODS:
+            setattr(guide, name, self.wrap(name, getattr(guide, name)))
+        return guide
+
+    def to_json(self):
+        import json
+        return json.dumps({"functions": self.stats}, indent=2, sort_keys=True)
+
+    def to_prometheus(self, prefix="precalculus"):
+        """Render the stats in the Prometheus text exposition format."""
+        metrics = (
+            ("calls_total", "counter", "calls", "Number of calls."),
+            ("errors_total", "counter", "errors", "Number of calls that raised."),
+            ("seconds_total", "counter", "seconds", "Total wall time in seconds."),
+            ("seconds_max", "gauge", "max_seconds", "Slowest call in seconds."),
+            ("peak_bytes", "gauge", "peak_bytes", "Largest tracemalloc peak of a call, in bytes."),
+        )
+        lines = []
+        for suffix, kind, key, help_text in metrics:
+            metric = f"{prefix}_function_{suffix}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, stats in sorted(self.stats.items()):
+                label = name.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+                lines.append(f'{metric}{{function="{label}"}} {stats[key]}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write the stats to path: Prometheus text for .prom/.txt, JSON otherwise."""
+        text = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+# Lesson content
+# --------------
+# The lesson text lives in precalculus-github-repo.md. A build step renders
+# each lesson to terminal text once and writes it, with a section index and
+# an inverted word index, into one read-only file that is memory-mapped on
+# load. Topics print a slice of that file; searches touch only the posting
+# lists of the query's words.
+#
+# File layout: magic, header length (uint32), JSON header (sections, terms
+# and where each term's postings start), then the postings as uint32
+# (section, count) pairs and the UTF-8 text. The header records a digest of
+# the markdown, and the store is rebuilt whenever the two disagree.
+
+CONTENT_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "precalculus-github-repo.md")
+# Bump when the rendering or file layout changes so stale stores are rebuilt
+CONTENT_STORE_VERSION = 1
+_CONTENT_MAGIC = b"PCGSTORE"
+_CONTENT_WORDS = re.compile(r"\w+")
+# Superscripts count as word characters; "sin²θ" should index as sin and θ
+_CONTENT_SEPARATORS = str.maketrans({c: " " for c in "⁰¹²³⁴⁵⁶⁷⁸⁹⁻⁺"})
+_LATEX_SYMBOLS = {r"\approx": "≈", r"\cdot": "·", r"\times": "×", r"\pi": "π", r"\theta": "θ", r"\,": " "}
+
+
+def _content_terms(text):
+    return _CONTENT_WORDS.findall(text.translate(_CONTENT_SEPARATORS).lower())
+
+
+def _slug(title):
+    return re.sub(r"[^\w]+", "-", title.lower()).strip("-")
+
+
+def _plain_math(text):
+    """Rewrite the inline LaTeX of the lessons ($\\frac{a}{b}$ ...) as plain text."""
+    if "$" not in text:
+        return text
+    def group(part):
+        return part if re.fullmatch(r"[\w.°²³]+", part) else f"({part})"
+
+    text = re.sub(r"\\text\{([^{}]*)\}", r"\1", text)
+    # "2bc\cos A" -> "2bc cos A"
+    text = re.sub(r"(?<=\w)\\(sin|cos|tan)\b", r" \1", text)
+    text = re.sub(r"\\(sin|cos|tan)\b", r"\1", text)
+    text = re.sub(r"\^(\d)", lambda m: m.group(1).translate(_SUPERSCRIPTS), text)
+    for _ in range(3):  # fractions nest at most a couple of levels
+        text = re.sub(r"\\frac\{([^{}]*)\}\{([^{}]*)\}",
+                      lambda m: (f"({m.group(1)}/{m.group(2)})" if (m.group(1) + m.group(2)).isdigit()
+                                 else f"{group(m.group(1))}/{group(m.group(2))}"), text)
+    text = re.sub(r"\\sqrt\{([^{}]*)\}", lambda m: f"√{group(m.group(1))}", text)
+    for command, symbol in _LATEX_SYMBOLS.items():
+        text = text.replace(command, symbol)
+    return text.replace("$", "").replace("\\", "")
+
+
+def _render_table(rows):
+    cells = [[cell.strip() for cell in row.strip().strip("|").split("|")] for row in rows]
+    cells = [row for row in cells if not all(set(cell) <= set("-: ") for cell in row)]
+    widths = [max(len(row[i]) for row in cells if i < len(row)) + 2 for i in range(len(cells[0]))]
+    lines = ["".join(f"{cell:<{width}}" for cell, width in zip(row, widths)).rstrip() for row in cells]
+    lines.insert(1, "-" * sum(widths))
+    return lines
+
+
+def _render_markdown(lines):
+    """Render lesson markdown as the guide prints it: "=== TITLE ===", "Heading:", aligned tables."""
+    out = []
+    table = []
+    for line in lines + [""]:
+        if line.startswith("|"):
+            table.append(line)
+            continue
+        if table:
+            out.extend(_render_table(table))
+            table = []
+        if line.startswith("# "):
+            out.append(f"=== {line[2:].strip().upper()} ===")
+        elif line.startswith("#"):
+            if out and out[-1]:
+                out.append("")
+            out.append(f"{line.lstrip('#').strip()}:")
+        else:
+            out.append(_plain_math(line.replace("**", "")).rstrip())
+    while out and not out[-1]:
+        out.pop()
+    return out
+
+
+def _parse_lessons(text):
+    """Split the guide into (key, title, lines, parent) chunks.
+
+    Each embedded lesson file ("### 04-trigonometry/01-angle-measure.md"
+    followed by a markdown block) becomes a lesson keyed by its file name
+    ("angle-measure"), with one chunk per "##" section ("angle-measure/
+    arc-length"). The guide's own "##" sections are chunks of their own.
+    """
+    chunks = []
+    lesson = None
+    pending = None
+    in_code = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if lesson is None and stripped.startswith("```"):
+            if stripped == "```markdown" and pending:
+                lesson = pending
+                chunks.append([lesson, None, [], None])
+            else:
+                in_code = not in_code
+                chunks[-1][2].append(line)
+            continue
+        if lesson is not None:
+            if stripped == "```":
+                lesson = pending = None
+            elif line.startswith("# "):
+                chunks[-1][1] = line[2:].strip()
+                chunks[-1][2].append(line)
+            elif line.startswith("## "):
+                title = line[3:].strip()
+                chunks.append([f"{lesson}/{_slug(title)}", title, [line], lesson])
+            else:
+                chunks[-1][2].append(line)
+            continue
+        if not in_code and line.startswith("### ") and stripped.endswith(".md"):
+            name = os.path.splitext(os.path.basename(stripped[4:]))[0]
+            pending = re.sub(r"^\d+-", "", name)
+        elif not in_code and line.startswith("#") and not line.startswith("###"):
+            title = line.lstrip("#").strip()
+            key = "overview" if line.startswith("# ") else _slug(title)
+            chunks.append([key, title, [line], None])
+        elif chunks:
+            chunks[-1][2].append(line)
+    return chunks
+
+
+def build_content_store(source=CONTENT_SOURCE, path=None):
+    """Compile the lesson markdown into content store bytes; also write them to path if given.
+
+    Returns the bytes, so a store can be used even where it cannot be saved.
+    """
+    import hashlib
+    import json
+    import struct
+
+    with open(source, "rb") as f:
+        raw = f.read()
+    text_parts = []
+    size = 0
+    sections = []
+    lessons = {}
+    postings = {}
+    for key, title, lines, parent in _parse_lessons(raw.decode("utf-8")):
+        rendered = "\n".join(_render_markdown(lines)).strip("\n") + "\n"
+        data = rendered.encode("utf-8")
+        if parent is not None:
+            # Lesson sections are printed with a blank line before each heading
+            data = b"\n" + data
+        section_id = len(sections)
+        sections.append([key, title, size, len(data)])
+        # A lesson's text is its intro followed by its sections, so it is one contiguous range
+        if parent is None:
+            lessons[key] = section_id
+        else:
+            sections[lessons[parent]][3] += len(data)
+        text_parts.append(data)
+        size += len(data)
+        counts = {}
+        for term in _content_terms(f"{title or ''}\n{rendered}"):
+            counts[term] = counts.get(term, 0) + 1
+        for term, count in counts.items():
+            postings.setdefault(term, []).append((section_id, count))
+
+    terms = sorted(postings)
+    starts = []
+    pairs = []
+    for term in terms:
+        starts.append(len(pairs) // 2)
+        for section_id, count in postings[term]:
+            pairs += (section_id, count)
+    header = json.dumps({
+        "version": CONTENT_STORE_VERSION,
+        "source_digest": hashlib.blake2b(raw, digest_size=16).hexdigest(),
+        "byteorder": sys.byteorder,
+        "sections": sections,
+        "terms": terms,
+        "starts": starts,
+        "postings": len(pairs),
+    }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    header += b" " * (-(len(_CONTENT_MAGIC) + 4 + len(header)) % 4)  # align the postings
+    blob = b"".join([_CONTENT_MAGIC, struct.pack("<I", len(header)), header,
+                     struct.pack(f"={len(pairs)}I", *pairs)] + text_parts)
+    if path:
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(blob)
+        os.replace(tmp, path)
+    return blob
+
+
+class ContentStore:
+    """Read-only view of a built content store (a memory map or bytes).
+
+    ``lesson(key)`` and ``section(key)`` return rendered text; ``search``
+    ranks sections by the words of a query.
+    """
+
+    def __init__(self, buffer):
+        import json
+        import struct
+
+        if bytes(buffer[:len(_CONTENT_MAGIC)]) != _CONTENT_MAGIC:
+            raise ValueError("Not a content store")
+        start = len(_CONTENT_MAGIC) + 4
+        (header_size,) = struct.unpack_from("<I", buffer, len(_CONTENT_MAGIC))
+        header = json.loads(bytes(buffer[start:start + header_size]))
+        self._buffer = buffer
+        self.version = header["version"]
+        self.source_digest = header["source_digest"]
+        self.byteorder = header["byteorder"]
+        self.keys = [key for key, _, _, _ in header["sections"]]
+        self.sections = {key: (title, offset, length) for key, title, offset, length in header["sections"]}
+        self._terms = dict(zip(header["terms"], header["starts"]))
+        self._term_ends = dict(zip(header["terms"], header["starts"][1:] + [header["postings"] // 2]))
+        postings_start = start + header_size
+        postings_end = postings_start + 4 * header["postings"]
+        self._postings = memoryview(buffer)[postings_start:postings_end].cast("I")
+        self._text = memoryview(buffer)[postings_end:]
+
+    @classmethod
+    def open(cls, path):
+        import mmap
+
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __contains__(self, key):
+        return key in self.sections
+
+    def section(self, key):
+        """Rendered text of a lesson or one of its sections, e.g. "unit-circle/reference-angles"."""
+        if key not in self.sections:
+            raise KeyError(f"No such lesson or section: {key}")
+        _, offset, length = self.sections[key]
+        return bytes(self._text[offset:offset + length]).decode("utf-8")
+
+    lesson = section
+
+    def search(self, query, limit=10):
+        """Sections containing every word of query, best first, as (key, title, score).
+
+        Scores add up each word's count in the section weighted by how rare
+        the word is across sections.
+        """
+        scores = None
+        for term in set(_content_terms(query)):
+            if term not in self._terms:
+                return []
+            start, end = self._terms[term], self._term_ends[term]
+            weight = math.log(1 + len(self.keys) / (end - start))
+            pairs = self._postings[2 * start:2 * end]
+            hits = dict(zip(pairs[::2], (count * weight for count in pairs[1::2])))
+            scores = hits if scores is None else {s: scores[s] + w for s, w in hits.items() if s in scores}
+        if not scores:
+            return []
+        ranked = sorted(scores.items(), key=lambda item: -item[1])[:limit]
+        return [(self.keys[s], self.sections[self.keys[s]][0], score) for s, score in ranked]
+
+
+_content_store = None
+
+
+def content_store_path(source=CONTENT_SOURCE):
+    """Where the store for source lives: $PRECAL_CONTENT_STORE, else next to the markdown."""
+    return os.environ.get("PRECAL_CONTENT_STORE") or os.path.join(
+        os.path.dirname(source), "precalculus-content.bin")
+
+
+def get_content_store(path=None, source=CONTENT_SOURCE):
+    """Return the shared ContentStore, building it first if it is missing or stale.
+
+    See content_store_path for where it lives. If it cannot be written
+    there, the freshly built store is kept in memory.
+    """
+    global _content_store
+    default = path is None and source == CONTENT_SOURCE
+    if default and _content_store is not None:
+        return _content_store
+    if path is None:
+        path = content_store_path(source)
+    store = None
+    try:
+        store = ContentStore.open(path)
+    except (OSError, ValueError):
+        pass
+    if os.path.exists(source) and (store is None or _content_stale(store, source)):
+        try:
+            build_content_store(source, path)
+            store = ContentStore.open(path)
+        except OSError:
+            store = ContentStore(build_content_store(source))
+    if store is None:
+        raise FileNotFoundError(f"No content store at {path} and no lesson source at {source}")
+    if default:
+        _content_store = store
+    return store
+
+
+def _content_stale(store, source):
+    import hashlib
+
+    with open(source, "rb") as f:
+        digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    return (store.version != CONTENT_STORE_VERSION or store.byteorder != sys.byteorder
+            or store.source_digest != digest)
+
 
 class PrecalculusGuide:
     def __init__(self):
@@ -28,12 +3059,12 @@ class PrecalculusGuide:
             "1": {"name": "Fundamentals", "function": self.fundamentals},
             "2": {"name": "Polynomial & Rational Functions", "function": self.polynomial_rational},
             "3": {"name": "Exponential & Logarithmic Functions", "function": self.exponential_logarithmic},
-            "4": {"name": "Trigonometry", "function": self.trigonometry_menu},
+            "4": {"name": "Trigonometry", "menu": "trig"},
             "5": {"name": "Analytic Geometry", "function": self.analytic_geometry},
             "6": {"name": "Vectors & Matrices", "function": self.vectors_matrices},
             "7": {"name": "Sequences & Series", "function": self.sequences_series},
             "8": {"name": "Introduction to Calculus", "function": self.intro_calculus},
-            "9": {"name": "Exit", "function": sys.exit}
+            "9": {"name": "Exit", "menu": None}
         }
         
         self.trig_topics = {
@@ -45,52 +3076,71 @@ class PrecalculusGuide:
             "6": {"name": "Trigonometric Identities", "function": self.trig_identities},
             "7": {"name": "Solving Trig Equations", "function": self.solving_trig_equations},
             "8": {"name": "Law of Sines & Cosines", "function": self.law_sines_cosines},
-            "9": {"name": "Return to Main Menu", "function": self.main_menu}
+            "9": {"name": "Return to Main Menu", "menu": "main"}
+        }
+        
+        # Entries with a "menu" key switch menus; the others run a topic
+        self.menus = {
+            "main": {
+                "title": "=== PRECALCULUS COMPLETE GUIDE ===",
+                "prompt": "Select a topic to explore:",
+                "topics": self.topics,
+            },
+            "trig": {
+                "title": "=== TRIGONOMETRY ===",
+                "prompt": "Select a trigonometry topic to explore:",
+                "topics": self.trig_topics,
+            },
         }
         
     def clear_screen(self):
         """Clear the terminal screen."""
-        os.system('cls' if os.name == 'nt' else 'clear')
+        # ANSI escape instead of spawning a 'clear'/'cls' subprocess
+        if sys.stdout.isatty():
+            print("\033[2J\033[H", end="", flush=True)
         
     def press_enter_to_continue(self):
         """Wait for user to press Enter."""
         input("\nPress Enter to continue...")
         
+    def run(self, menu="main"):
+        """Run the menu loop, starting at the given menu, until the user exits.
+
+        Topics return here when they finish and navigation entries (those with
+        a "menu" key) only switch the current menu, so the call stack stays the
+        same depth however long a session runs.
+        """
+        try:
+            while menu is not None:
+                current = self.menus[menu]
+                self.clear_screen()
+                print(current["title"])
+                print(f"\n{current['prompt']}")
+                
+                for key, topic in current["topics"].items():
+                    print(f"{key}. {topic['name']}")
+                    
+                choice = input(f"\nEnter your choice (1-{len(current['topics'])}): ")
+                topic = current["topics"].get(choice)
+                
+                if topic is None:
+                    print("Invalid choice. Please try again.")
+                    self.press_enter_to_continue()
+                elif "menu" in topic:
+                    menu = topic["menu"]
+                else:
+                    topic["function"]()
+        except EOFError:
+            # Input closed (e.g. a kiosk shutting down): leave quietly
+            print()
+            
     def main_menu(self):
         """Display the main menu."""
-        self.clear_screen()
-        print("=== PRECALCULUS COMPLETE GUIDE ===")
-        print("\nSelect a topic to explore:")
-        
-        for key, topic in self.topics.items():
-            print(f"{key}. {topic['name']}")
-            
-        choice = input("\nEnter your choice (1-9): ")
-        
-        if choice in self.topics:
-            self.topics[choice]["function"]()
-        else:
-            print("Invalid choice. Please try again.")
-            self.press_enter_to_continue()
-            self.main_menu()
+        self.run("main")
             
     def trigonometry_menu(self):
         """Display the trigonometry submenu."""
-        self.clear_screen()
-        print("=== TRIGONOMETRY ===")
-        print("\nSelect a trigonometry topic to explore:")
-        
-        for key, topic in self.trig_topics.items():
-            print(f"{key}. {topic['name']}")
-            
-        choice = input("\nEnter your choice (1-9): ")
-        
-        if choice in self.trig_topics:
-            self.trig_topics[choice]["function"]()
-        else:
-            print("Invalid choice. Please try again.")
-            self.press_enter_to_continue()
-            self.trigonometry_menu()
+        self.run("trig")
     
     # Basic topic placeholders
     def fundamentals(self):
@@ -104,19 +3154,61 @@ class PrecalculusGuide:
         print("- Function transformations")
         # Additional content would go here
         self.press_enter_to_continue()
-        self.main_menu()
         
     def polynomial_rational(self):
         self.clear_screen()
         print("=== POLYNOMIAL & RATIONAL FUNCTIONS ===")
-        print("This section covers:")
-        print("- Polynomials")
-        print("- Rational functions")
-        print("- Partial fractions")
-        print("- Asymptotes")
-        # Additional content would go here
+        
+        print("\nPolynomials:")
+        print("- p(x) = aₙxⁿ + ... + a₁x + a₀ with aₙ ≠ 0 has degree n")
+        print("- End behavior follows the leading term aₙxⁿ")
+        print("- A degree-n polynomial has exactly n complex zeros, counted with multiplicity")
+        print("- At a zero of odd multiplicity the graph crosses the x-axis; at even multiplicity it touches")
+        print("- Rational Root Theorem: any rational zero p/q has p dividing a₀ and q dividing aₙ")
+        
+        print("\nRational Functions f(x) = p(x)/q(x):")
+        print("- The domain excludes the zeros of q")
+        print("- Vertical asymptote at x = c when q(c) = 0 and the factor does not cancel")
+        print("- Hole at x = c when the factor (x - c) cancels from p and q")
+        
+        print("\nHorizontal and Slant Asymptotes (deg p = m, deg q = n):")
+        print("- m < n: y = 0")
+        print("- m = n: y = (leading coefficient of p)/(leading coefficient of q)")
+        print("- m = n + 1: slant asymptote y = quotient of p ÷ q")
+        
+        print("\nPartial Fractions:")
+        print("- Split p/q into simpler fractions, one per factor of q")
+        print("- Example: (3x + 5)/(x² + x - 2) = 8/(3(x - 1)) + 1/(3(x + 2))")
+        
+        # Interactive rational function analyzer
+        print("\n=== Rational Function Analyzer ===")
+        try:
+            text = input("Enter f(x) (e.g., '(x^2 - 1)/(x^2 - 4)'): ")
+            f = parse_rational(text)
+            print(f"\nf(x) = {f}")
+            
+            def listing(values):
+                return ", ".join(f"{v:.4g}" for v in values) or "none"
+            
+            print(f"Zeros: x = {listing(f.zeros)}")
+            print(f"Vertical asymptotes: x = {listing(f.vertical_asymptotes)}")
+            print(f"Holes: {', '.join(f'({x:.4g}, {y:.4g})' for x, y in f.holes) or 'none'}")
+            if f.horizontal_asymptote is not None:
+                print(f"Horizontal asymptote: y = {f.horizontal_asymptote:.4g}")
+            elif f.slant_asymptote is not None:
+                print(f"Slant asymptote: y = {format_polynomial(f.slant_asymptote)}")
+            if f.y_intercept is not None:
+                print(f"y-intercept: {f.y_intercept:.4g}")
+            if len(f.denominator) > 1:
+                print(f"Partial fractions: {partial_fractions(text)}")
+            
+            print("\nWould you like to see the graph? (y/n)")
+            if input().lower() == 'y':
+                self.plot_rational_function(f)
+        except Exception as e:
+            print(f"Could not analyze function: {e}")
+            
         self.press_enter_to_continue()
-        self.main_menu()
         
     def exponential_logarithmic(self):
         self.clear_screen()
@@ -128,92 +3220,294 @@ class PrecalculusGuide:
         print("- Applications")
         # Additional content would go here
         self.press_enter_to_continue()
-        self.main_menu()
         
     def analytic_geometry(self):
         self.clear_screen()
         print("=== ANALYTIC GEOMETRY ===")
-        print("This section covers:")
-        print("- Conics introduction")
-        print("- Circles")
-        print("- Ellipses")
-        print("- Hyperbolas")
-        print("- Parabolas")
-        # Additional content would go here
+        
+        print("\nConic Sections:")
+        print("- Curves cut from a double cone by a plane: circles, ellipses, parabolas, hyperbolas")
+        print("- General form: Ax² + Bxy + Cy² + Dx + Ey + F = 0")
+        print("- Degenerate conics (a point, one line, two lines) come from planes through the vertex")
+        
+        print("\nCircles:")
+        print("- (x - h)² + (y - k)² = r², center (h, k) and radius r")
+        
+        print("\nEllipses:")
+        print("- (x - h)²/a² + (y - k)²/b² = 1 with a > b: major axis horizontal")
+        print("- Foci at distance c from the center, c² = a² - b²; eccentricity e = c/a < 1")
+        
+        print("\nParabolas:")
+        print("- (x - h)² = 4p(y - k): vertex (h, k), focus p units from the vertex")
+        print("- Every point is as far from the focus as from the directrix; e = 1")
+        
+        print("\nHyperbolas:")
+        print("- (x - h)²/a² - (y - k)²/b² = 1: opens left and right")
+        print("- c² = a² + b²; asymptotes y - k = ±(b/a)(x - h); e = c/a > 1")
+        
+        print("\nClassifying with the Discriminant B² - 4AC:")
+        print("- Negative: ellipse (circle if A = C and B = 0)")
+        print("- Zero: parabola")
+        print("- Positive: hyperbola")
+        print("- Rotating the axes by θ with cot 2θ = (A - C)/B removes the xy term")
+        
+        # Interactive conic classifier
+        print("\n=== Conic Classifier ===")
+        try:
+            equation = input("Enter an equation in x and y (e.g., 'x^2/9 + y^2/4 = 1'): ")
+            coeffs = parse_conic(equation)
+            info = classify_conics(coeffs)
+            kind = info["kind"][0]
+            print(f"\n{format_conic(coeffs)}")
+            print(f"Discriminant B² - 4AC = {info['discriminant'][0]:.6g}")
+            print(f"Type: {kind}")
+            if kind in ("circle", "ellipse", "hyperbola"):
+                h, k = info["center"][0]
+                first, second = info["semi_axes"][0]
+                print(f"Center: ({h:.4g}, {k:.4g})")
+                if kind == "circle":
+                    print(f"Radius: {first:.4g}")
+                elif kind == "ellipse":
+                    print(f"Semi-major axis a = {first:.4g}, semi-minor axis b = {second:.4g}")
+                else:
+                    print(f"Transverse semi-axis a = {first:.4g}, conjugate semi-axis b = {second:.4g}")
+            if kind in ("ellipse", "parabola", "hyperbola", "circle"):
+                print(f"Eccentricity: {info['eccentricity'][0]:.4g}")
+            if info["angle"][0]:
+                print(f"Rotation of axes: θ = {math.degrees(info['angle'][0]):.4g}°")
+            
+            print("\nWould you like to see the graph? (y/n)")
+            if input().lower() == 'y':
+                self.plot_conic(coeffs)
+        except Exception as e:
+            print(f"Could not classify equation: {e}")
+            
         self.press_enter_to_continue()
-        self.main_menu()
         
     def vectors_matrices(self):
         self.clear_screen()
         print("=== VECTORS & MATRICES ===")
-        print("This section covers:")
-        print("- Vectors")
-        print("- Dot and cross products")
-        print("- Matrices")
-        print("- Matrix operations")
-        print("- Determinants")
-        print("- Systems of equations")
-        # Additional content would go here
+        
+        print("\nVectors:")
+        print("- A vector v = ⟨v₁, v₂, v₃⟩ has magnitude |v| = √(v₁² + v₂² + v₃²)")
+        print("- The unit vector in the direction of v is v/|v|")
+        
+        print("\nDot and Cross Products:")
+        print("- u · v = u₁v₁ + u₂v₂ + u₃v₃ = |u||v| cos θ")
+        print("- u and v are orthogonal when u · v = 0")
+        print("- u × v = ⟨u₂v₃ - u₃v₂, u₃v₁ - u₁v₃, u₁v₂ - u₂v₁⟩ is perpendicular to both")
+        print("- |u × v| = |u||v| sin θ is the area of the parallelogram they span")
+        
+        print("\nMatrices and Determinants:")
+        print("- (AB)ᵢⱼ is row i of A dotted with column j of B")
+        print("- det [[a, b], [c, d]] = ad - bc")
+        print("- A is invertible exactly when det A ≠ 0, and then A A⁻¹ = I")
+        
+        print("\nSystems of Equations:")
+        print("- A system can be written A x = b")
+        print("- If det A ≠ 0 the unique solution is x = A⁻¹b")
+        print("- Gaussian elimination (LU factorization) solves it without forming A⁻¹")
+        
+        # Interactive vector and matrix calculator
+        print("\n=== Vector & Matrix Calculator ===")
+        try:
+            print("1. Dot Product, Cross Product and Angle")
+            print("2. Determinant and Inverse")
+            print("3. Solve a System A x = b")
+            choice = input("\nEnter your choice (1-3): ")
+            
+            if choice == "1":
+                u = [float(v) for v in input("Vector u (e.g., 1 2 3): ").replace(",", " ").split()]
+                v = [float(v) for v in input("Vector v: ").replace(",", " ").split()]
+                if len(u) != len(v):
+                    raise ValueError("u and v must have the same number of components")
+                print(f"\nu · v = {dot(u, v):.4f}")
+                if len(u) in (2, 3):
+                    print(f"u × v = {np.round(cross(u, v), 4)}")
+                print(f"Angle between u and v: {vector_angle(u, v):.4f}°")
+            elif choice in ("2", "3"):
+                A = self.read_matrix()
+                if choice == "2":
+                    print(f"\ndet A = {determinants(A):.4f}")
+                    if singular_matrices(A):
+                        print("A is singular, so it has no inverse.")
+                    else:
+                        print("A⁻¹ =")
+                        print(np.round(inverses(A), 4))
+                else:
+                    b = [float(v) for v in input("Vector b: ").replace(",", " ").split()]
+                    if len(b) != len(A):
+                        raise ValueError(f"b must have {len(A)} entries")
+                    x = solve_systems(A, b)
+                    if np.isnan(x).any():
+                        print("\nA is singular: the system has no unique solution.")
+                    else:
+                        print(f"\nx = {np.round(x, 4)}")
+            else:
+                print("Invalid choice.")
+        except ValueError as e:
+            print(f"Invalid input: {e}")
+            
         self.press_enter_to_continue()
-        self.main_menu()
+        
+    def read_matrix(self):
+        """Read a square matrix row by row; the first row sets its size."""
+        first = [float(v) for v in input("Row 1 of A (e.g., 2 1 -1): ").replace(",", " ").split()]
+        rows = [first]
+        for i in range(2, len(first) + 1):
+            row = [float(v) for v in input(f"Row {i} of A: ").replace(",", " ").split()]
+            if len(row) != len(first):
+                raise ValueError(f"Each row needs {len(first)} entries")
+            rows.append(row)
+        return np.array(rows)
         
     def sequences_series(self):
         self.clear_screen()
         print("=== SEQUENCES & SERIES ===")
-        print("This section covers:")
-        print("- Sequences")
-        print("- Series")
-        print("- Arithmetic sequences")
-        print("- Geometric sequences")
-        print("- Binomial theorem")
-        # Additional content would go here
+        
+        print("\nSequences:")
+        print("- A sequence is an ordered list a₁, a₂, a₃, ...")
+        print("- Explicit formula: aₙ is given as a function of n")
+        print("- Recursive formula: aₙ is given in terms of earlier terms")
+        
+        print("\nSeries:")
+        print("- A series is the sum of the terms of a sequence")
+        print("- The partial sum Sₙ = a₁ + a₂ + ... + aₙ")
+        print("- An infinite series converges if its partial sums approach a limit")
+        
+        print("\nArithmetic Sequences (common difference d):")
+        print("- aₙ = a₁ + (n - 1)d")
+        print("- Sₙ = n(a₁ + aₙ)/2")
+        
+        print("\nGeometric Sequences (common ratio r):")
+        print("- aₙ = a₁rⁿ⁻¹")
+        print("- Sₙ = a₁(1 - rⁿ)/(1 - r) for r ≠ 1")
+        print("- S = a₁/(1 - r) when |r| < 1")
+        
+        print("\nBinomial Theorem:")
+        print("- (a + b)ⁿ = Σ C(n, k) aⁿ⁻ᵏ bᵏ for k = 0 to n")
+        print("- C(n, k) = n!/(k!(n - k)!) is row n, entry k of Pascal's triangle")
+        
+        # Interactive sequence and binomial calculator
+        print("\n=== Sequence & Series Calculator ===")
+        try:
+            print("1. Arithmetic Sequence")
+            print("2. Geometric Sequence")
+            print("3. Binomial Expansion")
+            print("4. Pascal's Triangle")
+            choice = input("\nEnter your choice (1-4): ")
+            
+            if choice in ("1", "2"):
+                kind = SEQUENCE_KINDS[int(choice) - 1]
+                first = Fraction(input("First term a₁: "))
+                step = Fraction(input("Common difference d: " if kind == "arithmetic" else "Common ratio r: "))
+                n = int(input("Number of terms n: "))
+                if n < 1:
+                    raise ValueError("n must be at least 1")
+                term = functools.partial(nth_term, kind, first, step)
+                shown = [str(value) for _, value, _ in iter_series(term, stop=min(n, 10))]
+                print(f"\nTerms: {', '.join(shown)}{', ...' if n > 10 else ''}")
+                print(f"a{n} = {nth_term(kind, first, step, n)}")
+                print(f"S{n} = {partial_sum(kind, first, step, n)}")
+                if kind == "geometric":
+                    total = infinite_sum(kind, first, step)
+                    print(f"Infinite sum: {'diverges' if total is None else total}")
+            elif choice == "3":
+                n = int(input("Power n: "))
+                a = Fraction(input("Coefficient a in (ax + by): "))
+                b = Fraction(input("Coefficient b in (ax + by): "))
+                print(f"\n({format_binomial_expansion(1, a, b)}){str(n).translate(_SUPERSCRIPTS)} = "
+                      f"{format_binomial_expansion(n, a, b)}")
+            elif choice == "4":
+                rows = int(input("Number of rows (up to 16): "))
+                rows = max(1, min(rows, 16))
+                width = len("   ".join(str(c) for c in pascal_row(rows - 1)))
+                print()
+                for n in range(rows):
+                    print("   ".join(str(c) for c in pascal_row(n)).center(width))
+            else:
+                print("Invalid choice.")
+        except (ValueError, ZeroDivisionError) as e:
+            print(f"Invalid input: {e}")
+            
         self.press_enter_to_continue()
-        self.main_menu()
         
     def intro_calculus(self):
         self.clear_screen()
         print("=== INTRODUCTION TO CALCULUS ===")
-        print("This section covers:")
-        print("- Limits")
-        print("- Continuity")
-        print("- Derivative preview")
-        print("- Applications")
-        # Additional content would go here
+        
+        print("\nLimits:")
+        print("- lim(x→c) f(x) = L means f(x) gets arbitrarily close to L as x approaches c")
+        print("- The value f(c) itself does not matter, and need not exist")
+        print("- One-sided limits: x→c⁻ from the left, x→c⁺ from the right")
+        print("- The limit exists only when both one-sided limits exist and are equal")
+        print("- Key limits: lim(x→0) sin x / x = 1 and lim(x→0) (1 - cos x)/x = 0")
+        
+        print("\nContinuity:")
+        print("- f is continuous at c when f(c) is defined and lim(x→c) f(x) = f(c)")
+        print("- Removable discontinuity: the limit exists but f(c) is missing or different (a hole)")
+        print("- Jump discontinuity: the one-sided limits differ")
+        print("- Infinite discontinuity: f grows without bound (a vertical asymptote)")
+        
+        print("\nDerivative Preview:")
+        print("- Secant slope: (f(x + h) - f(x))/h, the average rate of change")
+        print("- f'(x) = lim(h→0) (f(x + h) - f(x))/h, the slope of the tangent line")
+        print("- Tangent line at x = a: y = f(a) + f'(a)(x - a)")
+        print("- d/dx sin x = cos x, d/dx cos x = -sin x, d/dx tan x = sec² x")
+        
+        print("\nApplications:")
+        print("- Velocity is the derivative of position; acceleration the derivative of velocity")
+        print("- f is increasing where f' > 0 and decreasing where f' < 0")
+        
+        # Interactive limit and derivative calculator
+        print("\n=== Limit & Derivative Calculator ===")
+        try:
+            print("1. Limit and Continuity at a Point")
+            print("2. Derivative and Tangent Line")
+            print("3. Animate Secant Lines Approaching a Tangent")
+            choice = input("\nEnter your choice (1-3): ")
+            
+            if choice in ("1", "2"):
+                text = input("Enter f(x) (e.g., 'sin(x)/x'): ")
+                func = compile_function(text)
+                c = parse_angle(input("Point x = c (e.g., '0' or 'pi/2'): "), "radians")
+                if choice == "1":
+                    checked = continuity(func, c)
+                    
+                    def shown(value, missing):
+                        if math.isnan(value):
+                            return missing
+                        return ("∞" if value > 0 else "-∞") if math.isinf(value) else f"{value:.6g}"
+                    
+                    print(f"\nlim(x→c⁻) f(x) = {shown(checked['left'][0], 'does not exist')}")
+                    print(f"lim(x→c⁺) f(x) = {shown(checked['right'][0], 'does not exist')}")
+                    print(f"lim(x→c) f(x) = {shown(checked['limit'][0], 'does not exist')}")
+                    print(f"f(c) = {shown(checked['value'][0], 'undefined')}")
+                    print(f"Continuity at c: {checked['kind'][0]}")
+                else:
+                    # Round away floating-point dust such as a slope of 2e-16
+                    slope, intercept = np.round(tangent_lines(func, c), 10)
+                    print(f"\nf(c) = {slope * c + intercept:.6g}")
+                    print(f"f'(c) = {slope:.6g}")
+                    print(f"Tangent line: y = {format_polynomial([slope, intercept])}")
+            elif choice == "3":
+                func_type = input("Function type (sin, cos, tan): ").lower()
+                A = float(input("A (amplitude): ") or 1)
+                B = float(input("B (affects period): ") or 1)
+                x0 = parse_angle(input("Tangent point x (e.g., 'pi/4'): "), "radians")
+                output = input("Save to file (.gif or .mp4, blank to show): ").strip() or None
+                animate_secant_lines(func_type, A, B, x0=x0, output=output)
+            else:
+                print("Invalid choice.")
+        except Exception as e:
+            print(f"Could not evaluate: {e}")
+            
         self.press_enter_to_continue()
-        self.main_menu()
     
     # Trigonometry detailed implementations
     def angle_measure(self):
         self.clear_screen()
-        print("=== ANGLE MEASURE ===")
-        print("\nDegrees vs. Radians:")
-        print("- Degrees: A full circle is 360°")
-        print("- Radians: A full circle is 2π radians")
-        print("- Conversion: π radians = 180°")
-        print("- Formula: radians = (degrees × π) / 180")
-        
-        print("\nImportant Angle Measurements:")
-        angles = [
-            ("0°", "0", "0"),
-            ("30°", "π/6", "π/6"),
-            ("45°", "π/4", "π/4"),
-            ("60°", "π/3", "π/3"),
-            ("90°", "π/2", "π/2"),
-            ("180°", "π", "π"),
-            ("270°", "3π/2", "3π/2"),
-            ("360°", "2π", "2π")
-        ]
-        
-        print(f"{'Degrees':<10}{'Radians':<12}{'Simplified':<15}")
-        print("-" * 37)
-        for deg, rad, simp in angles:
-            print(f"{deg:<10}{rad:<12}{simp:<15}")
-            
-        print("\nArc Length:")
-        print("- s = rθ (where s = arc length, r = radius, θ = angle in radians)")
-        
-        print("\nSector Area:")
-        print("- A = (1/2)r²θ (where A = sector area, r = radius, θ = angle in radians)")
+        self.show_lesson("angle-measure")
         
         # Interactive converter
         print("\n=== Angle Converter ===")
@@ -221,79 +3515,33 @@ class PrecalculusGuide:
             choice = input("Convert (1) Degrees to Radians or (2) Radians to Degrees? ")
             if choice == "1":
                 degrees = float(input("Enter angle in degrees: "))
-                radians = degrees * math.pi / 180
-                print(f"{degrees}° = {radians:.6f} radians = {self.format_radians(radians)}")
+                result = convert_angles(degrees, "degrees")
+                print(f"{degrees}° = {result['radians']:.6f} radians = {result['pi']}")
             elif choice == "2":
                 radians = float(input("Enter angle in radians (as a multiple of π, e.g., 0.5 for π/2): "))
-                pi_notation = self.format_radians(radians * math.pi)
-                degrees = radians * 180
-                print(f"{radians} = {pi_notation} = {degrees:.2f}°")
+                result = convert_angles(radians, "pi")
+                print(f"{radians} = {result['pi']} = {result['degrees']:.2f}°")
             else:
                 print("Invalid choice.")
         except ValueError:
             print("Invalid input. Please enter a number.")
         
         self.press_enter_to_continue()
-        self.trigonometry_menu()
         
-    def format_radians(self, radians):
+    def show_lesson(self, key):
+        """Print a lesson from the content store."""
+        try:
+            print(get_content_store().lesson(key))
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Lesson text is unavailable: {e}")
+    
+    def format_radians(self, radians, max_denominator=PI_MAX_DENOMINATOR):
         """Format radians in terms of π."""
-        if radians == 0:
-            return "0"
-        elif radians == math.pi:
-            return "π"
-        elif radians == -math.pi:
-            return "-π"
-        else:
-            frac = radians / math.pi
-            if frac == int(frac):
-                return f"{int(frac)}π"
-            else:
-                # Find a simple fraction approximation
-                for denom in range(1, 13):
-                    for num in range(-12, 13):
-                        if abs(frac - num/denom) < 1e-10:
-                            if denom == 1:
-                                return f"{num}π"
-                            else:
-                                return f"{num}π/{denom}"
-                return f"{frac:.4f}π"
+        return format_pi_multiple(float(radians), max_denominator)
                 
     def unit_circle(self):
         self.clear_screen()
-        print("=== THE UNIT CIRCLE ===")
-        print("\nBasic Concept:")
-        print("- A unit circle has radius 1 and is centered at the origin (0, 0)")
-        print("- Any point (x, y) on the unit circle satisfies x² + y² = 1")
-        print("- For an angle θ in standard position:")
-        print("  - x-coordinate = cos θ")
-        print("  - y-coordinate = sin θ")
-        
-        print("\nUnit Circle Coordinates:")
-        coordinates = [
-            ("0°", "0", "(1, 0)"),
-            ("30°", "π/6", "(√3/2, 1/2)"),
-            ("45°", "π/4", "(√2/2, √2/2)"),
-            ("60°", "π/3", "(1/2, √3/2)"),
-            ("90°", "π/2", "(0, 1)"),
-            ("120°", "2π/3", "(-1/2, √3/2)"),
-            ("135°", "3π/4", "(-√2/2, √2/2)"),
-            ("150°", "5π/6", "(-√3/2, 1/2)"),
-            ("180°", "π", "(-1, 0)"),
-            ("210°", "7π/6", "(-√3/2, -1/2)"),
-            ("225°", "5π/4", "(-√2/2, -√2/2)"),
-            ("240°", "4π/3", "(-1/2, -√3/2)"),
-            ("270°", "3π/2", "(0, -1)"),
-            ("300°", "5π/3", "(1/2, -√3/2)"),
-            ("315°", "7π/4", "(√2/2, -√2/2)"),
-            ("330°", "11π/6", "(√3/2, -1/2)"),
-            ("360°", "2π", "(1, 0)")
-        ]
-        
-        print(f"{'Degrees':<10}{'Radians':<10}{'Coordinates (cos θ, sin θ)':<30}")
-        print("-" * 50)
-        for deg, rad, coord in coordinates:
-            print(f"{deg:<10}{rad:<10}{coord:<30}")
+        self.show_lesson("unit-circle")
         
         # Visual unit circle
         try:
@@ -305,192 +3553,51 @@ class PrecalculusGuide:
             print(f"Unable to display plot: {e}")
         
         self.press_enter_to_continue()
-        self.trigonometry_menu()
         
     def plot_unit_circle(self):
         """Plot the unit circle with key angles."""
         fig, ax = plt.subplots(figsize=(10, 10))
-        
-        # Draw the unit circle
-        circle = plt.Circle((0, 0), 1, fill=False)
-        ax.add_artist(circle)
-        
-        # Draw coordinate axes
-        ax.axhline(y=0, color='k', linestyle='-', alpha=0.3)
-        ax.axvline(x=0, color='k', linestyle='-', alpha=0.3)
-        
-        # Set equal aspect ratio
-        ax.set_aspect('equal')
-        
-        # Set limits
-        ax.set_xlim(-1.5, 1.5)
-        ax.set_ylim(-1.5, 1.5)
-        
-        # Add labels
-        ax.set_title('Unit Circle')
-        ax.set_xlabel('cos θ')
-        ax.set_ylabel('sin θ')
-        
-        # Add key points on the unit circle
-        angles = [0, math.pi/6, math.pi/4, math.pi/3, math.pi/2, 2*math.pi/3, 3*math.pi/4, 
-                  5*math.pi/6, math.pi, 7*math.pi/6, 5*math.pi/4, 4*math.pi/3, 
-                  3*math.pi/2, 5*math.pi/3, 7*math.pi/4, 11*math.pi/6]
-        
-        labels = ["0°", "30°", "45°", "60°", "90°", "120°", "135°", "150°", 
-                  "180°", "210°", "225°", "240°", "270°", "300°", "315°", "330°"]
-        
-        for angle, label in zip(angles, labels):
-            x = math.cos(angle)
-            y = math.sin(angle)
-            ax.plot(x, y, 'ro', markersize=5)
-            ax.text(x*1.1, y*1.1, label, fontsize=9)
-            ax.plot([0, x], [0, y], 'r--', alpha=0.3)
-        
-        plt.grid(True)
+        draw_unit_circle(ax)
         plt.show()
     
     def trig_functions(self):
         self.clear_screen()
-        print("=== TRIGONOMETRIC FUNCTIONS ===")
-        print("\nThe Six Trigonometric Functions:")
-        print("For an angle θ in standard position with point (x, y) on the terminal ray at distance r from origin:")
-        
-        functions = [
-            ("Sine", "sin θ = y/r", "sin θ = y"),
-            ("Cosine", "cos θ = x/r", "cos θ = x"),
-            ("Tangent", "tan θ = y/x", "tan θ = y/x"),
-            ("Cosecant", "csc θ = r/y", "csc θ = 1/y"),
-            ("Secant", "sec θ = r/x", "sec θ = 1/x"),
-            ("Cotangent", "cot θ = x/y", "cot θ = x/y")
-        ]
-        
-        print(f"\n{'Function':<12}{'Definition':<18}{'Unit Circle (r=1)':<20}")
-        print("-" * 50)
-        for func, defn, unit in functions:
-            print(f"{func:<12}{defn:<18}{unit:<20}")
-            
-        print("\nRight Triangle Definitions:")
-        print("For a right triangle with angle θ:")
-        
-        rt_functions = [
-            ("sin θ", "Opposite side / Hypotenuse"),
-            ("cos θ", "Adjacent side / Hypotenuse"),
-            ("tan θ", "Opposite side / Adjacent side"),
-            ("csc θ", "Hypotenuse / Opposite side"),
-            ("sec θ", "Hypotenuse / Adjacent side"),
-            ("cot θ", "Adjacent side / Opposite side")
-        ]
-        
-        print(f"\n{'Function':<8}{'Definition':<35}")
-        print("-" * 43)
-        for func, defn in rt_functions:
-            print(f"{func:<8}{defn:<35}")
-            
-        print("\nDomains and Ranges:")
-        domains_ranges = [
-            ("sin θ", "All real numbers", "[-1, 1]"),
-            ("cos θ", "All real numbers", "[-1, 1]"),
-            ("tan θ", "All real numbers except θ = π/2 + nπ", "All real numbers"),
-            ("csc θ", "All real numbers except θ = nπ", "(-∞, -1] ∪ [1, ∞)"),
-            ("sec θ", "All real numbers except θ = π/2 + nπ", "(-∞, -1] ∪ [1, ∞)"),
-            ("cot θ", "All real numbers except θ = nπ", "All real numbers")
-        ]
-        
-        print(f"\n{'Function':<8}{'Domain':<40}{'Range':<25}")
-        print("-" * 73)
-        for func, domain, range_ in domains_ranges:
-            print(f"{func:<8}{domain:<40}{range_:<25}")
-            
-        print("\nKey Identities:")
-        print("- Reciprocal Identities: csc θ = 1/sin θ, sec θ = 1/cos θ, cot θ = 1/tan θ")
-        print("- Quotient Identities: tan θ = sin θ/cos θ, cot θ = cos θ/sin θ")
-        print("- Pythagorean Identities: sin²θ + cos²θ = 1, 1 + tan²θ = sec²θ, 1 + cot²θ = csc²θ")
+        self.show_lesson("trigonometric-functions")
         
         # Interactive trig calculator
         print("\n=== Trigonometric Function Calculator ===")
         try:
             # Get input angle
             angle_str = input("Enter an angle in degrees or radians (e.g., '45' or 'pi/4'): ")
-            is_degrees = True
-            
-            # Check if input is in radians using π
-            if 'pi' in angle_str.lower() or 'π' in angle_str:
-                is_degrees = False
-                angle_str = angle_str.lower().replace('π', 'pi')
-                angle = float(eval(angle_str, {"pi": math.pi}))
-            else:
-                angle = float(angle_str)
-                if not is_degrees:
-                    angle_rad = angle
-                else:
-                    angle_rad = math.radians(angle)
+            angle = compile_angle(angle_str)
+            angle_rad = angle()
+            is_degrees = angle.unit == "degrees"
             
             # Calculate trig values
-            sin_val = math.sin(angle_rad)
-            cos_val = math.cos(angle_rad)
-            
+            values = evaluate_trig(angle_rad)
+
             # Print results
             if is_degrees:
-                print(f"\nValues for {angle}° ({angle_rad:.4f} radians):")
+                print(f"\nValues for {math.degrees(angle_rad):g}° ({angle_rad:.4f} radians):")
             else:
                 print(f"\nValues for {angle_str} radians ({math.degrees(angle_rad):.2f}°):")
-                
-            print(f"sin = {sin_val:.6f}")
-            print(f"cos = {cos_val:.6f}")
-            
-            # Handle special cases for tan, csc, sec, cot
-            if abs(cos_val) < 1e-10:
-                print("tan = undefined (division by zero)")
-                print("sec = undefined (division by zero)")
-            else:
-                print(f"tan = {math.tan(angle_rad):.6f}")
-                print(f"sec = {1/cos_val:.6f}")
-                
-            if abs(sin_val) < 1e-10:
-                print("csc = undefined (division by zero)")
-                print("cot = undefined (division by zero)")
-            else:
-                print(f"csc = {1/sin_val:.6f}")
-                if abs(cos_val) < 1e-10:
-                    print("cot = 0")
+
+            # Undefined values (division by zero) come back as NaN
+            for name in TRIG_FUNCTION_NAMES:
+                value = float(values[name])
+                if math.isnan(value):
+                    print(f"{name} = undefined (division by zero)")
                 else:
-                    print(f"cot = {cos_val/sin_val:.6f}")
-                    
+                    print(f"{name} = {value:.6f}")
+
         except Exception as e:
             print(f"Error in calculation: {e}")
             
         self.press_enter_to_continue()
-        self.trigonometry_menu()
     
     def trig_graphs(self):
         self.clear_screen()
-        print("=== GRAPHS OF TRIGONOMETRIC FUNCTIONS ===")
-        
-        print("\nSine Function:")
-        print("- f(x) = sin x")
-        print("- Domain: All real numbers")
-        print("- Range: [-1, 1]")
-        print("- Period: 2π")
-        
-        print("\nCosine Function:")
-        print("- f(x) = cos x")
-        print("- Domain: All real numbers")
-        print("- Range: [-1, 1]")
-        print("- Period: 2π")
-        
-        print("\nTangent Function:")
-        print("- f(x) = tan x")
-        print("- Domain: All real numbers except x = π/2 + nπ")
-        print("- Range: All real numbers")
-        print("- Period: π")
-        print("- Vertical asymptotes at x = π/2 + nπ")
-        
-        print("\nTransformations of Trigonometric Functions:")
-        print("For a function of the form f(x) = A sin(Bx - C) + D:")
-        print("- |A| is the amplitude (for sine and cosine only)")
-        print("- 2π/|B| is the period")
-        print("- C/B is the phase shift (right if positive, left if negative)")
-        print("- D is the vertical shift")
+        self.show_lesson("graphs-of-trig-functions")
         
         # Interactive graph visualizer
         print("\n=== Trigonometric Function Visualizer ===")
@@ -500,15 +3607,14 @@ class PrecalculusGuide:
             print("2. Cosine")
             print("3. Tangent")
             print("4. Transformed Trig Function")
+            print("5. Animate a Parameter Sweep")
+            print("6. Animate the Unit Circle")
             
-            choice = input("\nEnter your choice (1-4): ")
+            choice = input("\nEnter your choice (1-6): ")
             
-            if choice == "1":
-                self.plot_trig_function(np.sin, "Sine Function (sin x)")
-            elif choice == "2":
-                self.plot_trig_function(np.cos, "Cosine Function (cos x)")
-            elif choice == "3":
-                self.plot_trig_function(np.tan, "Tangent Function (tan x)", True)
+            if choice in ("1", "2", "3"):
+                func_type = ("sin", "cos", "tan")[int(choice) - 1]
+                self.plot_trig_function(*make_trig_function(func_type))
             elif choice == "4":
                 # Get parameters for transformed function
                 try:
@@ -519,28 +3625,32 @@ class PrecalculusGuide:
                     D = float(input("D (vertical shift): "))
                     
                     func_type = input("Function type (sin, cos, tan): ").lower()
-                    if func_type == "sin":
-                        base_func = np.sin
-                        title = f"{A} sin({B}x - {C}) + {D}"
-                    elif func_type == "cos":
-                        base_func = np.cos
-                        title = f"{A} cos({B}x - {C}) + {D}"
-                    elif func_type == "tan":
-                        base_func = np.tan
-                        title = f"{A} tan({B}x - {C}) + {D}"
-                    else:
+                    if func_type not in TRIG_BASE_FUNCTIONS:
                         print("Invalid function type. Using sine.")
-                        base_func = np.sin
-                        title = f"{A} sin({B}x - {C}) + {D}"
+                        func_type = "sin"
                     
-                    # Create transformed function
-                    def transformed_func(x):
-                        return A * base_func(B * x - C) + D
-                    
-                    self.plot_trig_function(transformed_func, title, func_type == "tan")
+                    self.plot_trig_function(*make_trig_function(func_type, A, B, C, D))
                     
                 except ValueError:
                     print("Invalid parameter. Please enter numeric values.")
+            elif choice == "5":
+                func_type = input("Function type (sin, cos, tan): ").lower()
+                if func_type not in TRIG_BASE_FUNCTIONS:
+                    print("Invalid function type. Using sine.")
+                    func_type = "sin"
+                sweep = input("Parameter to sweep (A, B, C, D): ").upper()
+                if sweep not in SWEEP_RANGES:
+                    print("Invalid parameter. Sweeping C.")
+                    sweep = "C"
+                output = input("Save to file (.gif or .mp4, blank to show): ").strip() or None
+                animate_trig_sweep(func_type, sweep=sweep, output=output)
+                if output:
+                    print(f"Saved animation to {output}")
+            elif choice == "6":
+                output = input("Save to file (.gif or .mp4, blank to show): ").strip() or None
+                animate_unit_circle(output=output)
+                if output:
+                    print(f"Saved animation to {output}")
             else:
                 print("Invalid choice.")
                 
@@ -548,52 +3658,963 @@ class PrecalculusGuide:
             print(f"Error in plotting: {e}")
             
         self.press_enter_to_continue()
-        self.trigonometry_menu()
         
-    def plot_trig_function(self, func, title, is_tan=False):
-        """Plot a trigonometric function."""
-        fig, ax = plt.subplots(figsize=(10, 6))
+    def inverse_trig(self):
+        self.clear_screen()
+        self.show_lesson("inverse-trig-functions")
+        
+        # Interactive inverse trig calculator
+        print("\n=== Inverse Trig Calculator ===")
+        try:
+            x = float(input("Enter a value x: "))
+            values = evaluate_inverse_trig([x])
+            for name in INVERSE_TRIG_NAMES:
+                value = values[name][0]
+                if np.isnan(value):
+                    print(f"{name}({x}) = undefined")
+                else:
+                    print(f"{name}({x}) = {format_pi_multiple(float(value))} ≈ {value:.6f} rad = {math.degrees(value):.4f}°")
+        except ValueError:
+            print("Invalid input. Please enter a number.")
+            
+        self.press_enter_to_continue()
+        
+    def trig_identities(self):
+        self.clear_screen()
+        self.show_lesson("trigonometric-identities")
         
-        if is_tan:
-            # For tangent, use a smaller domain to show the asymptotes
-            x = np.linspace(-2*np.pi, 2*np.pi, 1000)
-            y = np.array([func(val) for val in x])
+        # Interactive identity checker
+        print("\n=== Identity Checker ===")
+        try:
+            lhs = input("Enter the left side (e.g., 'sin(2x)'): ")
+            rhs = input("Enter the right side (e.g., '2sin x cos x'): ")
+            result = verify_identity(lhs, rhs)
+            if result["identity"]:
+                print(f"\n{lhs} = {rhs} is an identity ({result['method']} check).")
+            else:
+                print(f"\n{lhs} = {rhs} is NOT an identity.")
+                if result["counterexample"]:
+                    values = ", ".join(f"{name} = {value:.4f}" for name, value in result["counterexample"].items())
+                    print(f"The two sides differ at {values}.")
+        except Exception as e:
+            print(f"Could not check identity: {e}")
             
-            # Filter out values that are too large
-            mask = np.abs(y) < 10
-            x_filtered = x[mask]
-            y_filtered = y[mask]
+        self.press_enter_to_continue()
+        
+    def solving_trig_equations(self):
+        self.clear_screen()
+        self.show_lesson("solving-trig-equations")
+        
+        # Interactive equation solver
+        print("\n=== Trig Equation Solver ===")
+        try:
+            equation = input("Enter an equation (e.g., 'sin 2θ = cos θ'): ")
+            roots = solve_trig_equation(equation)
+            if roots.size:
+                print("\nSolutions on [0, 2π):")
+                for label, root in zip(format_radians_array(roots), roots):
+                    print(f"- {label:<10} ({math.degrees(root):.2f}°)")
+            else:
+                print("\nNo solutions on [0, 2π).")
+            print(f"\nGeneral solution: {general_solution(equation)}")
+        except Exception as e:
+            print(f"Could not solve equation: {e}")
             
-            ax.plot(x_filtered, y_filtered)
+        self.press_enter_to_continue()
+        
+    def law_sines_cosines(self):
+        self.clear_screen()
+        self.show_lesson("law-of-sines-cosines")
+        
+        # Interactive triangle solver
+        print("\n=== Triangle Solver ===")
+        print("Enter three known parts (at least one side); leave the others blank.")
+        print("Angles are in degrees.")
+        try:
+            known = {}
+            for name in TRIANGLE_PARTS:
+                value = input(f"{name} = ").strip()
+                if value:
+                    known[name] = float(value)
+            solved = solve_triangles(**known)
+            count = int(solved["solutions"][0])
+            if count == 0:
+                print("\nNo triangle matches these values.")
+            for k in range(count):
+                if count == 2:
+                    print(f"\nTriangle {k + 1}:")
+                else:
+                    print()
+                print("  ".join(f"{name} = {solved[name][0, k]:.4f}" for name in TRIANGLE_PARTS[:3]))
+                print("  ".join(f"{name} = {solved[name][0, k]:.4f}°" for name in TRIANGLE_PARTS[3:]))
+                print(f"Area = {solved['area'][0, k]:.4f}")
+        except ValueError as e:
+            print(f"Invalid input: {e}")
             
-            # Add asymptote lines
-            for i in range(-2, 3):
-                asymptote = np.pi/2 + i*np.pi
-                ax.axvline(x=asymptote, color='r', linestyle='--', alpha=0.5)
-                
-            ax.set_ylim(-5, 5)
-        else:
-            # For sine and cosine, use a regular domain
-            x = np.linspace(-2*np.pi, 2*np.pi, 1000)
-            y = func(x)
-            ax.plot(x, y)
-            ax.set_ylim(-3, 3)
-        
-        # Add gridlines and labels
-        ax.grid(True)
-        ax.axhline(y=0, color='k', linestyle='-', alpha=0.3)
-        ax.axvline(x=0, color='k', linestyle='-', alpha=0.3)
-        
-        # Mark π values on x-axis
-        pi_ticks = np.arange(-2*np.pi, 2.1*np.pi, np.pi/2)
-        pi_labels = ["-2π", "-3π/2", "-π", "-π/2", "0", "π/2", "π", "3π/2", "2π"]
-        ax.set_xticks(pi_ticks)
-        ax.set_xticklabels(pi_labels)
-        
-        ax.set_title(title)
-        ax.set_xlabel('x')
-        ax.set_ylabel('f(x)')
+        self.press_enter_to_continue()
         
+    def plot_trig_function(self, func, title, is_tan=False, params=(1.0, 1.0, 0.0, 0.0)):
+        """Plot a trigonometric function.
+
+        ``params`` are the (A, B, C, D) of A f(Bx - C) + D, used to place the
+        tangent asymptotes.
+        """
+        fig, ax = plt.subplots(figsize=(10, 6))
+        draw_trig_function(ax, func, title, is_tan, params)
         plt.show()
-    
-    
+
+    def plot_rational_function(self, f, domain=(-10.0, 10.0)):
+        """Plot a RationalFunction with its asymptotes and holes."""
+        fig, ax = plt.subplots(figsize=(10, 6))
+        draw_rational_function(ax, f, domain=domain)
+        plt.show()
+
+    def plot_conic(self, coeffs, domain=(-10.0, 10.0)):
+        """Plot a conic [A, B, C, D, E, F]."""
+        fig, ax = plt.subplots(figsize=(8, 8))
+        draw_conic(ax, coeffs, domain=domain)
+        plt.show()
+
+
+# Headless batch engine
+# ---------------------
+# Jobs are dicts such as {"op": "trig", "angle": 45, "unit": "degrees"}. Each
+# handler takes a list of jobs of its op and returns one result per job, so
+# numeric ops are evaluated as a single NumPy call per chunk. Handlers that
+# write files yield their results instead, one job at a time.
+
+def _json_value(value):
+    """Convert NumPy scalars/arrays to JSON-safe values (NaN becomes null)."""
+    if isinstance(value, np.ndarray):
+        # tolist() gives a Python scalar for a 0-d array and nested lists otherwise
+        value = value.tolist()
+    if isinstance(value, list):
+        return [_json_value(v) for v in value]
+    if isinstance(value, (np.floating, float)):
+        value = float(value)
+        return value if math.isfinite(value) else None
+    if isinstance(value, np.integer):
+        return int(value)
+    return value
+
+
+def _batch_convert(jobs):
+    units = [job.get("unit", "degrees") for job in jobs]
+    values = np.array([float(job["value"]) for job in jobs])
+    results = [None] * len(jobs)
+    for unit in set(units):
+        rows = [i for i, u in enumerate(units) if u == unit]
+        converted = convert_angles(values[rows], unit)
+        for j, i in enumerate(rows):
+            results[i] = {
+                "degrees": _json_value(converted["degrees"][j]),
+                "radians": _json_value(converted["radians"][j]),
+                "pi": converted["pi"][j],
+            }
+    return results
+
+
+def _batch_trig(jobs):
+    radians = parse_angles([job["angle"] for job in jobs], [job.get("unit") for job in jobs], reduce=True)
+    values = evaluate_trig(radians)
+    columns = []
+    for name in TRIG_FUNCTION_NAMES:
+        column = values[name].astype(object)
+        column[np.isnan(values[name])] = None
+        columns.append(column.tolist())
+    return [dict(zip(TRIG_FUNCTION_NAMES, row)) for row in zip(*columns)]
+
+
+def _batch_inverse_trig(jobs):
+    values = evaluate_inverse_trig([float(job["value"]) for job in jobs])
+    columns = []
+    for name in INVERSE_TRIG_NAMES:
+        column = values[name].astype(object)
+        column[np.isnan(values[name])] = None
+        columns.append(column.tolist())
+    return [dict(zip(INVERSE_TRIG_NAMES, row)) for row in zip(*columns)]
+
+
+def _batch_sequence(jobs):
+    results = []
+    for job in jobs:
+        n = np.asarray(job.get("n", 1), dtype=float)
+        first, step = float(job.get("first", 1)), float(job["step"])
+        with np.errstate(over="ignore", invalid="ignore"):
+            terms = nth_term(job.get("kind", "arithmetic"), first, step, n)
+            sums = partial_sum(job.get("kind", "arithmetic"), first, step, n)
+        results.append({"n": _json_value(n), "term": _json_value(terms), "partial_sum": _json_value(sums)})
+    return results
+
+
+# Largest power a binomial job may expand; row n has n + 1 big-int coefficients
+BINOMIAL_MAX_POWER = 1000
+
+
+def _batch_binomial(jobs):
+    results = []
+    for job in jobs:
+        n = int(job["n"])
+        if not 0 <= n <= BINOMIAL_MAX_POWER:
+            raise ValueError(f"n must be between 0 and {BINOMIAL_MAX_POWER}, not {n}")
+        # JSON ints stay exact; anything else (e.g. CSV text) becomes a float
+        a, b = (v if isinstance(v, int) else float(v) for v in (job.get("a", 1), job.get("b", 1)))
+        coefficients = binomial_coefficients(n, a, b)
+        results.append({"coefficients": [_json_value(c) for c in coefficients]})
+    return results
+
+
+def _batch_matrix(jobs):
+    # Stack jobs of the same size (and with or without b) into one call per np.linalg routine
+    results = [None] * len(jobs)
+    groups = {}
+    for pos, job in enumerate(jobs):
+        A = np.asarray(job["A"], dtype=float)
+        groups.setdefault((A.shape, "b" in job), []).append(pos)
+    for (shape, has_b), positions in groups.items():
+        safe, det, singular = _nonsingular(np.stack([jobs[p]["A"] for p in positions]).astype(float))
+        inverse = _inverse(safe, singular)
+        if has_b:
+            solution = _solve(safe, singular, [jobs[p]["b"] for p in positions])
+        for i, pos in enumerate(positions):
+            result = {"det": _json_value(det[i]), "singular": bool(singular[i]),
+                      "inverse": None if singular[i] else _json_value(inverse[i])}
+            if has_b:
+                result["x"] = None if singular[i] else _json_value(solution[i])
+            results[pos] = result
+    return results
+
+
+def _batch_polynomial(jobs):
+    # Same-degree polynomials share one companion-matrix eigenvalue call
+    coefficients = [_trim_coefficients(job["coefficients"]) for job in jobs]
+    results = [None] * len(jobs)
+    groups = {}
+    for pos, coeffs in enumerate(coefficients):
+        groups.setdefault(len(coeffs), []).append(pos)
+    for _, positions in groups.items():
+        roots = poly_roots(np.stack([coefficients[p] for p in positions]))
+        for i, pos in enumerate(positions):
+            result = {"degree": len(coefficients[pos]) - 1,
+                      "roots": [[_json_value(r.real), _json_value(r.imag)] for r in roots[i]]}
+            if "x" in jobs[pos]:
+                result["y"] = _json_value(horner(coefficients[pos], np.asarray(jobs[pos]["x"], dtype=float)))
+            results[pos] = result
+    return results
+
+
+def _rational_job(job):
+    if "expression" in job:
+        return parse_rational(job["expression"])
+    return RationalFunction(job["numerator"], job.get("denominator", (1.0,)))
+
+
+def _batch_rational(jobs):
+    results = []
+    for job in jobs:
+        f = _rational_job(job)
+        result = {
+            "zeros": _json_value(f.zeros),
+            "vertical_asymptotes": _json_value(f.vertical_asymptotes),
+            "holes": [[_json_value(x), _json_value(y)] for x, y in f.holes],
+            "horizontal_asymptote": _json_value(f.horizontal_asymptote),
+            "slant_asymptote": None if f.slant_asymptote is None else _json_value(np.array(f.slant_asymptote)),
+            "y_intercept": _json_value(f.y_intercept),
+        }
+        if "expression" in job:
+            result["partial_fractions"] = partial_fractions(job["expression"])
+        if job.get("output"):
+            domain = (float(job.get("xmin", -10)), float(job.get("xmax", 10)))
+            _write_image(job["output"], render_rational_graph(f.numerator, f.denominator, domain,
+                                                              fmt=_image_format(job)))
+            result["output"] = job["output"]
+        results.append(result)
+    return results
+
+
+def _batch_conic(jobs):
+    coeffs = np.array([parse_conic(job["equation"]) if "equation" in job else
+                       [float(c) for c in job["coefficients"]] for job in jobs]).reshape(-1, 6)
+    info = classify_conics(coeffs)
+    results = [{
+        "coefficients": _json_value(coeffs[i]),
+        "kind": info["kind"][i],
+        "discriminant": _json_value(info["discriminant"][i]),
+        "determinant": _json_value(info["determinant"][i]),
+        "center": _json_value(info["center"][i]),
+        "angle": _json_value(np.degrees(info["angle"][i])),
+        "semi_axes": _json_value(info["semi_axes"][i]),
+        "eccentricity": _json_value(info["eccentricity"][i]),
+    } for i in range(len(jobs))]
+
+    # Trace every conic that is drawn in the same window with one call
+    windows = {}
+    for i, job in enumerate(jobs):
+        if job.get("output"):
+            windows.setdefault((float(job.get("xmin", -10)), float(job.get("xmax", 10))), []).append(i)
+    for domain, rows in windows.items():
+        curves = conic_curves(coeffs[rows], domain, kinds=info["kind"][rows])
+        for i, curve in zip(rows, curves):
+            data = render_conic_graph(coeffs[i], domain, fmt=_image_format(jobs[i]), curves=curve)
+            _write_image(jobs[i]["output"], data)
+            results[i]["output"] = jobs[i]["output"]
+    return results
+
+
+def _expression_groups(jobs):
+    """Positions of jobs by expression, with each job's points concatenated."""
+    groups = {}
+    for pos, job in enumerate(jobs):
+        groups.setdefault(job["expression"], []).append(pos)
+    for expression, positions in groups.items():
+        points = [np.atleast_1d(np.asarray(jobs[p]["x"], dtype=float)) for p in positions]
+        yield compile_function(expression), positions, points, np.concatenate(points)
+
+
+def _batch_derivative(jobs):
+    # One Dual evaluation per distinct expression, over all of its jobs' points
+    results = [None] * len(jobs)
+    for func, positions, points, x in _expression_groups(jobs):
+        values, slopes = derivative(func, x)
+        start = 0
+        for pos, p in zip(positions, points):
+            stop = start + p.size
+            results[pos] = {"x": _json_value(p), "value": _json_value(values[start:stop]),
+                            "derivative": _json_value(slopes[start:stop])}
+            start = stop
+    return results
+
+
+def _batch_limit(jobs):
+    results = [None] * len(jobs)
+    for func, positions, points, x in _expression_groups(jobs):
+        checked = continuity(func, x)
+        # JSON has no infinity, and an infinite limit is an answer, not a gap
+        for name in ("left", "right", "limit"):
+            values = checked[name].astype(object)
+            values[np.isposinf(checked[name])] = "inf"
+            values[np.isneginf(checked[name])] = "-inf"
+            checked[name] = values
+        start = 0
+        for pos, p in zip(positions, points):
+            stop = start + p.size
+            results[pos] = {"x": _json_value(p)}
+            for name in ("value", "left", "right", "limit", "continuous", "kind"):
+                results[pos][name] = _json_value(checked[name][start:stop])
+            start = stop
+    return results
+
+
+def _write_image(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _image_format(job):
+    return job.get("fmt") or os.path.splitext(job.get("output", ""))[1].lstrip(".").lower() or "png"
+
+
+def _graph_args(job):
+    """Positional and keyword arguments of render_trig_graph for a graph job."""
+    params = [float(job.get(p, default)) for p, default in zip("ABCD", (1, 1, 0, 0))]
+    domain = (float(job.get("xmin", -2 * math.pi)), float(job.get("xmax", 2 * math.pi)))
+    return (job.get("func", "sin"), *params), {"domain": domain, "num": int(job.get("num", 400)),
+                                               "fmt": _image_format(job)}
+
+
+def _job_divisions(job):
+    divisions = job.get("divisions", UNIT_CIRCLE_DIVISIONS)
+    if isinstance(divisions, str):
+        divisions = divisions.replace(",", " ").split()
+    elif not isinstance(divisions, (list, tuple)):
+        divisions = [divisions]
+    counts = []
+    for n in divisions:
+        count = float(n)
+        if count <= 0 or not count.is_integer():
+            raise ValueError(f"Divisions must be positive whole numbers, not {n}")
+        counts.append(int(count))
+    return tuple(counts)
+
+
+def _batch_graph(jobs):
+    for job in jobs:
+        args, kwargs = _graph_args(job)
+        data = render_trig_graph(*args, **kwargs)
+        _write_image(job["output"], data)
+        yield {"output": job["output"], "bytes": len(data)}
+
+
+def _batch_unit_circle(jobs):
+    for job in jobs:
+        divisions = _job_divisions(job)
+        table = unit_circle_table(divisions)
+        rows = [
+            {"degrees": deg, "radians": rad, "coordinates": coord, "cos": c, "sin": s}
+            for deg, rad, coord, c, s in zip(table["degrees"], table["radians"], table["coordinates"],
+                                             table["cos"].tolist(), table["sin"].tolist())
+        ]
+        if job.get("output"):
+            _write_image(job["output"], render_unit_circle(_image_format(job), divisions=divisions))
+        yield {"rows": rows, "output": job.get("output")}
+
+
+def _batch_triangle(jobs):
+    columns = {}
+    for name in TRIANGLE_PARTS:
+        values = np.array([np.nan if job.get(name) is None else float(job[name]) for job in jobs])
+        if name.isupper():
+            units = [job.get("unit") or "degrees" for job in jobs]
+            unknown = set(units) - {"degrees", "radians"}
+            if unknown:
+                raise ValueError(f"Unknown angle unit for a triangle: {unknown.pop()} (use degrees or radians)")
+            radians = np.array([unit == "radians" for unit in units])
+            values = np.where(radians, np.degrees(values), values)
+        columns[name] = values
+    solved = solve_triangles(**columns)
+    names = TRIANGLE_PARTS + ("area",)
+    results = []
+    for row, count in enumerate(solved["solutions"].tolist()):
+        results.append({"solutions": [
+            {name: float(solved[name][row, k]) for name in names} for k in range(count)
+        ]})
+    return results
+
+
+def _batch_animation(jobs):
+    for job in jobs:
+        frames = int(job.get("frames", 120))
+        fps = int(job.get("fps", 30))
+        if job.get("plot") == "unit_circle":
+            animate_unit_circle(frames, output=job["output"], fps=fps)
+        else:
+            sweep = job.get("sweep", "C")
+            params = [float(job.get(p, default)) for p, default in zip("ABCD", (1, 1, 0, 0))]
+            values = None
+            if "start" in job or "stop" in job:
+                start, stop = SWEEP_RANGES[sweep]
+                values = np.linspace(float(job.get("start", start)), float(job.get("stop", stop)), frames)
+            domain = (float(job.get("xmin", -2 * math.pi)), float(job.get("xmax", 2 * math.pi)))
+            animate_trig_sweep(job.get("func", "sin"), *params, sweep=sweep, values=values, frames=frames,
+                               domain=domain, output=job["output"], fps=fps)
+        yield {"output": job["output"], "frames": frames, "bytes": os.path.getsize(job["output"])}
+
+
+BATCH_HANDLERS = {
+    "convert": _batch_convert,
+    "trig": _batch_trig,
+    "inverse_trig": _batch_inverse_trig,
+    "graph": _batch_graph,
+    "unit_circle": _batch_unit_circle,
+    "triangle": _batch_triangle,
+    "sequence": _batch_sequence,
+    "binomial": _batch_binomial,
+    "matrix": _batch_matrix,
+    "polynomial": _batch_polynomial,
+    "rational": _batch_rational,
+    "derivative": _batch_derivative,
+    "limit": _batch_limit,
+    "conic": _batch_conic,
+    "animation": _batch_animation,
+}
+
+
+def _run_handler(handler, jobs):
+    """Run a handler over jobs, isolating the failing ones if the batch fails.
+
+    Handlers return a list of results, or yield one per job when jobs have
+    side effects (written files). Only jobs without a result are re-run, so
+    a finished job is never repeated.
+    """
+    results = []
+    try:
+        for result in handler(jobs):
+            results.append(result)
+        return results
+    except Exception:
+        if len(jobs) == 1:
+            raise
+    for job in jobs[len(results):]:
+        try:
+            results.extend(handler([job]))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def run_jobs(jobs, chunk_size=4096):
+    """Run an iterable of job dicts, yielding one result dict per job in order."""
+    jobs = iter(jobs)
+    index = 0
+    while True:
+        chunk = []
+        for job in jobs:
+            chunk.append(job)
+            if len(chunk) >= chunk_size:
+                break
+        if not chunk:
+            return
+
+        by_op = {}
+        for pos, job in enumerate(chunk):
+            by_op.setdefault(job.get("op"), []).append(pos)
+
+        results = [None] * len(chunk)
+        for op, positions in by_op.items():
+            handler = BATCH_HANDLERS.get(op)
+            if handler is None:
+                outcome = [ValueError(f"Unknown op: {op}")] * len(positions)
+            else:
+                try:
+                    outcome = _run_handler(handler, [chunk[p] for p in positions])
+                except Exception as e:
+                    outcome = [e]
+            for pos, result in zip(positions, outcome):
+                results[pos] = result
+
+        for job, result in zip(chunk, results):
+            record = {"id": job.get("id", index), "op": job.get("op")}
+            if isinstance(result, Exception):
+                record.update(ok=False, error=f"{type(result).__name__}: {result}")
+            else:
+                record.update(ok=True, result=result)
+            index += 1
+            yield record
+
+
+def read_jobs(stream, fmt="jsonl"):
+    """Yield job dicts from a JSON-lines or CSV stream."""
+    import csv
+    import json
+
+    if fmt == "csv":
+        for row in csv.DictReader(stream):
+            yield {key: value for key, value in row.items() if value not in (None, "")}
+    else:
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def run_batch(source, out, fmt="jsonl", chunk_size=4096):
+    """Run jobs from a stream and write JSON-lines results as they complete."""
+    import json
+
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    for record in run_jobs(read_jobs(source, fmt), chunk_size):
+        out.write(encode(record) + "\n")
+
+
+# HTTP service
+# ------------
+# A small HTTP/1.1 server on asyncio streams (no dependencies beyond the
+# standard library). Calculator requests that arrive together are
+# micro-batched into one run_jobs call in a worker thread; Matplotlib
+# rendering runs in a process pool, so the event loop stays responsive. Connections are kept
+# alive between requests unless the client asks otherwise.
+
+# Ops that only compute; ops that write files (graph, animation) are not
+# reachable through /batch
+SERVER_BATCH_OPS = ("convert", "trig", "inverse_trig", "unit_circle", "triangle",
+                    "sequence", "binomial", "matrix", "polynomial", "rational",
+                    "derivative", "limit", "conic")
+SERVER_MAX_BODY = 16 * 2**20
+SERVER_KEEPALIVE_TIMEOUT = 15.0
+IMAGE_CONTENT_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _check_server_job(job):
+    if not isinstance(job, dict):
+        raise HTTPError(400, "Each job must be a JSON object")
+    if job.get("op") not in SERVER_BATCH_OPS:
+        raise HTTPError(400, f"Unsupported op: {job.get('op')} (use one of {', '.join(SERVER_BATCH_OPS)})")
+    if "output" in job:
+        raise HTTPError(400, "Jobs cannot write server-side files")
+
+
+class JobBatcher:
+    """Collect jobs submitted within a short window and run them as one batch."""
+
+    def __init__(self, delay=0.002, max_size=4096):
+        self.delay = delay
+        self.max_size = max_size
+        self._pending = []
+        self._timer = None
+
+    def submit(self, job):
+        """Queue a job; returns a future for its run_jobs result record."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((job, future))
+        if len(self._pending) >= self.max_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.delay, self.flush)
+        return future
+
+    def flush(self):
+        """Start the pending jobs as one batch in a worker thread.
+
+        The loop keeps serving other connections while the batch runs, even
+        when it holds slow SymPy jobs (exact surds, rational, limit, conic).
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        jobs = [job for job, _ in pending]
+        done = asyncio.get_running_loop().run_in_executor(
+            None, lambda: list(run_jobs(jobs, chunk_size=self.max_size)))
+        done.add_done_callback(functools.partial(self._resolve, pending))
+
+    @staticmethod
+    def _resolve(pending, done):
+        try:
+            records = done.result()
+        except Exception as e:
+            # run_jobs reports job errors in its records, so this is a bug; fail
+            # the waiting requests instead of leaving them hanging
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), record in zip(pending, records):
+            if not future.done():
+                future.set_result(record)
+
+
+class GuideServer:
+    """Serve the calculators and renderers over HTTP/JSON.
+
+    GET (query string) or POST (JSON object) to /convert, /trig,
+    /inverse-trig, /triangle or /unit-circle for JSON results; /graph and
+    /unit-circle/image return PNG or SVG images. POST a JSON array or JSON
+    lines of jobs to /batch. /content?key=... returns lesson text (without
+    a key, the list of sections) and /search?q=... ranked sections, both
+    from the shared memory-mapped content store. /health reports that the
+    server is up.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8000, workers=None):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.routes = {
+            "/health": self.health,
+            "/convert": functools.partial(self.single_job, "convert"),
+            "/trig": functools.partial(self.single_job, "trig"),
+            "/inverse-trig": functools.partial(self.single_job, "inverse_trig"),
+            "/triangle": functools.partial(self.single_job, "triangle"),
+            "/unit-circle": functools.partial(self.single_job, "unit_circle"),
+            "/unit-circle/image": self.unit_circle_image,
+            "/graph": self.graph,
+            "/batch": self.batch,
+            "/content": self.content,
+            "/search": self.search,
+        }
+        self.batcher = None
+        self.pool = None
+
+    async def health(self, params, body):
+        return 200, "application/json", {"ok": True}
+
+    async def single_job(self, op, params, body):
+        _check_server_job(dict(params, op=op))
+        record = await self.batcher.submit(dict(params, op=op))
+        if not record["ok"]:
+            raise HTTPError(400, record["error"])
+        return 200, "application/json", record["result"]
+
+    async def batch(self, params, body):
+        import json
+        text = body.decode("utf-8").strip()
+        try:
+            if text.startswith("["):
+                jobs = json.loads(text)
+            else:
+                jobs = [json.loads(line) for line in text.splitlines() if line.strip()]
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid JSON: {e}")
+        for job in jobs:
+            _check_server_job(job)
+        # Large batches run in a thread so other connections are still served
+        loop = asyncio.get_running_loop()
+        records = await loop.run_in_executor(None, list, run_jobs(jobs))
+        return 200, "application/json", records
+
+    async def content(self, params, body):
+        store = get_content_store()
+        key = params.get("key")
+        if key is None:
+            return 200, "application/json", [{"key": k, "title": store.sections[k][0]} for k in store.keys]
+        if key not in store:
+            raise HTTPError(404, f"No such lesson or section: {key}")
+        return 200, "text/plain; charset=utf-8", store.section(key).encode("utf-8")
+
+    async def search(self, params, body):
+        results = get_content_store().search(params.get("q", ""), int(params.get("limit", 10)))
+        return 200, "application/json", [{"key": key, "title": title, "score": score}
+                                          for key, title, score in results]
+
+    async def graph(self, params, body):
+        args, kwargs = _graph_args(params)
+        return await self.render(kwargs["fmt"], functools.partial(render_trig_graph, *args, **kwargs))
+
+    async def unit_circle_image(self, params, body):
+        fmt = _image_format(params)
+        return await self.render(fmt, functools.partial(render_unit_circle, fmt,
+                                                        divisions=_job_divisions(params)))
+
+    async def render(self, fmt, draw):
+        """Run draw() in the process pool and return its image bytes."""
+        if fmt not in IMAGE_CONTENT_TYPES:
+            raise HTTPError(400, f"Unsupported image format: {fmt}")
+        loop = asyncio.get_running_loop()
+        return 200, IMAGE_CONTENT_TYPES[fmt], await loop.run_in_executor(self.pool, draw)
+
+    async def dispatch(self, method, target, body):
+        import json
+        import urllib.parse
+
+        url = urllib.parse.urlsplit(target)
+        route = self.routes.get(url.path.rstrip("/") or "/")
+        if route is None:
+            raise HTTPError(404, f"No such endpoint: {url.path}")
+        if method not in ("GET", "POST"):
+            raise HTTPError(405, f"Method not allowed: {method}")
+        params = dict(urllib.parse.parse_qsl(url.query))
+        if method == "POST" and route != self.batch and body:
+            try:
+                fields = json.loads(body)
+            except ValueError as e:
+                raise HTTPError(400, f"Invalid JSON: {e}")
+            if not isinstance(fields, dict):
+                raise HTTPError(400, "The request body must be a JSON object")
+            params.update(fields)
+        try:
+            return await route(params, body)
+        except HTTPError:
+            raise
+        except (ValueError, KeyError, TypeError) as e:
+            raise HTTPError(400, f"{type(e).__name__}: {e}")
+
+    async def handle(self, reader, writer):
+        """Serve requests on one connection until it closes or goes idle."""
+        import json
+
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), SERVER_KEEPALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not line.strip():
+                    break
+                request = line.decode("latin-1").split()
+                headers = {}
+                if len(request) == 3:
+                    while True:
+                        header = await reader.readline()
+                        if header in (b"\r\n", b"\n", b""):
+                            break
+                        name, _, value = header.decode("latin-1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if request[-1:] == ["HTTP/1.1"] else connection == "keep-alive"
+                try:
+                    # Where the body ends is unknown after any of these errors, so
+                    # the connection is closed rather than read out of step
+                    if len(request) != 3:
+                        keep_alive = False
+                        raise HTTPError(400, "Malformed request line")
+                    method, target, _ = request
+                    if "chunked" in headers.get("transfer-encoding", ""):
+                        keep_alive = False
+                        raise HTTPError(411, "Chunked request bodies are not supported")
+                    try:
+                        length = int(headers.get("content-length", 0))
+                    except ValueError:
+                        length = -1
+                    if length < 0:
+                        keep_alive = False
+                        raise HTTPError(400, "Invalid Content-Length")
+                    if length > SERVER_MAX_BODY:
+                        keep_alive = False
+                        raise HTTPError(413, f"Request body over {SERVER_MAX_BODY} bytes")
+                    body = await reader.readexactly(length) if length else b""
+                    status, content_type, payload = await self.dispatch(method, target, body)
+                except HTTPError as e:
+                    status, content_type, payload = e.status, "application/json", {"error": str(e)}
+                except Exception as e:
+                    status, content_type, payload = 500, "application/json", {"error": f"{type(e).__name__}: {e}"}
+                if content_type == "application/json":
+                    payload = encode(payload).encode("utf-8")
+
+                head = (f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                        f"Content-Type: {content_type}\r\n"
+                        f"Content-Length: {len(payload)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+                writer.write(head.encode("latin-1") + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            # Dropped connections and undecodable requests end the connection
+            pass
+        finally:
+            writer.close()
+
+    async def serve_forever(self, ready=None):
+        """Serve until cancelled; ready(server) is called once listening."""
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.batcher = JobBatcher()
+        self.pool = ProcessPoolExecutor(self.workers)
+        # Build or map the content store now rather than on the first request
+        try:
+            get_content_store()
+        except OSError as e:
+            print(f"Lesson content unavailable: {e}", file=sys.stderr)
+        try:
+            server = await asyncio.start_server(self.handle, self.host, self.port)
+            async with server:
+                if ready is not None:
+                    ready(server)
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+    def run(self):
+        """Run the server in the current thread until interrupted."""
+        print(f"Serving on http://{self.host}:{self.port} (Ctrl+C to stop)", file=sys.stderr)
+        try:
+            asyncio.run(self.serve_forever())
+        except KeyboardInterrupt:
+            pass
+
+
+def startup_report():
+    """Describe how long App.py and each lazily imported module took to load.
+
+    Module times include any dependencies that were not already imported.
+    """
+    lines = ["Startup report:", f"  {'App.py module body':<24}{_MODULE_LOAD_TIME * 1000:8.1f} ms"]
+    for name, seconds in IMPORT_TIMES.items():
+        lines.append(f"  {name:<24}{seconds * 1000:8.1f} ms")
+    if not IMPORT_TIMES:
+        lines.append("  (no heavy modules were imported)")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Command-line entry point: the interactive guide, a headless batch run or the HTTP server."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Precalculus Complete Guide")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="run JSON-lines or CSV jobs from FILE ('-' for stdin) without prompts")
+    parser.add_argument("--format", choices=("jsonl", "csv"),
+                        help="job format (default: from the file extension, else jsonl)")
+    parser.add_argument("--output", metavar="FILE", default="-",
+                        help="where to write results (default: stdout)")
+    parser.add_argument("--trig-table", metavar="FILE",
+                        help="write a CSV table of all six trig functions for the angles in FILE")
+    parser.add_argument("--radians", action="store_true",
+                        help="angles for --trig-table are in radians (default: degrees)")
+    parser.add_argument("--fast", action="store_true",
+                        help=f"use the fast trig kernels for --trig-table (error < {FAST_TRIG_MAX_ERROR:g})")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print the time spent importing each module to stderr on exit")
+    parser.add_argument("--sequence-table", nargs=4, metavar=("KIND", "FIRST", "STEP", "COUNT"),
+                        help="write a CSV of n, term and partial sum for an arithmetic or geometric sequence")
+    parser.add_argument("--serve", metavar="HOST:PORT",
+                        help="serve the calculators and renderers over HTTP (e.g. 127.0.0.1:8000)")
+    parser.add_argument("--workers", type=int, metavar="N",
+                        help="rendering processes for --serve (default: one per CPU)")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="record per-topic time, calls and memory peaks of the interactive session "
+                             "to FILE (Prometheus text for .prom/.txt, JSON otherwise)")
+    parser.add_argument("--build-content", action="store_true",
+                        help="compile precalculus-github-repo.md into the lesson content store and exit")
+    parser.add_argument("--search", metavar="QUERY",
+                        help="list the lesson sections that mention every word of QUERY")
+    args = parser.parse_args(argv)
+
+    try:
+        _run(args)
+    finally:
+        if args.startup_report:
+            print(startup_report(), file=sys.stderr)
+
+
+def _run(args):
+    """Run the mode selected on the command line."""
+    if args.serve:
+        host, _, port = args.serve.rpartition(":")
+        GuideServer(host or "127.0.0.1", int(port), args.workers).run()
+        return
+
+    if args.build_content:
+        path = content_store_path()
+        blob = build_content_store(CONTENT_SOURCE, path)
+        print(f"Wrote {path}: {len(ContentStore(blob).keys)} sections, {len(blob)} bytes")
+        return
+
+    if args.search:
+        results = get_content_store().search(args.search)
+        if not results:
+            print(f"No sections mention: {args.search}")
+        for key, title, score in results:
+            print(f"{score:7.2f}  {key}  ({title})")
+        return
+
+    if args.batch or args.trig_table or args.sequence_table:
+        out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+        try:
+            if args.trig_table:
+                write_trig_table(args.trig_table, out, degrees=not args.radians, fast=args.fast)
+            elif args.sequence_table:
+                kind, first, step, count = args.sequence_table
+                write_sequence_table(out, kind, float(first), float(step), int(count))
+            else:
+                fmt = args.format or ("csv" if args.batch.endswith(".csv") else "jsonl")
+                if args.batch == "-":
+                    run_batch(sys.stdin, out, fmt)
+                else:
+                    with open(args.batch, encoding="utf-8", newline="") as source:
+                        run_batch(source, out, fmt)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        return
+
+    guide = PrecalculusGuide()
+    if not args.profile:
+        guide.main_menu()
+        return
+    with Profiler() as profiler:
+        profiler.instrument(guide)
+        try:
+            guide.main_menu()
+        finally:
+            profiler.write(args.profile)
+
+
+_MODULE_LOAD_TIME = time.perf_counter() - _START_TIME
+
+
+if __name__ == "__main__":
+    main()
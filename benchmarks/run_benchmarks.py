@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the guide's hot paths
+====================================
+
+Runs headless (Agg backend) and prints a JSON report. Each benchmark's
+median time is divided by the median of the fixed "reference" workload
+from the same run, and that relative time is compared with the one in
+benchmarks/baseline.json; the run fails if any benchmark is slower
+relative to the reference than its threshold allows.
+
+    python benchmarks/run_benchmarks.py                    # check against the baseline
+    python benchmarks/run_benchmarks.py --update-baseline  # record new relative times
+    python benchmarks/run_benchmarks.py -k radians         # only matching benchmarks
+
+Relative times cancel most of the difference between a fast and a slow
+host, so the baseline does not have to be recorded on the machine that
+runs the checks (hosts with unusual NumPy builds may still need looser
+thresholds).
+"""
+
+import os
+
+# Must be set before matplotlib is imported anywhere
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import argparse
+import atexit
+import json
+import math
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+DEFAULT_THRESHOLD = 1.5
+REFERENCE = "reference"
+
+sys.path.insert(0, ROOT)
+
+import App  # noqa: E402
+
+# Benchmarks by name: each entry is (setup, repeat); setup() returns the
+# function to time, so expensive inputs are not part of the measurement
+BENCHMARKS = {}
+
+
+def benchmark(repeat=20):
+    def register(setup):
+        BENCHMARKS[setup.__name__] = (setup, repeat)
+        return setup
+    return register
+
+
+@benchmark()
+def reference():
+    # Fixed NumPy and pure-Python work that does not depend on App.py; every
+    # other median is divided by this one
+    values = App.np.random.default_rng(0).uniform(-1000, 1000, 1_000_000)
+    numbers = values[:100_000].tolist()
+
+    def run():
+        App.np.sort(App.np.sin(values))
+        sum(math.sqrt(abs(v)) for v in numbers)
+    return run
+
+
+@benchmark()
+def format_radians():
+    guide = App.PrecalculusGuide()
+    angles = [k * math.pi / 180 for k in range(-720, 721)]
+
+    def run():
+        # Uncached: clear the memo so every angle is formatted from scratch
+        App.format_pi_multiple.cache_clear()
+        for angle in angles:
+            guide.format_radians(angle)
+    return run
+
+
+@benchmark()
+def format_radians_array():
+    angles = App.np.linspace(-8 * math.pi, 8 * math.pi, 100_000)
+    return lambda: App.format_radians_array(angles)
+
+
+@benchmark()
+def trig_calculator():
+    expressions = [f"{k}°" for k in range(0, 360, 5)] + [f"{k}π/12" for k in range(-24, 25)]
+
+    def run():
+        # The calculator's path: compile the typed angle, then all six functions
+        App.compile_angle.cache_clear()
+        for text in expressions:
+            App.evaluate_trig(App.compile_angle(text, "degrees").value)
+    return run
+
+
+@benchmark()
+def evaluate_trig_vector():
+    angles = App.np.linspace(-720, 720, 1_000_000)
+    return lambda: App.evaluate_trig(angles, degrees=True)
+
+
+@benchmark()
+def evaluate_trig_vector_fast():
+    angles = App.np.linspace(-720, 720, 1_000_000)
+    return lambda: App.evaluate_trig(angles, degrees=True, fast=True)
+
+
+# The fast kernels against the NumPy calls they replace
+@benchmark()
+def sin_numpy():
+    angles = App.np.random.default_rng(0).uniform(-1000, 1000, 1_000_000)
+    return lambda: App.np.sin(angles)
+
+
+@benchmark()
+def sin_fast():
+    angles = App.np.random.default_rng(0).uniform(-1000, 1000, 1_000_000)
+    return lambda: App.fast_sin(angles)
+
+
+@benchmark()
+def inverse_trig_vector():
+    values = App.np.linspace(-3, 3, 1_000_000)
+    return lambda: App.evaluate_inverse_trig(values)
+
+
+@benchmark()
+def solve_systems():
+    rng = App.np.random.default_rng(0)
+    A = rng.normal(size=(50_000, 3, 3))
+    b = rng.normal(size=(50_000, 3))
+    return lambda: App.solve_systems(A, b)
+
+
+@benchmark()
+def solve_shared_matrix():
+    # One matrix against many right-hand sides: factored once, not per vector
+    rng = App.np.random.default_rng(0)
+    A = rng.normal(size=(50, 50))
+    b = rng.normal(size=(20_000, 50))
+    return lambda: App.solve_systems(A, b)
+
+
+@benchmark()
+def horner_grid():
+    coeffs = App.np.random.default_rng(0).normal(size=(100, 1, 6))
+    x = App.np.linspace(-5, 5, 10_000)
+    return lambda: App.horner(coeffs, x)
+
+
+@benchmark()
+def poly_roots_batch():
+    coeffs = App.np.random.default_rng(0).normal(size=(10_000, 6))
+    return lambda: App.poly_roots(coeffs)
+
+
+@benchmark()
+def derivative_dual():
+    func = App.make_trig_function("tan", 1, 2, 0.5, 0)[0]
+    x = App.np.linspace(-3, 3, 1_000_000)
+    return lambda: App.derivative(func, x)
+
+
+@benchmark()
+def continuity_points():
+    func = App.compile_function("sin(x)/x")
+    x = App.np.linspace(-10, 10, 100_000)
+    return lambda: App.continuity(func, x)
+
+
+@benchmark()
+def classify_conics():
+    coeffs = App.np.random.default_rng(0).normal(size=(100_000, 6))
+    return lambda: App.classify_conics(coeffs)
+
+
+@benchmark(repeat=10)
+def conic_curves():
+    # Mixed nondegenerate conics plus degenerate ones on the shared grid
+    coeffs = App.np.random.default_rng(0).normal(size=(1_000, 6))
+    lines = App.np.array([[1, 0, -1, 0, 0, 0], [1, 0, 0, 0, 0, -4], [1, -2, 1, 0, 0, 0]] * 20, dtype=float)
+    coeffs = App.np.concatenate([coeffs, lines])
+    return lambda: App.conic_curves(coeffs)
+
+
+@benchmark()
+def content_search():
+    # An in-memory store so the timing does not depend on a built file
+    store = App.ContentStore(App.build_content_store(App.CONTENT_SOURCE))
+    queries = ["reference angle", "period", "sine cosine", "radian", "amplitude phase shift",
+               "unit circle", "tangent", "arc length", "quadrant", "inverse"] * 10
+
+    def run():
+        for query in queries:
+            store.search(query)
+    return run
+
+
+@benchmark()
+def adaptive_sample_sin():
+    func = App.make_trig_function("sin", 2, 3, 1, 0)[0]
+
+    def run():
+        for _ in range(100):
+            App.adaptive_sample(func)
+    return run
+
+
+@benchmark()
+def adaptive_sample_tan():
+    func, _, _, params = App.make_trig_function("tan", 1, 2, 0.5, 0)
+    poles = App.tan_poles(*params[:3], (-2 * math.pi, 2 * math.pi))
+
+    def run():
+        for _ in range(100):
+            App.adaptive_sample(func, poles=poles, clip=10.0)
+    return run
+
+
+@benchmark(repeat=10)
+def plot_trig_function():
+    guide = App.PrecalculusGuide()
+    args = App.make_trig_function("tan", 1, 2, 0.5, 0)
+
+    def run():
+        guide.plot_trig_function(*args)
+        App.plt.gcf().canvas.draw()
+        App.plt.close("all")
+    return run
+
+
+@benchmark(repeat=10)
+def render_trig_graph():
+    # A fresh memory-only cache per call measures rendering, not cache hits
+    return lambda: App.render_trig_graph("sin", 2, 3, 1, 0, cache=App.PlotCache())
+
+
+@benchmark(repeat=10)
+def plot_unit_circle():
+    guide = App.PrecalculusGuide()
+
+    def run():
+        guide.plot_unit_circle()
+        App.plt.gcf().canvas.draw()
+        App.plt.close("all")
+    return run
+
+
+@benchmark(repeat=5)
+def cold_import():
+    # Time loading App.py from bytecode, as installed copies do, not compiling
+    # it (which PYTHONDONTWRITEBYTECODE would otherwise force on every run).
+    # The warm-up run writes the bytecode under a temporary prefix, so the
+    # source tree gets no __pycache__.
+    prefix = tempfile.mkdtemp(prefix="precalculus-bench-")
+    atexit.register(shutil.rmtree, prefix, ignore_errors=True)
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=prefix)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    command = [sys.executable, "-c", "import App"]
+    return lambda: subprocess.run(command, cwd=ROOT, env=env, check=True)
+
+
+def run_benchmark(name):
+    setup, repeat = BENCHMARKS[name]
+    func = setup()
+    func()  # warm up imports and caches outside the measurement
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"median": statistics.median(times), "min": min(times), "repeat": repeat}
+
+
+def load_baseline(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"benchmarks": {}}
+
+
+def compare(results, baseline):
+    """Mark each result with its baseline ratio; return the names that regressed."""
+    regressions = []
+    for name, result in results.items():
+        entry = baseline["benchmarks"].get(name)
+        if entry is None or name == REFERENCE:
+            continue
+        threshold = entry.get("threshold", DEFAULT_THRESHOLD)
+        result["baseline"] = entry["relative"]
+        result["ratio"] = result["relative"] / entry["relative"]
+        result["regressed"] = result["ratio"] > threshold
+        if result["regressed"]:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Precalculus Guide")
+    parser.add_argument("-k", metavar="TEXT", help="only run benchmarks whose name contains TEXT")
+    parser.add_argument("--baseline", metavar="FILE", default=BASELINE,
+                        help="baseline JSON to compare with or update")
+    parser.add_argument("--output", metavar="FILE", help="also write the JSON report to FILE")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store these relative times as the new baseline, keeping existing thresholds")
+    args = parser.parse_args(argv)
+
+    # The reference always runs first, whatever -k selects
+    names = [REFERENCE] + [name for name in BENCHMARKS
+                           if name != REFERENCE and (not args.k or args.k in name)]
+    results = {}
+    for name in names:
+        results[name] = result = run_benchmark(name)
+        result["relative"] = result["median"] / results[REFERENCE]["median"]
+        print(f"{name:<28}{result['median'] * 1000:10.2f} ms{result['relative']:10.3f} x reference",
+              file=sys.stderr)
+
+    baseline = load_baseline(args.baseline)
+    if args.update_baseline:
+        for name, result in results.items():
+            if name != REFERENCE:
+                entry = baseline["benchmarks"].setdefault(name, {"threshold": DEFAULT_THRESHOLD})
+                entry.pop("median", None)
+                entry["relative"] = round(result["relative"], 4)
+        baseline.pop("machine", None)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        regressions = []
+    else:
+        regressions = compare(results, baseline)
+
+    report = json.dumps({"results": results, "regressions": regressions}, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+    if regressions:
+        print(f"Slower than baseline: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
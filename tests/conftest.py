@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Must be set before matplotlib is imported anywhere
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
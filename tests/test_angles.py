@@ -0,0 +1,205 @@
+import io
+import math
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import App
+
+
+@pytest.mark.parametrize("text, radians", [
+    ("45", math.pi / 4),
+    ("45°", math.pi / 4),
+    ("3π/2", 3 * math.pi / 2),
+    ("2*pi/3", 2 * math.pi / 3),
+    ("-5pi/6", -5 * math.pi / 6),
+    ("2(pi)", 2 * math.pi),
+    ("1 rad", 1.0),
+    ("1e3", math.radians(1000)),
+    ("2.5E-4 rad", 2.5e-4),
+    ("1.e2 deg", math.radians(100)),
+    ("1e3pi", 1000 * math.pi),
+])
+def test_compile_angle(text, radians):
+    assert App.compile_angle(text)() == pytest.approx(radians)
+
+
+def test_variables():
+    angle = App.compile_angle("pi/4 + n*pi")
+    assert angle.variables == {"n"}
+    np.testing.assert_allclose(angle(n=np.arange(3)), np.pi / 4 + np.arange(3) * np.pi)
+    with pytest.raises(ValueError, match="Missing value for n"):
+        angle()
+
+
+@pytest.mark.parametrize("text", [
+    "__import__('os').getpid()",
+    "().__class__",
+    "pi.real",
+    "[1, 2]",
+    "lambda: 1",
+    "'45'",
+    "sin(30)",
+    "",
+    "3 +",
+])
+def test_compile_angle_rejects_anything_but_arithmetic(text):
+    with pytest.raises(ValueError):
+        App.compile_angle(text)()
+
+
+def test_units():
+    assert App.parse_angle(0.25, "pi") == pytest.approx(math.pi / 4)
+    assert App.parse_angle("0.25", "pi") == pytest.approx(math.pi / 4)
+    assert App.parse_angle(90) == pytest.approx(math.pi / 2)
+    assert App.parse_angle(2, "radians") == 2
+    for value in (90, "90"):
+        with pytest.raises(ValueError, match="Unknown angle unit: grad"):
+            App.parse_angle(value, "grad")
+
+
+def test_reduce_keeps_large_degree_angles_exact():
+    assert App.parse_angle(1e20, reduce=True) == pytest.approx(math.radians(280))
+    assert App.parse_angle("1e20", reduce=True) == pytest.approx(math.radians(280))
+    assert App.parse_angle(-90, reduce=True) == pytest.approx(math.radians(270))
+    assert App.parse_angle(450) == pytest.approx(math.radians(450))
+    np.testing.assert_allclose(App.parse_angles([1e20, "3pi"], reduce=True), [math.radians(280), 3 * math.pi])
+
+
+def test_convert_angles_scalar_matches_arrays():
+    for value, unit in ((45, "degrees"), (1.5, "pi"), (-2.0, "radians")):
+        scalar, array = App.convert_angles(value, unit), App.convert_angles([value], unit)
+        assert scalar["degrees"] == pytest.approx(array["degrees"][0])
+        assert scalar["radians"] == pytest.approx(array["radians"][0])
+        assert scalar["pi"] == array["pi"][0]
+    with pytest.raises(ValueError, match="Unknown angle unit"):
+        App.convert_angles(1, "grad")
+
+
+def test_angle_measure_topic_does_not_import_numpy():
+    script = """
+import builtins, sys
+import App
+answers = iter(["1", "45", ""])
+builtins.input = lambda *args: next(answers)
+App.PrecalculusGuide().angle_measure()
+print(sorted(m for m in ("numpy", "matplotlib", "sympy") if m in sys.modules))
+"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, "-c", script], cwd=root, capture_output=True, text=True,
+                            check=True).stdout
+    assert "45.0° = 0.785398 radians = π/4" in output
+    assert output.splitlines()[-1] == "[]"
+
+
+def test_solve_quadratic_in_sine():
+    roots = App.solve_trig_equation("2sin²θ - sin θ - 1 = 0")
+    assert roots == pytest.approx([math.pi / 2, 7 * math.pi / 6, 11 * math.pi / 6])
+    solutions = App.general_solution("2sin²θ - sin θ - 1 = 0")
+    pi = App.sp.pi
+    assert all(solutions.contains(value) for value in (pi / 2 + 2 * pi, -5 * pi / 6, 11 * pi / 6 - 4 * pi))
+    assert not solutions.contains(pi / 6)
+
+
+def test_solve_double_angle_equation():
+    roots = App.solve_trig_equation("sin 2θ = cos θ")
+    assert roots == pytest.approx([math.pi / 6, math.pi / 2, 5 * math.pi / 6, 3 * math.pi / 2])
+    assert App.solve_trig_equation("sin 2θ = cos θ", interval=(0, math.pi / 2), closed=True) == \
+        pytest.approx([math.pi / 6, math.pi / 2])
+
+
+def test_solve_rejects_poles():
+    # tan changes sign at π/2 and 3π/2 without reaching 0
+    assert App.solve_trig_equation("tan x = 0") == pytest.approx([0, math.pi])
+    assert App.solve_trig_equation("tan x + cot x = 0").size == 0
+    assert App.solve_trig_equation("1/sin x = 0").size == 0
+    assert App.general_solution("1/sin x = 0") == App.sp.EmptySet
+
+
+def test_fast_kernels_stay_within_the_error_bound():
+    rng = np.random.default_rng(0)
+    # The bound holds for |x| < 1e8 radians
+    for angles in (rng.uniform(-1e6, 1e6, 1_000_000), rng.uniform(-10, 10, 100_000)):
+        assert np.abs(App.fast_sin(angles) - np.sin(angles)).max() <= App.FAST_TRIG_MAX_ERROR
+        assert np.abs(App.fast_cos(angles) - np.cos(angles)).max() <= App.FAST_TRIG_MAX_ERROR
+    degrees = rng.uniform(-1e6, 1e6, 100_000)
+    exact = np.sin(np.radians(np.remainder(degrees, 360)))
+    assert np.abs(App.fast_sin(degrees, degrees=True) - exact).max() <= App.FAST_TRIG_MAX_ERROR
+
+
+def test_evaluate_trig_fast():
+    angles = np.linspace(-720, 720, 5761)
+    fast = App.evaluate_trig(angles, degrees=True, fast=True)
+    exact = App.evaluate_trig(angles, degrees=True)
+    for name in App.TRIG_FUNCTION_NAMES:
+        # The same angles (multiples of 90°) are undefined either way
+        np.testing.assert_array_equal(np.isnan(fast[name]), np.isnan(exact[name]))
+    for name in ("sin", "cos"):
+        assert np.abs(fast[name] - exact[name]).max() <= App.FAST_TRIG_MAX_ERROR
+    defined = ~np.isnan(exact["tan"]) & (np.abs(exact["cos"]) > 0.01)
+    np.testing.assert_allclose(fast["tan"][defined], exact["tan"][defined], rtol=1e-4, atol=1e-6)
+
+
+def test_format_radians_array_matches_format_radians():
+    guide = App.PrecalculusGuide()
+    grid = np.concatenate([
+        np.arange(-720, 721, 15) * math.pi / 180,       # negatives, zero and π multiples
+        [-0.0, 1.0, -2.5, math.e, 1e-9, 100.0],          # not multiples of π
+        [7 * math.pi / 5, -math.pi / 7, 3 * math.pi / 100, np.nan, np.inf],
+    ])
+    labels = App.format_radians_array(grid)
+    assert labels.tolist() == [guide.format_radians(x) for x in grid]
+    assert App.format_radians_array(grid, 4).tolist() == [guide.format_radians(x, 4) for x in grid]
+    # Shapes are kept, and repeated angles share a label
+    square = App.format_radians_array(grid[:16].reshape(4, 4))
+    assert square.shape == (4, 4) and square.ravel().tolist() == labels[:16].tolist()
+
+
+def test_pi_fractions():
+    num, den, exact = App.pi_fractions(np.array([math.pi / 2, -3 * math.pi / 4, 0.0, 1.0, np.nan]))
+    assert num[:3].tolist() == [1, -3, 0] and den[:3].tolist() == [2, 4, 1]
+    assert exact.tolist() == [True, True, True, False, False]
+
+
+def test_evaluate_trig_undefined_masks():
+    degrees = np.array([0, 90, 180, 270, -90, 450, 1e6 * 360, 30])
+    values = App.evaluate_trig(degrees, degrees=True)
+    undefined = {name: np.isnan(values[name]).tolist() for name in App.TRIG_FUNCTION_NAMES}
+    cos_pole = [False, True, False, True, True, True, False, False]
+    sin_pole = [True, False, True, False, False, False, True, False]
+    assert undefined == {"sin": [False] * 8, "cos": [False] * 8,
+                         "tan": cos_pole, "sec": cos_pole, "csc": sin_pole, "cot": sin_pole}
+    # cot is exactly zero where cos is, rather than a tiny cos/sin
+    assert values["cot"][[1, 3]].tolist() == [0.0, 0.0]
+    assert values["tan"][7] == pytest.approx(1 / math.sqrt(3))
+    radians = App.evaluate_trig([0.0, math.pi / 2, math.pi])
+    assert np.isnan(radians["tan"]).tolist() == [False, True, False]
+    assert np.isnan(radians["csc"]).tolist() == [True, False, True]
+
+
+def test_iter_angle_chunks_from_streams(tmp_path, monkeypatch):
+    text = "0, 30 45\n60,90\n\n120 135,150\n180\n"
+    expected = [0, 30, 45, 60, 90, 120, 135, 150, 180]
+    chunks = list(App.iter_angle_chunks(io.StringIO(text), chunk_size=3))
+    # Chunks fill up a line at a time, so they can run past chunk_size
+    assert [chunk.tolist() for chunk in chunks] == [[0, 30, 45], [60, 90, 120, 135, 150], [180]]
+    path = tmp_path / "angles.txt"
+    path.write_text(text, encoding="utf-8")
+    assert np.concatenate(list(App.iter_angle_chunks(path, 4))).tolist() == expected
+    monkeypatch.setattr("sys.stdin", io.StringIO(text))
+    assert np.concatenate(list(App.iter_angle_chunks("-"))).tolist() == expected
+    assert list(App.iter_angle_chunks(io.StringIO("\n \n"))) == []
+
+
+def test_batch_trig_functions_streams_match_arrays():
+    angles = np.arange(-720, 721, 15)
+    stream = io.StringIO("\n".join(map(str, angles)))
+    pairs = list(App.batch_trig_functions(stream, chunk_size=10))
+    assert len(pairs) == 10
+    (whole, expected), = App.batch_trig_functions(angles)
+    assert np.concatenate([chunk for chunk, _ in pairs]).tolist() == whole.tolist()
+    for name in App.TRIG_FUNCTION_NAMES:
+        np.testing.assert_array_equal(np.concatenate([values[name] for _, values in pairs]), expected[name])
@@ -0,0 +1,191 @@
+import io
+import json
+import math
+
+import numpy as np
+import pytest
+
+import App
+
+
+def run(*jobs):
+    return list(App.run_jobs(jobs))
+
+
+def result(job):
+    record, = run(job)
+    assert record["ok"], record.get("error")
+    return record["result"]
+
+
+def error(job):
+    record, = run(job)
+    assert not record["ok"]
+    return record["error"]
+
+
+def test_convert():
+    converted = result({"op": "convert", "value": 0.75, "unit": "pi"})
+    assert converted["degrees"] == pytest.approx(135)
+    assert converted["pi"] == "3π/4"
+
+
+def test_trig_units():
+    assert result({"op": "trig", "angle": 30})["sin"] == pytest.approx(0.5)
+    assert result({"op": "trig", "angle": math.pi / 6, "unit": "radians"})["sin"] == pytest.approx(0.5)
+    assert result({"op": "trig", "angle": 1 / 6, "unit": "pi"})["sin"] == pytest.approx(0.5)
+    assert result({"op": "trig", "angle": "90"})["tan"] is None
+
+
+def test_trig_scientific_notation():
+    # "1e3" used to be rewritten to "1*e3" by the implicit multiplication rule
+    assert result({"op": "trig", "angle": "1e3"})["sin"] == pytest.approx(math.sin(math.radians(1000)))
+
+
+def test_trig_reduces_degrees_before_converting():
+    assert result({"op": "trig", "angle": 1e20})["sin"] == pytest.approx(math.sin(math.radians(280)))
+
+
+@pytest.mark.parametrize("unit", ["pie", "Degrees", "grad"])
+def test_trig_rejects_unknown_units(unit):
+    assert "Unknown angle unit" in error({"op": "trig", "angle": 30, "unit": unit})
+    assert "Unknown angle unit" in error({"op": "trig", "angle": "30", "unit": unit})
+
+
+def test_inverse_trig():
+    half, two = run({"op": "inverse_trig", "value": 0.5}, {"op": "inverse_trig", "value": "2"})
+    assert half["result"]["arcsin"] == pytest.approx(math.pi / 6)
+    assert half["result"]["arccot"] == pytest.approx(math.atan(2))
+    # Outside each function's domain the answer is null, not an error
+    assert half["result"]["arcsec"] is None and two["result"]["arcsin"] is None
+    assert two["result"]["arcsec"] == pytest.approx(math.pi / 3)
+
+
+def test_triangle():
+    solved = result({"op": "triangle", "a": 3, "b": 4, "c": 5})
+    assert solved["solutions"][0]["C"] == pytest.approx(90)
+    assert "Unknown angle unit" in error({"op": "triangle", "a": 3, "b": 4, "C": 1, "unit": "rad"})
+
+
+def test_failures_are_isolated_per_job():
+    records = run({"op": "trig", "angle": 30}, {"op": "trig", "angle": "3 +"}, {"op": "nope"})
+    assert [r["ok"] for r in records] == [True, False, False]
+    assert records[2]["error"] == "ValueError: Unknown op: nope"
+
+
+def test_retry_skips_jobs_that_already_finished(monkeypatch):
+    calls = []
+
+    def handler(jobs):
+        for job in jobs:
+            calls.append(job["id"])
+            if job.get("fail"):
+                raise ValueError("boom")
+            yield job["id"]
+
+    monkeypatch.setitem(App.BATCH_HANDLERS, "side_effect", handler)
+    records = run(*({"op": "side_effect", "id": k, "fail": k == 1} for k in range(3)))
+    assert [r["ok"] for r in records] == [True, False, True]
+    assert calls == [0, 1, 1, 2]
+
+
+def test_graph_jobs_render_once(tmp_path, monkeypatch):
+    renders = []
+    render = App.render_trig_graph
+    monkeypatch.setattr(App, "render_trig_graph", lambda *a, **k: renders.append(a) or render(*a, **k))
+    jobs = [{"op": "graph", "func": "sin", "output": str(tmp_path / "sin.png")},
+            {"op": "graph", "func": "sec", "output": str(tmp_path / "sec.png")}]
+    records = run(*jobs)
+    assert [r["ok"] for r in records] == [True, False]
+    assert [args[0] for args in renders].count("sin") == 1
+    assert (tmp_path / "sin.png").read_bytes().startswith(b"\x89PNG")
+
+
+def test_batch_from_stdin_leaves_stdin_open(monkeypatch, capsys):
+    stdin = io.StringIO('{"op": "trig", "angle": 45}\n')
+    monkeypatch.setattr("sys.stdin", stdin)
+    App.main(["--batch", "-"])
+    assert not stdin.closed
+    record = json.loads(capsys.readouterr().out)
+    assert record["result"]["tan"] == pytest.approx(1)
+
+
+def test_unit_circle():
+    rows = result({"op": "unit_circle", "divisions": 4})["rows"]
+    assert [row["degrees"] for row in rows] == ["0°", "90°", "180°", "270°", "360°"]
+    assert rows[1]["coordinates"] == "(0, 1)"
+
+
+@pytest.mark.parametrize("divisions", [24, 24.0, "24", "24.0", [24]])
+def test_unit_circle_division_counts(divisions):
+    assert len(result({"op": "unit_circle", "divisions": divisions})["rows"]) == 25
+
+
+def test_unit_circle_default_divisions():
+    assert result({"op": "unit_circle", "divisions": "12, 8"}) == result({"op": "unit_circle"})
+
+
+@pytest.mark.parametrize("divisions", [0, -4, 2.5, "0", "nan", [12, 0]])
+def test_unit_circle_rejects_bad_division_counts(divisions):
+    assert error({"op": "unit_circle", "divisions": divisions}).startswith("ValueError: Divisions must be")
+
+
+def test_animation(tmp_path):
+    sweep, circle = run(
+        {"op": "animation", "func": "cos", "sweep": "B", "frames": 3, "output": str(tmp_path / "b.gif")},
+        {"op": "animation", "plot": "unit_circle", "frames": 3, "output": str(tmp_path / "c.gif")})
+    for record, name in ((sweep, "b.gif"), (circle, "c.gif")):
+        assert record["result"]["frames"] == 3
+        assert record["result"]["bytes"] == (tmp_path / name).stat().st_size
+        assert (tmp_path / name).read_bytes().startswith(b"GIF")
+
+
+def test_sequence():
+    sums = result({"op": "sequence", "kind": "geometric", "first": 1, "step": 2, "n": [1, 2, 10]})
+    assert sums == {"n": [1.0, 2.0, 10.0], "term": [1.0, 2.0, 512.0], "partial_sum": [1.0, 3.0, 1023.0]}
+
+
+def test_sequence_with_scalar_n():
+    assert result({"op": "sequence", "step": 2}) == {"n": 1.0, "term": 1.0, "partial_sum": 1.0}
+    assert result({"op": "sequence", "first": 1, "step": 2, "n": 10}) == {"n": 10.0, "term": 19.0, "partial_sum": 100.0}
+
+
+def test_json_values_null_nan_at_any_depth():
+    assert App._json_value(np.array(np.nan)) is None
+    assert App._json_value(np.array([[1.0, np.nan], [np.inf, 2.0]])) == [[1.0, None], [None, 2.0]]
+
+
+def test_partial_sums_stay_exact():
+    from fractions import Fraction
+    assert App.partial_sum("arithmetic", 1, 2, 10) == 100
+    assert isinstance(App.partial_sum("arithmetic", 1, 2, 10), int)
+    assert App.partial_sum("geometric", 3, -2, 5) == 33
+    assert isinstance(App.partial_sum("geometric", 3, -2, 5), int)
+    assert App.partial_sum("arithmetic", Fraction(1, 2), 1, 3) == Fraction(9, 2)
+    assert App.partial_sum("arithmetic", 0.5, 0, 1) == 0.5
+
+
+def test_binomial():
+    assert result({"op": "binomial", "n": 3, "a": 1, "b": 2})["coefficients"] == [1, 6, 12, 8]
+    # CSV and query strings arrive as text
+    assert result({"op": "binomial", "n": "3", "a": "1", "b": "2"})["coefficients"] == [1, 6, 12, 8]
+
+
+@pytest.mark.parametrize("n", [-1, App.BINOMIAL_MAX_POWER + 1, 10**9])
+def test_binomial_rejects_out_of_range_powers(n):
+    assert error({"op": "binomial", "n": n}).startswith("ValueError: n must be between 0 and")
+
+
+def test_polynomial():
+    quadratic, linear = run({"op": "polynomial", "coefficients": [1, 0, -4], "x": [0, 2, 3]},
+                            {"op": "polynomial", "coefficients": [0, 1, -3]})
+    assert quadratic["result"]["degree"] == 2
+    assert sorted(root for root, _ in quadratic["result"]["roots"]) == pytest.approx([-2, 2])
+    assert quadratic["result"]["y"] == pytest.approx([-4, 0, 5])
+    # Leading zeros are trimmed before the degree is counted
+    assert linear["result"] == {"degree": 1, "roots": [[pytest.approx(3), 0.0]]}
+
+
+def test_polynomial_at_a_scalar_x():
+    assert result({"op": "polynomial", "coefficients": [1, 0, -1], "x": 2})["y"] == 3.0
+    assert result({"op": "polynomial", "coefficients": [1, 0, -1], "x": "-2"})["y"] == 3.0
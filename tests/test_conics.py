@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+import App
+from test_expressions import INJECTIONS, no_process_access  # noqa: F401
+
+KINDS = {
+    "circle": [1, 0, 1, 0, 0, -1],
+    "ellipse": [1, 0, 4, 0, 0, -4],
+    "parabola": [1, 0, 0, 0, -1, 0],
+    "hyperbola": [1, 0, -1, 0, 0, -1],
+    "intersecting lines": [1, 0, -1, 0, 0, 0],
+    "parallel lines": [1, 0, 0, 0, 0, -4],
+    "line": [1, -2, 1, 0, 0, 0],
+    "point": [1, 0, 1, 0, 0, 0],
+    "empty": [1, 0, 1, 0, 0, 1],
+}
+
+
+def test_classify_conics():
+    info = App.classify_conics(np.array(list(KINDS.values()), dtype=float))
+    assert info["kind"].tolist() == list(KINDS)
+
+
+def test_classify_conics_geometry():
+    # (x - 1)²/9 + (y + 2)²/4 = 1 and the rectangular hyperbola x² - y² = 1
+    info = App.classify_conics(np.array([[4, 0, 9, -8, 36, 4], [1, 0, -1, 0, 0, -1]], dtype=float))
+    assert info["center"][0] == pytest.approx([1, -2])
+    assert info["semi_axes"][0] == pytest.approx([3, 2])
+    assert info["eccentricity"] == pytest.approx([np.sqrt(5) / 3, np.sqrt(2)])
+
+
+def test_parse_conic():
+    assert App.parse_conic("x^2/9 + y^2/4 = 1") == pytest.approx((1 / 9, 0, 1 / 4, 0, 0, -1))
+    assert App.parse_conic("y = x²") == (-1, 0, 0, 0, 1, 0)
+    with pytest.raises(ValueError):
+        App.parse_conic("x^3 + y = 0")
+    with pytest.raises(ValueError):
+        App.parse_conic("x^2 + z^2 = 1")
+
+
+def test_conic_jobs():
+    circle, = App.run_jobs([{"op": "conic", "equation": "(x-1)^2 + (y+2)^2 = 4"}])
+    assert circle["result"]["kind"] == "circle"
+    assert circle["result"]["center"] == pytest.approx([1, -2])
+    hyperbola, = App.run_jobs([{"op": "conic", "coefficients": KINDS["hyperbola"]}])
+    assert hyperbola["result"]["kind"] == "hyperbola"
+
+
+@pytest.mark.parametrize("text", INJECTIONS)
+def test_conic_jobs_reject_code(text, no_process_access):
+    record, = App.run_jobs([{"op": "conic", "equation": f"{text} = 1"}])
+    assert not record["ok"]
+
+
+def test_conic_equations_bound_powers():
+    with pytest.raises(ValueError, match="Exponents must be at most"):
+        App.parse_conic("x^2 + y^2 = 9^9^9")
+    record, = App.run_jobs([{"op": "conic", "equation": "x^2+y^2=9^9^9"}])
+    assert "Exponents must be at most" in record["error"]
+    # Expanded before the degree check, but bounded so it stays quick
+    with pytest.raises(ValueError, match="degree at most 2"):
+        App.parse_conic("(x + y + 1)^100 = 0")
+    with pytest.raises(ValueError, match="degree at most 2"):
+        App.parse_conic("(x + y + 1)^60 (x - y)^60 = 1")
+    assert App.parse_conic("(x + 1)^3 - x^3 = y") == (3, 0, 0, 3, -1, 1)
@@ -0,0 +1,103 @@
+import pytest
+
+import App
+
+GUIDE = """# Precalculus Guide
+
+An overview of the course.
+
+## Getting Started
+
+Read the lessons in order.
+
+### 04-trigonometry/01-angle-measure.md
+
+```markdown
+# Angle Measure
+
+Angles are measured in degrees or radians.
+
+## Radians
+
+One radian subtends an arc equal to the radius. A full turn is 2π radians.
+
+## Arc Length
+
+The arc length is s = rθ with θ in radians.
+```
+"""
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "guide.md"
+    path.write_text(GUIDE, encoding="utf-8")
+    return path
+
+
+def test_round_trip(source, tmp_path):
+    path = tmp_path / "guide.bin"
+    blob = App.build_content_store(str(source), str(path))
+    assert path.read_bytes() == blob
+    stores = App.ContentStore(blob), App.ContentStore.open(str(path))
+    for store in stores:
+        assert store.keys == ["overview", "getting-started", "angle-measure",
+                              "angle-measure/radians", "angle-measure/arc-length"]
+        assert "angle-measure/radians" in store
+        assert "Read the lessons in order." in store.section("getting-started")
+        assert store.section("angle-measure/arc-length").startswith("\nArc Length:")
+    # A lesson is its intro followed by all of its sections
+    lesson = stores[1].lesson("angle-measure")
+    assert lesson.startswith("=== ANGLE MEASURE ===")
+    assert lesson.endswith(stores[1].section("angle-measure/arc-length"))
+    with pytest.raises(KeyError):
+        stores[1].section("missing")
+
+
+def test_rejects_other_files():
+    with pytest.raises(ValueError):
+        App.ContentStore(b"not a store at all")
+
+
+def test_search(source):
+    store = App.ContentStore(App.build_content_store(str(source)))
+    assert [key for key, _, _ in store.search("radians")][:2] == ["angle-measure/radians", "angle-measure"]
+    assert [key for key, _, _ in store.search("arc radius")] == ["angle-measure/radians"]
+    assert store.search("Arc LENGTH")[0][:2] == ("angle-measure/arc-length", "Arc Length")
+    assert store.search("radians hyperbola") == []
+    assert len(store.search("radians", limit=1)) == 1
+
+
+def test_rebuilds_when_stale(source, tmp_path):
+    path = str(tmp_path / "guide.bin")
+    store = App.get_content_store(path, str(source))
+    assert "angle-measure/radians" in store
+    assert App.get_content_store(path, str(source)).source_digest == store.source_digest
+
+    source.write_text(GUIDE.replace("## Radians", "## Degrees"), encoding="utf-8")
+    store = App.get_content_store(path, str(source))
+    assert "angle-measure/degrees" in store
+    assert "angle-measure/radians" not in store
+
+
+def test_store_path_from_environment(source, tmp_path, monkeypatch):
+    path = tmp_path / "elsewhere.bin"
+    assert App.content_store_path(str(source)) == str(tmp_path / "precalculus-content.bin")
+    monkeypatch.setenv("PRECAL_CONTENT_STORE", str(path))
+    assert App.content_store_path(str(source)) == str(path)
+    assert "overview" in App.get_content_store(source=str(source))
+    assert path.exists()
+
+
+@pytest.mark.parametrize("topic, key", [
+    ("inverse_trig", "inverse-trig-functions"),
+    ("trig_identities", "trigonometric-identities"),
+    ("solving_trig_equations", "solving-trig-equations"),
+    ("law_sines_cosines", "law-of-sines-cosines"),
+])
+def test_topics_print_their_lessons(topic, key, monkeypatch, capsys):
+    monkeypatch.setattr("builtins.input", lambda *args: "")
+    guide = App.PrecalculusGuide()
+    monkeypatch.setattr(guide, "clear_screen", lambda: None)
+    getattr(guide, topic)()
+    assert capsys.readouterr().out.startswith(App.get_content_store().lesson(key))
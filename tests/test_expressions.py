@@ -0,0 +1,114 @@
+import math
+import os
+
+import numpy as np
+import pytest
+
+import App
+
+INJECTIONS = [
+    "__import__('os').getpid()",
+    "().__class__.__bases__",
+    "x.__class__",
+    "eval('1')",
+    "[x for x in (1,)]",
+    "lambda: 1",
+    "x if x else 1",
+    "x; 1",
+    "1 # comment",
+    "x @ x",
+    "{x: 1}",
+]
+
+
+@pytest.fixture
+def no_process_access(monkeypatch):
+    """Fail the test if an expression manages to call into os."""
+    def forbidden(*args):
+        raise AssertionError("expression reached os")
+    monkeypatch.setattr(os, "getpid", forbidden)
+    monkeypatch.setattr(os, "system", forbidden)
+
+
+@pytest.mark.parametrize("text", INJECTIONS)
+def test_parse_sympy_rejects_code(text, no_process_access):
+    with pytest.raises(ValueError):
+        App._parse_sympy(text)
+
+
+def test_parse_sympy_sees_no_builtins(no_process_access):
+    # In parse_expr's default namespace these are the real builtins, and
+    # eval(chr(95) + ...) spells out any code without a single underscore
+    for text in ("eval(chr(95))", "open(x)", "exec(x)"):
+        assert isinstance(App._parse_sympy(text), App.sp.Basic)
+
+
+def test_parse_sympy_math():
+    assert App._parse_sympy("abs(-2) + max(1, 2) + sqrt(4) + E^0") == 7
+    assert App._parse_sympy("2x^2 + 3x") == App._parse_sympy("2*x**2 + 3*x")
+    assert float(App._parse_sympy("1e3")) == 1000
+
+
+@pytest.mark.parametrize("text", ["9^9^9", "x + 2^-9^9", "((x*10^100)^100)^100", "x^1e300", "Pow(9, 9)"])
+def test_parse_sympy_bounds_powers(text):
+    with pytest.raises(ValueError):
+        App._parse_sympy(text)
+
+
+def test_parse_sympy_allows_ordinary_powers():
+    assert App._parse_sympy("(2^100)^100") == 2 ** 10000
+    assert App._parse_sympy("(x+1)^100") == App._parse_sympy("x + 1") ** 100
+    assert App._parse_sympy("sqrt(2)^4 + 2^-2") == App.sp.Rational(17, 4)
+
+
+def test_parse_rational():
+    f = App.parse_rational("(x^2 - 1)/(x^2 - 4)")
+    assert str(f) == "(x² - 1)/(x² - 4)"
+    assert sorted(f.vertical_asymptotes.tolist()) == pytest.approx([-2, 2])
+    assert f.horizontal_asymptote == pytest.approx(1)
+    assert App.partial_fractions("1/(x^2 - 1)") == "-1/(2*(x + 1)) + 1/(2*(x - 1))"
+
+
+@pytest.mark.parametrize("text", INJECTIONS)
+def test_rational_jobs_reject_code(text, no_process_access):
+    record, = App.run_jobs([{"op": "rational", "expression": text}])
+    assert not record["ok"]
+
+
+def test_parse_trig_expression():
+    theta = App.sp.Symbol("theta", real=True)
+    assert App.parse_trig_expression("sin²θ + cos²θ") == App.sp.sin(theta) ** 2 + App.sp.cos(theta) ** 2
+    assert App.verify_identity("sin(2x)", "2sin x cos x")["identity"]
+    assert not App.verify_identity("sin(2x)", "2sin x")["identity"]
+
+
+def test_derivative_and_limit_jobs():
+    slope, limit = App.run_jobs([
+        {"op": "derivative", "expression": "x sin x", "x": [0, math.pi]},
+        {"op": "limit", "expression": "sin(x)/x", "x": 0},
+    ])
+    assert slope["result"]["derivative"] == pytest.approx([0, -math.pi])
+    assert limit["result"]["kind"] == ["removable"]
+    assert limit["result"]["limit"] == pytest.approx([1])
+
+
+@pytest.mark.parametrize("op", ["derivative", "limit"])
+@pytest.mark.parametrize("text", INJECTIONS)
+def test_function_jobs_reject_code(op, text, no_process_access):
+    record, = App.run_jobs([{"op": op, "expression": text, "x": 0}])
+    assert not record["ok"]
+
+
+@pytest.mark.parametrize("op", ["derivative", "limit"])
+def test_function_jobs_reject_huge_powers(op):
+    record, = App.run_jobs([{"op": op, "expression": "x + 9^9^9", "x": 1}])
+    assert "Exponents must be at most" in record["error"]
+
+
+def test_derivative_of_step_functions():
+    func = App.compile_function("floor(x) + ceiling(x) + x sign(x)")
+    values, slopes = App.derivative(func, [-1.5, -1, 0, 0.5, 2])
+    assert values.tolist() == [-1.5, -1, 0, 1.5, 6]
+    assert slopes[[0, 3]].tolist() == [-1, 1]
+    # No derivative where a step jumps: the integers, and 0 for sign
+    assert np.isnan(slopes[[1, 2, 4]]).all()
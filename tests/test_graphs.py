@@ -0,0 +1,56 @@
+import math
+
+import numpy as np
+
+import App
+
+
+class CountingFunction:
+    def __init__(self, func):
+        self.func = func
+        self.points = 0
+
+    def __call__(self, x):
+        self.points += np.size(x)
+        return self.func(x)
+
+
+def test_adaptive_sample_evaluates_each_point_once():
+    func = CountingFunction(np.sin)
+    x, y = App.adaptive_sample(func, num=400)
+    assert func.points == len(x) == 400
+    assert np.all(np.diff(x) >= 0)
+    np.testing.assert_allclose(y, np.sin(x))
+
+
+def test_adaptive_sample_breaks_at_poles():
+    func, _, _, params = App.make_trig_function("tan", 1, 2, 0.5, 0)
+    poles = App.tan_poles(*params[:3], (-2 * math.pi, 2 * math.pi))
+    x, y = App.adaptive_sample(func, poles=poles)
+    assert np.isnan(y[np.isin(x, poles)]).all()
+    assert len(x) == 400 + len(poles)
+
+
+def test_tangent_asymptotes_span_the_axes():
+    fig, ax = App.plt.subplots()
+    try:
+        func, title, is_tan, params = App.make_trig_function("tan", 5000, 1, 0, 0)
+        App.draw_trig_function(ax, func, title, is_tan, params)
+        lines = ax.collections[-1]
+        segments = lines.get_segments()
+        assert len(segments) == 4
+        assert all(seg[0][1] == 0 and seg[1][1] == 1 for seg in segments)
+        assert lines.get_transform() == ax.get_xaxis_transform()
+    finally:
+        App.plt.close(fig)
+
+
+def test_plot_trig_function_shows_the_figure(monkeypatch):
+    shown = []
+    monkeypatch.setattr(App.plt, "show", lambda *args, **kwargs: shown.append(App.plt.gcf()))
+    try:
+        App.PrecalculusGuide().plot_trig_function(*App.make_trig_function("sin", 1, 1, 0, 0))
+        assert len(shown) == 1
+        assert shown[0].axes[0].lines
+    finally:
+        App.plt.close("all")
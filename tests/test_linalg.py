@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+import App
+
+
+@pytest.fixture
+def stack():
+    rng = np.random.default_rng(0)
+    return rng.normal(size=(200, 4, 4)), rng.normal(size=(200, 4))
+
+
+def test_matches_numpy(stack):
+    A, b = stack
+    np.testing.assert_allclose(App.determinants(A), np.linalg.det(A))
+    np.testing.assert_allclose(App.inverses(A), np.linalg.inv(A))
+    np.testing.assert_allclose(App.solve_systems(A, b), np.linalg.solve(A, b[..., None])[..., 0])
+    assert not App.singular_matrices(A).any()
+
+
+def test_singular_matrices_give_nan_without_failing_the_stack(stack):
+    A, b = stack
+    A = A.copy()
+    A[3, 2] = 2 * A[3, 1]
+    A[7] = 0.0
+    A[9] *= 1e-100  # tiny but regular: the test is scale invariant
+    singular = App.singular_matrices(A)
+    assert singular.nonzero()[0].tolist() == [3, 7]
+    assert App.determinants(A)[[3, 7]].tolist() == [0.0, 0.0]
+    x = App.solve_systems(A, b)
+    assert np.isnan(x[singular]).all() and np.isfinite(x[~singular]).all()
+    inverse = App.inverses(A)
+    assert np.isnan(inverse[singular]).all()
+    np.testing.assert_allclose(inverse[~singular], np.linalg.inv(A[~singular]))
+
+
+def test_broadcasting():
+    A = np.array([[2.0, 0.0], [0.0, 4.0]])
+    b = np.array([[2.0, 4.0], [4.0, 8.0], [0.0, 1.0]])
+    np.testing.assert_allclose(App.solve_systems(A, b), [[1, 1], [2, 2], [0, 0.25]])
+    assert App.determinants(A) == pytest.approx(8)
+
+
+def test_one_matrix_many_right_hand_sides(monkeypatch):
+    rng = np.random.default_rng(1)
+    A, b = rng.normal(size=(5, 5)), rng.normal(size=(30, 2, 5))
+    calls = []
+    solve = np.linalg.solve
+    monkeypatch.setattr(np.linalg, "solve", lambda *args: calls.append(args) or solve(*args))
+    x = App.solve_systems(A, b)
+    assert len(calls) == 1 and x.shape == b.shape
+    np.testing.assert_allclose(np.einsum("ij,...j->...i", A, x), b)
+    assert np.isnan(App.solve_systems(np.zeros((5, 5)), b)).all()
+
+
+def test_rejects_non_square():
+    with pytest.raises(ValueError, match="square"):
+        App.determinants(np.ones((2, 3)))
+
+
+def test_matrix_jobs():
+    record, singular = App.run_jobs([
+        {"op": "matrix", "A": [[2, 1], [1, 3]], "b": [3, 5]},
+        {"op": "matrix", "A": [[1, 2], [2, 4]], "b": [1, 1]},
+    ])
+    assert record["result"]["det"] == pytest.approx(5)
+    np.testing.assert_allclose(record["result"]["x"], [0.8, 1.4])
+    np.testing.assert_allclose(record["result"]["inverse"], [[0.6, -0.2], [-0.2, 0.4]])
+    assert singular["result"] == {"det": 0.0, "singular": True, "inverse": None, "x": None}
@@ -0,0 +1,45 @@
+import sys
+
+import App
+
+# Fundamentals, a trip into the trigonometry menu and back, then a bad choice
+ROUND = ["1", "", "4", "9", "x", ""]
+
+
+def frames():
+    frame, depth = sys._getframe(1), 0
+    while frame is not None:
+        frame, depth = frame.f_back, depth + 1
+    return depth
+
+
+def session(monkeypatch, script):
+    """Run the guide on scripted input, returning the stack depth at each prompt."""
+    depths, answers = [], iter(script)
+
+    def scripted(prompt=""):
+        depths.append(frames())
+        try:
+            return next(answers)
+        except StopIteration:
+            raise EOFError from None
+
+    monkeypatch.setattr("builtins.input", scripted)
+    guide = App.PrecalculusGuide()
+    monkeypatch.setattr(guide, "clear_screen", lambda: None)
+    guide.main_menu()
+    return depths
+
+
+def test_long_sessions_keep_a_constant_stack_depth(monkeypatch, capsys):
+    rounds = 2 * sys.getrecursionlimit()
+    depths = session(monkeypatch, ROUND * rounds + ["9"])
+    assert len(depths) == len(ROUND) * rounds + 1
+    assert depths[:len(ROUND)] == depths[-len(ROUND) - 1:-1]
+    assert depths[-1] == depths[0] and len(set(depths)) == 3
+    assert capsys.readouterr().out.count("=== FUNDAMENTALS ===") == rounds
+
+
+def test_closed_input_leaves_the_menu(monkeypatch, capsys):
+    assert len(session(monkeypatch, ["4", "1"])) == 3
+    assert "=== ANGLE MEASURE ===" in capsys.readouterr().out
@@ -0,0 +1,57 @@
+import os
+
+import App
+
+
+def age(cache, key, seconds):
+    """Make key's file look last used the given number of seconds ago."""
+    path = os.path.join(cache.directory, key)
+    then = os.path.getmtime(path) - seconds
+    os.utime(path, (then, then))
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = App.PlotCache(memory_limit=30)
+    for key in "abc":
+        cache.put(key, key.encode() * 10)
+    assert cache.get("a") == b"a" * 10  # now the most recently used
+    cache.put("d", b"d" * 10)
+    assert cache.get("b") is None
+    assert [cache.get(key) is not None for key in "acd"] == [True, True, True]
+    assert (cache.hits, cache.misses) == (4, 1)
+    # Images larger than the whole tier are not kept
+    cache.put("e", b"e" * 31)
+    assert cache.get("e") is None and cache.get("d") is not None
+
+
+def test_disk_tier_reloads_in_a_new_cache(tmp_path):
+    App.PlotCache(tmp_path).put("a", b"image")
+    cache = App.PlotCache(tmp_path)
+    assert cache.get("a") == b"image"
+    assert cache.hits == 1
+    # Served from memory from now on, even if the file goes away
+    os.remove(tmp_path / "a")
+    assert cache.get("a") == b"image"
+    assert App.PlotCache(tmp_path).get("a") is None
+
+
+def test_disk_limit_is_shared_between_caches(tmp_path):
+    # Two caches on one directory stand for two render workers
+    first, second = App.PlotCache(tmp_path, disk_limit=25), App.PlotCache(tmp_path, disk_limit=25)
+    first.put("a", b"a" * 10)
+    age(first, "a", 30)
+    second.put("b", b"b" * 10)
+    age(second, "b", 20)
+    # Reading "a" from disk (here by a third worker) makes "b" the oldest file
+    assert App.PlotCache(tmp_path).get("a") is not None
+    second.put("c", b"c" * 10)
+    assert sorted(os.listdir(tmp_path)) == ["a", "c"]
+    assert first.disk_usage() == second.disk_usage() == 20
+
+
+def test_memory_only_cache_writes_nothing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = App.PlotCache()
+    cache.put("a", b"image")
+    assert cache.get("a") == b"image"
+    assert os.listdir(tmp_path) == []
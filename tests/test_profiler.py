@@ -0,0 +1,82 @@
+import json
+import re
+import tracemalloc
+
+import pytest
+
+import App
+
+
+def profiled():
+    profiler = App.Profiler()
+
+    def allocate():
+        return bytearray(1 << 20)
+
+    def outer():
+        allocate()
+        raise ValueError("boom")
+
+    allocate = profiler.wrap("allocate", allocate)
+    outer = profiler.wrap("outer", outer)
+    return profiler, allocate, outer
+
+
+@pytest.fixture
+def profiler():
+    profiler, allocate, outer = profiled()
+    with profiler:
+        allocate()
+        with pytest.raises(ValueError):
+            outer()
+    return profiler
+
+
+def test_json_report(profiler):
+    functions = json.loads(profiler.to_json())["functions"]
+    assert set(functions) == {"allocate", "outer"}
+    for stats in functions.values():
+        assert set(stats) == {"calls", "errors", "seconds", "max_seconds", "peak_bytes"}
+        assert 0 <= stats["max_seconds"] <= stats["seconds"]
+    assert functions["allocate"]["calls"] == 2 and functions["allocate"]["errors"] == 0
+    assert functions["outer"]["calls"] == 1 and functions["outer"]["errors"] == 1
+    # The nested call's megabyte counts towards the caller's peak too
+    assert functions["outer"]["peak_bytes"] >= functions["allocate"]["peak_bytes"] >= 1 << 20
+
+
+def test_prometheus_text(profiler):
+    lines = profiler.to_prometheus().splitlines()
+    assert lines[:2] == ["# HELP precalculus_function_calls_total Number of calls.",
+                         "# TYPE precalculus_function_calls_total counter"]
+    assert 'precalculus_function_calls_total{function="allocate"} 2' in lines
+    assert 'precalculus_function_errors_total{function="outer"} 1' in lines
+    sample = re.compile(r'precalculus_function_\w+\{function="\w+"\} [0-9.e+-]+')
+    assert all(line.startswith("# ") or sample.fullmatch(line) for line in lines)
+    assert len([line for line in lines if line.startswith("# TYPE")]) == 5
+
+
+def test_write_picks_the_format(profiler, tmp_path):
+    profiler.write(str(tmp_path / "stats.prom"))
+    profiler.write(str(tmp_path / "stats.json"))
+    assert (tmp_path / "stats.prom").read_text().startswith("# HELP")
+    assert "functions" in json.loads((tmp_path / "stats.json").read_text())
+
+
+def test_tracemalloc_stops_on_exit():
+    assert not tracemalloc.is_tracing()
+    profiler, allocate, _ = profiled()
+    with profiler:
+        allocate()
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+
+
+def test_tracing_started_elsewhere_keeps_running():
+    tracemalloc.start()
+    try:
+        profiler, allocate, _ = profiled()
+        with profiler:
+            allocate()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,126 @@
+import asyncio
+import time
+
+import pytest
+
+import App
+
+
+def dispatch(target, body=b"", method="GET"):
+    async def request():
+        server = App.GuideServer()
+        server.batcher = App.JobBatcher()
+        return await server.dispatch(method, target, body)
+    return asyncio.run(request())
+
+
+class Writer:
+    def __init__(self):
+        self.data = b""
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def exchange(data):
+    """Feed raw bytes to one connection; return the (status, Connection header) of each reply."""
+    async def connection():
+        server = App.GuideServer()
+        server.batcher = App.JobBatcher()
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        writer = Writer()
+        await server.handle(reader, writer)
+        return writer.data
+    replies = []
+    for reply in asyncio.run(connection()).split(b"HTTP/1.1 ")[1:]:
+        head = reply.decode("latin-1").split("\r\n\r\n")[0].split("\r\n")
+        headers = dict(line.split(": ", 1) for line in head[1:])
+        replies.append((int(head[0].split()[0]), headers["Connection"]))
+    return replies
+
+
+def test_job_batcher_answers_each_job():
+    async def submit():
+        batcher = App.JobBatcher()
+        return await asyncio.gather(*(batcher.submit({"op": "trig", "angle": a}) for a in (0, 30, "3 +")))
+
+    records = asyncio.run(submit())
+    assert [record["ok"] for record in records] == [True, True, False]
+    assert records[1]["result"]["sin"] == pytest.approx(0.5)
+
+
+def test_job_batcher_keeps_the_loop_responsive(monkeypatch):
+    def slow(jobs):
+        time.sleep(0.5)
+        return [None] * len(jobs)
+
+    monkeypatch.setitem(App.BATCH_HANDLERS, "slow", slow)
+
+    async def submit():
+        batcher = App.JobBatcher()
+        future = batcher.submit({"op": "slow"})
+        start = time.perf_counter()
+        # On the loop, the batch would hold this sleep up for the full 0.5 s
+        await asyncio.sleep(0.05)
+        waited = time.perf_counter() - start
+        assert (await future)["ok"]
+        return waited
+
+    assert asyncio.run(submit()) < 0.3
+
+
+def test_single_job_routes():
+    status, content_type, result = dispatch("/trig?angle=30")
+    assert status == 200 and result["sin"] == pytest.approx(0.5)
+    with pytest.raises(App.HTTPError) as info:
+        dispatch("/trig?angle=30&unit=grad")
+    assert info.value.status == 400
+
+
+def test_batch_route_rejects_file_writing_ops():
+    with pytest.raises(App.HTTPError, match="Unsupported op: graph"):
+        dispatch("/batch", b'[{"op": "graph", "func": "sin"}]', "POST")
+    with pytest.raises(App.HTTPError, match="cannot write"):
+        dispatch("/batch", b'{"op": "unit_circle", "output": "/tmp/x.png"}', "POST")
+
+
+def test_content_routes(monkeypatch, tmp_path):
+    source = tmp_path / "guide.md"
+    source.write_text("# Guide\n\nStart here.\n\n## Radians\n\nA full turn is 2π radians.\n", encoding="utf-8")
+    monkeypatch.setattr(App, "_content_store", App.ContentStore(App.build_content_store(str(source))))
+
+    status, _, sections = dispatch("/content")
+    assert sections == [{"key": "overview", "title": "Guide"}, {"key": "radians", "title": "Radians"}]
+    status, content_type, text = dispatch("/content?key=radians")
+    assert content_type.startswith("text/plain") and b"2\xcf\x80 radians" in text
+    with pytest.raises(App.HTTPError) as info:
+        dispatch("/content?key=missing")
+    assert info.value.status == 404
+    status, _, hits = dispatch("/search?q=full+turn")
+    assert [hit["key"] for hit in hits] == ["radians"]
+
+
+HEALTH = b"GET /health HTTP/1.1\r\n\r\n"
+
+
+def test_pipelined_requests():
+    assert exchange(HEALTH + HEALTH) == [(200, "keep-alive"), (200, "keep-alive")]
+
+
+@pytest.mark.parametrize("request_head, status", [
+    (b"POST /batch HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n5\r\nhello\r\n0\r\n\r\n", 411),
+    (b"POST /batch HTTP/1.1\r\nContent-Length: ten\r\n\r\n[]", 400),
+    (b"POST /batch HTTP/1.1\r\nContent-Length: -2\r\n\r\n[]", 400),
+    (b"GET /health\r\n\r\n", 400),
+])
+def test_unreadable_requests_close_the_connection(request_head, status):
+    # The pipelined /health must not be read as part of the rejected request
+    assert exchange(request_head + HEALTH) == [(status, "close")]